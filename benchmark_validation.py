@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Script para comparar a validação por contrato com as funções de validação atuais
+
+Monta um DataFrame de escolas com LINHAS registros (reamostrando o dataset
+processado e injetando problemas) e mede, para as mesmas verificações, as
+funções de utils.validation chamadas coluna a coluna e o contrato de
+esquema compilado em verificações vetorizadas.
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# Adiciona o diretório src ao path para importações
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from services.data_service import DataService
+from utils.schema_contract import ESCOLAS_CONTRACT, SchemaContract, parse_rule
+from utils.validation import (validate_data_range, validate_data_types, validate_dataframe_columns,
+                              validate_duplicates, validate_missing_values)
+
+LINHAS = 200_000
+REPETICOES = 5
+
+_OPERADORES = {">=": "ge", "<=": "le", ">": "gt", "<": "lt", "==": "eq", "!=": "ne"}
+
+def build_frame(linhas=LINHAS):
+    """
+    Reamostra o dataset de escolas até o tamanho pedido, com problemas injetados
+
+    Args:
+        linhas: Número de registros
+
+    Returns:
+        DataFrame de escolas
+    """
+    escolas = DataService().get_data("escolas")
+    rng = np.random.default_rng(42)
+    df = escolas.sample(linhas, replace=True, random_state=42).reset_index(drop=True)
+    df['CO_ENTIDADE'] = np.arange(linhas, dtype=np.uint32) + 32000000
+
+    # Ausentes, valores fora do intervalo e chaves repetidas
+    df['QT_MAT_INF'] = df['QT_MAT_INF'].astype(np.float64)
+    df.loc[rng.choice(linhas, linhas // 100, replace=False), 'QT_MAT_INF'] = np.nan
+    df.loc[rng.choice(linhas, 50, replace=False), 'QT_MAT_INF'] = -1
+    df.loc[rng.choice(linhas, 20, replace=False), 'CO_ENTIDADE'] = 32000000
+
+    return df
+
+def legacy_validation(df):
+    """Mesmas verificações do contrato com as funções de utils.validation"""
+    columns = df.columns
+    explicit = ESCOLAS_CONTRACT["columns"]
+    prefixes = tuple(ESCOLAS_CONTRACT["prefixes"])
+
+    types = {col: spec["type"] for col, spec in explicit.items() if col in columns}
+    ranges = {col: {k: v for k, v in spec.items() if k in ("min", "max")}
+              for col, spec in explicit.items() if col in columns}
+    for col in columns:
+        if col.startswith(prefixes):
+            types[col] = float if df[col].dtype.kind == 'f' else int
+            ranges[col] = {"min": 0}
+
+    results = {
+        "columns": validate_dataframe_columns(df, [c for c, s in explicit.items() if s.get("required", True)]),
+        "types": validate_data_types(df, types),
+        "ranges": validate_data_range(df, ranges),
+        "missing": validate_missing_values(df, ESCOLAS_CONTRACT["max_missing_percentage"]),
+        "duplicates": validate_duplicates(df, subset=ESCOLAS_CONTRACT["unique"][0])
+    }
+
+    # Regras entre colunas escritas como expressões pandas
+    violations = {}
+    for rule in map(parse_rule, ESCOLAS_CONTRACT["rules"]):
+        def compare(comparison):
+            left, op, right = comparison
+            rhs = df[right] if isinstance(right, str) else right
+            return getattr(df[left], _OPERADORES[op])(rhs)
+        left, _, right = rule["check"]
+        defined = df[left].notna() & (df[right].notna() if isinstance(right, str) else True)
+        violated = defined & ~compare(rule["check"])
+        if rule["when"] is not None:
+            violated &= compare(rule["when"])
+        violations[rule["rule"]] = int(violated.sum())
+    results["rules"] = violations
+
+    return results
+
+def best_time(function, *args):
+    """Menor tempo (ms) de várias execuções"""
+    tempos = []
+    for _ in range(REPETICOES):
+        inicio = time.perf_counter()
+        function(*args)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return min(tempos)
+
+def benchmark():
+    """Imprime a comparação de tempos"""
+    df = build_frame()
+    contract = SchemaContract(ESCOLAS_CONTRACT)
+
+    inicio = time.perf_counter()
+    contract.compile(df)
+    compilacao = (time.perf_counter() - inicio) * 1000
+
+    legado = best_time(legacy_validation, df)
+    contrato = best_time(contract.validate, df)
+
+    print(f"📊 {len(df)} registros, {len(df.columns)} colunas")
+    print(f"🐢 Funções de validação atuais: {legado:8.1f} ms")
+    print(f"⚡ Contrato compilado:          {contrato:8.1f} ms  ({legado / contrato:.1f}x)")
+    print(f"🔧 Compilação (uma vez):        {compilacao:8.1f} ms")
+    print("-" * 60)
+
+    for erro in contract.validate(df)["all_errors"]:
+        print(f"  - {erro}")
+
+if __name__ == "__main__":
+    print("⏱️ Comparando validação por contrato com as funções atuais")
+    print("=" * 60)
+
+    benchmark()
+
+    print("\n" + "=" * 60)
+    print("✅ Medição concluída!")
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Script para pré-calcular os agregados do Sistema de Análise Educacional - ES
+
+Executar após load_es_data.py: os artefatos ficam em data/dados/agregados/,
+versionados pelos MD5 dos microdados do INEP e dos CSVs extraídos.
+"""
+
+import os
+import sys
+
+# Adiciona o diretório src ao path para importações
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from services.data_service import DataService
+
+def build_aggregates():
+    """Gera os artefatos de agregados a partir dos dados extraídos"""
+    
+    print("🔧 Calculando agregados...")
+    version_dir = DataService().build_aggregate_artifacts()
+    print(f"✅ Agregados salvos em '{version_dir}'")
+    
+    return version_dir
+
+if __name__ == "__main__":
+    print("🚀 Pré-calculando agregados para Sistema de Análise Educacional")
+    print("=" * 60)
+    
+    build_aggregates()
+    
+    print("\n" + "=" * 60)
+    print("✅ Build concluído!")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Script para exportar datasets do Sistema de Análise Educacional - ES
+
+Os dados são codificados e escritos bloco a bloco (CSV, NDJSON, JSON ou
+Parquet), direto no arquivo de saída ou na saída padrão, sem arquivo
+temporário. Com saída padrão as mensagens vão para stderr.
+
+Exemplos:
+    python export_data.py escolas --format parquet --output escolas.parquet
+    python export_data.py escolas --filter NO_MUNICIPIO=Vitória --format ndjson > vitoria.ndjson
+"""
+
+import argparse
+import os
+import sys
+
+# Adiciona o diretório src ao path para importações
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from services.data_service import DataService
+from services.export_stream import EXPORT_CHUNK_ROWS, EXPORT_FORMATS, write_chunks
+
+def parse_filters(values):
+    """Converte filtros COLUNA=VALOR da linha de comando (valores repetidos viram lista)"""
+    filters = {}
+    for value in values:
+        column, sep, raw = value.partition('=')
+        if not sep:
+            raise ValueError(f"Filtro '{value}' inválido (use COLUNA=VALOR)")
+        parsed = int(raw) if raw.lstrip('-').isdigit() else raw
+        if column in filters:
+            current = filters[column]
+            filters[column] = (current if isinstance(current, list) else [current]) + [parsed]
+        else:
+            filters[column] = parsed
+    return filters
+
+def export_dataset(dataset_name, format="csv", output="-", filters=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    """
+    Exporta um dataset em blocos para um arquivo ou para a saída padrão
+
+    Args:
+        dataset_name: Nome do dataset
+        format: "csv", "ndjson", "json" ou "parquet"
+        output: Caminho de saída ("-" para a saída padrão)
+        filters: Filtros como em DataService.get_filtered_data
+        chunk_rows: Linhas por bloco
+
+    Returns:
+        Número de bytes escritos
+    """
+    log = sys.stderr if output == "-" else sys.stdout
+    chunks = DataService().stream_export(dataset_name, format, filters=filters, chunk_rows=chunk_rows)
+
+    if output == "-":
+        written = write_chunks(chunks, sys.stdout.buffer)
+        sys.stdout.buffer.flush()
+    else:
+        with open(output, 'wb') as f:
+            written = write_chunks(chunks, f)
+
+    print(f"✅ {dataset_name}: {written / 1024:.0f} KB em {format}", file=log)
+    return written
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exporta datasets do Sistema de Análise Educacional")
+    parser.add_argument("dataset", help="Nome do dataset (ex.: escolas, cursos_tecnicos, municipios)")
+    parser.add_argument("--format", default="csv", choices=sorted(EXPORT_FORMATS),
+                        help="Formato de exportação")
+    parser.add_argument("--output", default="-",
+                        help="Arquivo de saída; '-' escreve na saída padrão")
+    parser.add_argument("--filter", action="append", default=[], metavar="COLUNA=VALOR",
+                        help="Filtro de igualdade (repetido na mesma coluna vira lista)")
+    parser.add_argument("--chunk-rows", type=int, default=EXPORT_CHUNK_ROWS,
+                        help="Linhas por bloco")
+    args = parser.parse_args()
+
+    export_dataset(args.dataset, args.format, args.output,
+                   filters=parse_filters(args.filter) or None, chunk_rows=args.chunk_rows)
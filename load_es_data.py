@@ -3,26 +3,252 @@
 Script para carregar especificamente os dados do Espírito Santo
 """
 
+import argparse
+import glob
+import os
+import sys
 import pandas as pd
 import numpy as np
 
-def load_es_data():
-    """Carrega dados do Espírito Santo do arquivo do INEP"""
+# Adiciona o diretório src ao path para importações
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from services.snapshot import snapshot_path_for, write_snapshot
+from utils.stream_validation import StreamValidation
+
+# Arquivos nacionais do INEP
+MICRODADOS_CSV = 'data/dados/microdados_ed_basica_2024.csv'
+SUPLEMENTO_CSV = 'data/dados/suplemento_cursos_tecnicos_2024.csv'
+
+# Saídas particionadas por UF ({uf} = sigla em minúsculas)
+ESCOLAS_UF_CSV = 'data/dados/escolas_{uf}_2024.csv'
+CURSOS_UF_CSV = 'data/dados/cursos_tecnicos_{uf}_2024.csv'
+
+# Códigos de UF do IBGE usados pelo INEP
+UF_SIGLAS = {
+    11: 'RO', 12: 'AC', 13: 'AM', 14: 'RR', 15: 'PA', 16: 'AP', 17: 'TO',
+    21: 'MA', 22: 'PI', 23: 'CE', 24: 'RN', 25: 'PB', 26: 'PE', 27: 'AL', 28: 'SE', 29: 'BA',
+    31: 'MG', 32: 'ES', 33: 'RJ', 35: 'SP',
+    41: 'PR', 42: 'SC', 43: 'RS',
+    50: 'MS', 51: 'MT', 52: 'GO', 53: 'DF'
+}
+
+# Linhas lidas por bloco no modo streaming
+CHUNK_SIZE = 50_000
+
+# Colunas do microdado necessárias para o app
+ESCOLAS_BASE_COLUMNS = ['CO_UF', 'CO_ENTIDADE', 'NO_ENTIDADE', 'NO_MUNICIPIO',
+                        'TP_DEPENDENCIA', 'TP_LOCALIZACAO']
+ESCOLAS_QT_PREFIXES = ('QT_DOC_', 'QT_MAT_', 'QT_TUR_')
+
+def is_escolas_column(column):
+    """Indica se a coluna do microdado deve ser mantida na extração"""
+    return column in ESCOLAS_BASE_COLUMNS or column.startswith(ESCOLAS_QT_PREFIXES)
+
+CURSOS_BASE_COLUMNS = ['CO_UF', 'CO_ENTIDADE', 'NO_ENTIDADE', 'NO_MUNICIPIO',
+                       'NO_CURSO_EDUC_PROFISSIONAL']
+
+def is_cursos_column(column):
+    """Indica se a coluna do suplemento de cursos deve ser mantida na extração"""
+    return column in CURSOS_BASE_COLUMNS or column.startswith('QT_')
+
+# Tipos e intervalos esperados nos arquivos do INEP (validados durante a leitura)
+INEP_EXPECTED_TYPES = {
+    'CO_UF': int,
+    'CO_ENTIDADE': int,
+    'NO_MUNICIPIO': str,
+    'NO_ENTIDADE': str
+}
+INEP_RANGES = {
+    'CO_UF': {'min': min(UF_SIGLAS), 'max': max(UF_SIGLAS)},
+    'TP_DEPENDENCIA': {'min': 1, 'max': 4},
+    'TP_LOCALIZACAO': {'min': 1, 'max': 2}
+}
+
+def inep_validation(path, required_columns, usecols=None, key_column='CO_ENTIDADE',
+                    max_missing_percentage=0.1):
+    """
+    Cria a validação em blocos de um arquivo do INEP
     
-    print("🔍 Carregando dados do Espírito Santo...")
+    Lê apenas o cabeçalho para incluir as colunas de quantidade (QT_*),
+    que não podem ser negativas. O limite de ausentes vale só para as
+    colunas obrigatórias: quantidades vazias são comuns nos microdados.
+    Linhas inteiras repetidas são detectadas por hash de linha.
+    
+    Args:
+        path: Caminho do CSV do INEP (separador ';', latin-1)
+        required_columns: Colunas obrigatórias
+        usecols: Função de seleção de colunas usada na leitura
+        key_column: Coluna que não pode se repetir (None não verifica)
+        max_missing_percentage: Fração máxima de ausentes por coluna obrigatória
+        
+    Returns:
+        StreamValidation com as regras do arquivo
+    """
+    header = pd.read_csv(path, sep=';', encoding='latin-1', nrows=0).columns
+    columns = [col for col in header if usecols is None or usecols(col)]
+    
+    ranges = {col: limits for col, limits in INEP_RANGES.items() if col in columns}
+    ranges.update({col: {'min': 0} for col in columns if col.startswith('QT_')})
+    
+    expected_types = {col: tipo for col, tipo in INEP_EXPECTED_TYPES.items() if col in columns}
+    
+    return StreamValidation(required_columns, expected_types, ranges,
+                            max_missing_percentage=max_missing_percentage,
+                            key_column=key_column,
+                            missing_columns=required_columns,
+                            duplicate_rows=True)
+
+def print_validation(path, result):
+    """Imprime o resumo da validação de um arquivo"""
+    nome = os.path.basename(path)
+    if result["overall_valid"]:
+        print(f"✅ {nome} válido: {result['rows']} registros em {result['chunks']} blocos")
+        return
+    
+    print(f"⚠️ {nome}: {result['error_count']} problemas em {result['rows']} registros")
+    for error in result["all_errors"]:
+        print(f"  - {error}")
+
+def validate_inep_file(path, required_columns, usecols=None, key_column='CO_ENTIDADE',
+                       chunksize=CHUNK_SIZE):
+    """
+    Valida um arquivo do INEP em blocos, sem extrair dados
+    
+    Interrompe no primeiro bloco se faltarem colunas obrigatórias.
+    
+    Args:
+        path: Caminho do CSV do INEP (separador ';', latin-1)
+        required_columns: Colunas obrigatórias
+        usecols: Lista ou função de seleção de colunas
+        key_column: Coluna que não pode se repetir (None não verifica)
+        chunksize: Número de linhas por bloco
+        
+    Returns:
+        Resultado no formato de comprehensive_data_validation
+    """
+    validation = inep_validation(path, required_columns, usecols, key_column)
+    reader = pd.read_csv(path, 
+                         sep=';', 
+                         encoding='latin-1', 
+                         usecols=usecols, 
+                         chunksize=chunksize)
+    
+    for chunk in reader:
+        validation.update(chunk)
+        if validation.missing_required():
+            break
+    
+    result = validation.result()
+    print_validation(path, result)
+    return result
+
+def validate_inep_files(chunksize=CHUNK_SIZE):
+    """
+    Valida os microdados e o suplemento de cursos sem extrair dados
+    
+    Args:
+        chunksize: Número de linhas por bloco
+        
+    Returns:
+        True se os dois arquivos forem válidos
+    """
+    print("🔍 Validando microdados_ed_basica_2024.csv...")
+    escolas = validate_inep_file(MICRODADOS_CSV, ESCOLAS_BASE_COLUMNS, 
+                                 usecols=is_escolas_column, chunksize=chunksize)
+    
+    # No suplemento cada escola aparece uma vez por curso
+    print("🔍 Validando suplemento_cursos_tecnicos_2024.csv...")
+    cursos = validate_inep_file(SUPLEMENTO_CSV, CURSOS_BASE_COLUMNS, 
+                                usecols=is_cursos_column, key_column=None, chunksize=chunksize)
+    
+    return escolas["overall_valid"] and cursos["overall_valid"]
+
+def write_csv_snapshot(csv_path):
+    """
+    Gera o snapshot colunar de um CSV extraído, lido como o app o leria
+    
+    Args:
+        csv_path: Caminho do CSV extraído
+    """
+    df = pd.read_csv(csv_path, encoding='utf-8')
+    snapshot_path = write_snapshot(df, snapshot_path_for(csv_path), source_path=csv_path)
+    print(f"✅ Snapshot colunar salvo em '{snapshot_path}'")
+
+def read_uf_chunked(path, uf, usecols=None, chunksize=CHUNK_SIZE, validation=None):
+    """
+    Lê um arquivo do INEP em blocos, mantendo apenas as linhas de uma UF
+    
+    Args:
+        path: Caminho do CSV do INEP (separador ';', latin-1)
+        uf: Código da UF (CO_UF)
+        usecols: Lista ou função de seleção de colunas
+        chunksize: Número de linhas por bloco
+        validation: StreamValidation aplicada a cada bloco na mesma leitura
+        
+    Returns:
+        DataFrame com as linhas da UF
+    """
+    parts = []
+    total_rows = 0
+    
+    reader = pd.read_csv(path, 
+                         sep=';', 
+                         encoding='latin-1', 
+                         usecols=usecols, 
+                         chunksize=chunksize)
+    
+    for chunk in reader:
+        if validation is not None:
+            validation.update(chunk)
+            if validation.missing_required():
+                print(f"❌ Colunas obrigatórias ausentes: {validation.missing_required()}")
+                return pd.DataFrame()
+        
+        total_rows += len(chunk)
+        # Cada bloco é descartado após o filtro; só as linhas da UF ficam em memória
+        parts.append(chunk[chunk['CO_UF'] == uf])
+    
+    print(f"✅ Dados lidos em blocos: {total_rows} registros")
+    
+    if not parts:
+        return pd.DataFrame()
+    
+    return pd.concat(parts, ignore_index=True)
+
+def load_es_data(streaming=True, chunksize=CHUNK_SIZE):
+    """
+    Carrega dados do Espírito Santo do arquivo do INEP
     
-    # Carregar dados completos
-    print("📁 Carregando microdados_ed_basica_2024.csv...")
-    df = pd.read_csv('data/dados/microdados_ed_basica_2024.csv', 
-                     sep=';', 
-                     encoding='latin-1', 
-                     low_memory=False)
+    Args:
+        streaming: Lê o arquivo em blocos, projetando apenas as colunas necessárias
+        chunksize: Número de linhas por bloco no modo streaming
+    """
     
-    print(f"✅ Dados carregados: {df.shape[0]} registros, {df.shape[1]} colunas")
+    print("🔍 Carregando dados do Espírito Santo...")
     
-    # Filtrar dados do ES
-    print("📍 Filtrando dados do Espírito Santo (CO_UF = 32)...")
-    es_data = df[df['CO_UF'] == 32]
+    if streaming:
+        print("📁 Lendo microdados_ed_basica_2024.csv em blocos (CO_UF = 32)...")
+        validation = inep_validation(MICRODADOS_CSV, ESCOLAS_BASE_COLUMNS, is_escolas_column)
+        es_data = read_uf_chunked(MICRODADOS_CSV, 
+                                  uf=32, 
+                                  usecols=is_escolas_column, 
+                                  chunksize=chunksize,
+                                  validation=validation)
+        print_validation(MICRODADOS_CSV, validation.result())
+    else:
+        # Carregar dados completos
+        print("📁 Carregando microdados_ed_basica_2024.csv...")
+        df = pd.read_csv(MICRODADOS_CSV, 
+                         sep=';', 
+                         encoding='latin-1', 
+                         low_memory=False)
+        
+        print(f"✅ Dados carregados: {df.shape[0]} registros, {df.shape[1]} colunas")
+        
+        # Filtrar dados do ES
+        print("📍 Filtrando dados do Espírito Santo (CO_UF = 32)...")
+        es_data = df[df['CO_UF'] == 32]
     
     print(f"✅ Dados do ES encontrados: {len(es_data)} registros")
     
@@ -74,6 +300,7 @@ def load_es_data():
         print("\n💾 Salvando dados do ES...")
         es_data.to_csv('data/dados/escolas_es_2024.csv', index=False, encoding='utf-8')
         print("✅ Dados do ES salvos em 'data/dados/escolas_es_2024.csv'")
+        write_csv_snapshot('data/dados/escolas_es_2024.csv')
         
         return es_data
     else:
@@ -86,7 +313,7 @@ def load_es_technical_courses():
     print("\n🔧 Carregando cursos técnicos do ES...")
     
     try:
-        df_tec = pd.read_csv('data/dados/suplemento_cursos_tecnicos_2024.csv', 
+        df_tec = pd.read_csv(SUPLEMENTO_CSV, 
                             sep=';', 
                             encoding='latin-1')
         
@@ -108,6 +335,7 @@ def load_es_technical_courses():
             # Salvar dados
             es_tec.to_csv('data/dados/cursos_tecnicos_es_2024.csv', index=False, encoding='utf-8')
             print("✅ Cursos técnicos do ES salvos em 'data/dados/cursos_tecnicos_es_2024.csv'")
+            write_csv_snapshot('data/dados/cursos_tecnicos_es_2024.csv')
             
             return es_tec
         else:
@@ -118,20 +346,163 @@ def load_es_technical_courses():
         print(f"❌ Erro ao carregar cursos técnicos: {e}")
         return None
 
-if __name__ == "__main__":
-    print("🚀 Carregando dados do Espírito Santo para Sistema de Análise Educacional")
-    print("=" * 60)
+def partition_by_uf(path, output_pattern, usecols=None, ufs=None, chunksize=CHUNK_SIZE,
+                    validation=None):
+    """
+    Lê um arquivo do INEP uma única vez e distribui as linhas em um CSV por UF
     
-    # Carregar dados principais do ES
-    es_escolas = load_es_data()
+    Args:
+        path: Caminho do CSV do INEP (separador ';', latin-1)
+        output_pattern: Caminho de saída com o marcador {uf}
+        usecols: Lista ou função de seleção de colunas
+        ufs: Códigos de UF a extrair (None extrai todas)
+        chunksize: Número de linhas por bloco
+        validation: StreamValidation aplicada a cada bloco na mesma leitura
+        
+    Returns:
+        Dicionário com o número de linhas gravadas por código de UF
+    """
+    written = {}
+    
+    reader = pd.read_csv(path, 
+                         sep=';', 
+                         encoding='latin-1', 
+                         usecols=usecols, 
+                         chunksize=chunksize)
+    
+    for chunk in reader:
+        if validation is not None:
+            validation.update(chunk)
+            if validation.missing_required():
+                print(f"❌ Colunas obrigatórias ausentes: {validation.missing_required()}")
+                break
+        
+        if ufs is not None:
+            chunk = chunk[chunk['CO_UF'].isin(ufs)]
+        
+        # Cada bloco é anexado às saídas das UFs presentes nele
+        for co_uf, part in chunk.groupby('CO_UF', sort=False):
+            co_uf = int(co_uf)
+            output = output_pattern.format(uf=UF_SIGLAS.get(co_uf, str(co_uf)).lower())
+            first_write = co_uf not in written
+            part.to_csv(output, 
+                        mode='w' if first_write else 'a', 
+                        header=first_write, 
+                        index=False, 
+                        encoding='utf-8')
+            written[co_uf] = written.get(co_uf, 0) + len(part)
+    
+    return written
+
+def extract_uf_partitions(ufs=None, chunksize=CHUNK_SIZE):
+    """
+    Extrai escolas e cursos técnicos de várias UFs em uma única leitura de cada arquivo
+    
+    Args:
+        ufs: Códigos de UF a extrair (None extrai todas)
+        chunksize: Número de linhas por bloco
+        
+    Returns:
+        Dicionário com linhas gravadas por UF para escolas e cursos técnicos
+    """
+    print("📁 Particionando microdados_ed_basica_2024.csv por UF...")
+    validation = inep_validation(MICRODADOS_CSV, ESCOLAS_BASE_COLUMNS, is_escolas_column)
+    escolas = partition_by_uf(MICRODADOS_CSV, ESCOLAS_UF_CSV, 
+                              usecols=is_escolas_column, ufs=ufs, chunksize=chunksize,
+                              validation=validation)
+    print_validation(MICRODADOS_CSV, validation.result())
     
-    # Carregar cursos técnicos do ES
-    es_cursos = load_es_technical_courses()
+    print("📁 Particionando suplemento_cursos_tecnicos_2024.csv por UF...")
+    validation = inep_validation(SUPLEMENTO_CSV, CURSOS_BASE_COLUMNS, is_cursos_column,
+                                 key_column=None)
+    cursos = partition_by_uf(SUPLEMENTO_CSV, CURSOS_UF_CSV, 
+                             usecols=is_cursos_column, ufs=ufs, chunksize=chunksize,
+                             validation=validation)
+    print_validation(SUPLEMENTO_CSV, validation.result())
     
-    print("\n" + "=" * 60)
-    print("✅ Carregamento concluído!")
+    for co_uf in sorted(set(escolas) | set(cursos)):
+        sigla = UF_SIGLAS.get(co_uf, str(co_uf))
+        print(f"  {sigla}: {escolas.get(co_uf, 0)} escolas, {cursos.get(co_uf, 0)} ofertas de cursos")
     
-    if es_escolas is not None:
-        print(f"📊 Dados do ES carregados: {len(es_escolas)} escolas")
-    if es_cursos is not None:
-        print(f"🔧 Cursos técnicos do ES: {len(es_cursos)} ofertas")
+    # Snapshots colunares de cada partição
+    for co_uf in escolas:
+        write_csv_snapshot(ESCOLAS_UF_CSV.format(uf=UF_SIGLAS.get(co_uf, str(co_uf)).lower()))
+    for co_uf in cursos:
+        write_csv_snapshot(CURSOS_UF_CSV.format(uf=UF_SIGLAS.get(co_uf, str(co_uf)).lower()))
+    
+    return {"escolas": escolas, "cursos_tecnicos": cursos}
+
+def build_snapshots():
+    """Gera snapshots colunares para todos os CSVs já extraídos"""
+    csv_paths = sorted(glob.glob(ESCOLAS_UF_CSV.format(uf='*')) + 
+                       glob.glob(CURSOS_UF_CSV.format(uf='*')))
+    for csv_path in csv_paths:
+        write_csv_snapshot(csv_path)
+    return csv_paths
+
+def parse_ufs(values):
+    """Converte siglas ou códigos de UF da linha de comando em códigos"""
+    codigos = {sigla: codigo for codigo, sigla in UF_SIGLAS.items()}
+    ufs = []
+    for value in values:
+        value = value.strip().upper()
+        if value.isdigit():
+            ufs.append(int(value))
+        elif value in codigos:
+            ufs.append(codigos[value])
+        else:
+            raise ValueError(f"UF '{value}' desconhecida")
+    return ufs
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extrai dados do INEP para o Sistema de Análise Educacional")
+    parser.add_argument("--ufs", nargs="*", 
+                        help="Extrai as UFs informadas (siglas ou códigos) em uma única leitura; "
+                             "sem valores extrai todas")
+    parser.add_argument("--snapshots", action="store_true", 
+                        help="Apenas gera os snapshots colunares dos CSVs já extraídos")
+    parser.add_argument("--validate", action="store_true", 
+                        help="Apenas valida os arquivos do INEP em blocos, sem extrair dados")
+    args = parser.parse_args()
+    
+    if args.validate:
+        print("🚀 Validando arquivos do INEP")
+        print("=" * 60)
+        
+        valid = validate_inep_files()
+        
+        print("\n" + "=" * 60)
+        print("✅ Arquivos válidos!" if valid else "⚠️ Validação encontrou problemas")
+    elif args.snapshots:
+        print("🚀 Gerando snapshots colunares")
+        print("=" * 60)
+        
+        build_snapshots()
+        
+        print("\n" + "=" * 60)
+        print("✅ Snapshots gerados!")
+    elif args.ufs is not None:
+        print("🚀 Extraindo dados do INEP por UF")
+        print("=" * 60)
+        
+        extract_uf_partitions(ufs=parse_ufs(args.ufs) or None)
+        
+        print("\n" + "=" * 60)
+        print("✅ Extração concluída!")
+    else:
+        print("🚀 Carregando dados do Espírito Santo para Sistema de Análise Educacional")
+        print("=" * 60)
+        
+        # Carregar dados principais do ES
+        es_escolas = load_es_data()
+        
+        # Carregar cursos técnicos do ES
+        es_cursos = load_es_technical_courses()
+        
+        print("\n" + "=" * 60)
+        print("✅ Carregamento concluído!")
+        
+        if es_escolas is not None:
+            print(f"📊 Dados do ES carregados: {len(es_escolas)} escolas")
+        if es_cursos is not None:
+            print(f"🔧 Cursos técnicos do ES: {len(es_cursos)} ofertas")
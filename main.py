@@ -14,14 +14,10 @@ import os
 # Adiciona o diretório src ao path para importações
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
+# Páginas são importadas sob demanda pelo registro (components/page_registry.py)
+from components.page_registry import render_page
 from components.header import render_header
 from components.sidebar import render_sidebar
-from pages.dashboard import render_dashboard
-from pages.sobre import render_sobre
-from pages.formacao import render_formacao
-from pages.estatisticas import render_estatisticas
-from pages.evolucao import render_evolucao
-from pages.comparativos import render_comparativos
 
 # ---------------------------------------------------------
 # ⚙️ Configuração da Página
@@ -146,19 +142,19 @@ def main():
     # Barra lateral com navegação
     selected_page = render_sidebar()
     
-    # Páginas
-    if selected_page == "Dashboard":
-        render_dashboard()
-    elif selected_page == "Sobre o Sistema":
-        render_sobre()
-    elif selected_page == "Formação de Professores":
-        render_formacao()
-    elif selected_page == "Estatísticas por Região":
-        render_estatisticas()
-    elif selected_page == "Evolução Temporal":
-        render_evolucao()
-    elif selected_page == "Comparativos":
-        render_comparativos()
+    # Serviços importados só depois do cabeçalho e da barra lateral
+    # (carregam pandas, plotly e a camada de dados)
+    from services.data_service import start_background_reload
+    from services.warmup import start_warmup
+    
+    # Recarrega os dados em segundo plano quando os CSVs mudam (uma vez por processo)
+    start_background_reload()
+    
+    # Pré-carrega dados e a página inicial em outra thread (uma vez por processo)
+    start_warmup()
+    
+    # Página selecionada (módulo importado no primeiro uso)
+    render_page(selected_page)
 
 # ---------------------------------------------------------
 # ▶️ Execução
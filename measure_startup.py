@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Script para medir o tempo de inicialização do Sistema de Análise Educacional - ES
+
+Cada medição roda em um processo novo (importação a frio) e compara a
+importação de todas as páginas, como o main.py fazia, com a importação
+sob demanda do registro de páginas: os módulos de inicialização e
+apenas a página aberta.
+"""
+
+import os
+import subprocess
+import sys
+
+# Adiciona o diretório src ao path para importações
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from components.page_registry import PAGES
+
+# Módulos importados pelo main.py antes do cabeçalho e da barra lateral
+# (services.data_service e services.warmup vêm depois, dentro de main())
+STARTUP_MODULES = [
+    "components.page_registry",
+    "components.header",
+    "components.sidebar"
+]
+
+REPETICOES = 5
+
+_MEDICAO = """
+import sys, time
+sys.path.append({src!r})
+import streamlit
+inicio = time.perf_counter()
+for nome in {modulos!r}:
+    __import__(nome)
+print((time.perf_counter() - inicio) * 1000)
+"""
+
+def measure_import(modules):
+    """
+    Mede a importação a frio de um conjunto de módulos (menor de várias execuções)
+
+    Args:
+        modules: Lista de módulos na ordem de importação
+
+    Returns:
+        Tempo em milissegundos
+    """
+    src = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+    code = _MEDICAO.format(src=src, modulos=list(modules))
+    tempos = []
+
+    for _ in range(REPETICOES):
+        resultado = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True, text=True, check=True
+        )
+        tempos.append(float(resultado.stdout.strip().splitlines()[-1]))
+
+    return min(tempos)
+
+def measure_startup():
+    """Imprime o relatório de tempos de inicialização"""
+
+    paginas = [module for module, _, _ in PAGES.values()]
+
+    base = measure_import(STARTUP_MODULES)
+    todas = measure_import(STARTUP_MODULES + paginas)
+
+    print(f"📦 Módulos de inicialização: {base:8.0f} ms")
+    print(f"📚 Todas as páginas (antes): {todas:8.0f} ms")
+    print("-" * 60)
+
+    for label, (module, _, _) in PAGES.items():
+        tempo = measure_import(STARTUP_MODULES + [module])
+        print(f"   {label:<28} {tempo:8.0f} ms  ({todas - tempo:+.0f} ms economizados)")
+
+if __name__ == "__main__":
+    print("⏱️ Medindo inicialização do Sistema de Análise Educacional")
+    print("=" * 60)
+
+    measure_startup()
+
+    print("\n" + "=" * 60)
+    print("✅ Medição concluída!")
@@ -0,0 +1,148 @@
+"""
+Registro das páginas do aplicativo com importação sob demanda
+"""
+
+import importlib
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+# Rótulo do menu -> (módulo, função de renderização, ícone do menu)
+PAGES = {
+    "Dashboard": ("pages.dashboard", "render_dashboard", "house-fill"),
+    "Sobre o Sistema": ("pages.sobre", "render_sobre", "info-circle-fill"),
+    "Formação de Professores": ("pages.formacao", "render_formacao", "mortarboard-fill"),
+    "Estatísticas por Região": ("pages.estatisticas", "render_estatisticas", "geo-alt-fill"),
+    "Evolução Temporal": ("pages.evolucao", "render_evolucao", "graph-up"),
+    "Comparativos": ("pages.comparativos", "render_comparativos", "bar-chart-fill")
+}
+
+# Instante em que o processo importou o registro (início do primeiro run)
+_process_start = time.perf_counter()
+
+_renderers: Dict[str, Callable[[], None]] = {}
+_import_times: Dict[str, float] = {}
+_startup: Dict[str, Any] = {}
+_lock = threading.Lock()
+
+
+def page_labels() -> List[str]:
+    """
+    Obtém os rótulos das páginas na ordem do menu
+
+    Returns:
+        Lista de rótulos
+    """
+    return list(PAGES)
+
+
+def page_icons() -> List[str]:
+    """
+    Obtém os ícones das páginas na ordem do menu
+
+    Returns:
+        Lista de nomes de ícones (Bootstrap Icons)
+    """
+    return [icon for _, _, icon in PAGES.values()]
+
+
+def load_page(label: str) -> Callable[[], None]:
+    """
+    Obtém a função de renderização de uma página, importando o módulo no primeiro uso
+
+    Args:
+        label: Rótulo da página no menu
+
+    Returns:
+        Função de renderização
+    """
+    with _lock:
+        renderer = _renderers.get(label)
+        if renderer is not None:
+            return renderer
+
+        module_name, function_name, _ = PAGES[label]
+        start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        _import_times[label] = (time.perf_counter() - start) * 1000
+
+        renderer = getattr(module, function_name)
+        _renderers[label] = renderer
+        return renderer
+
+
+def warm_page(label: str, data_service: Any) -> bool:
+    """
+    Importa uma página e pré-constrói suas seções, se ela oferecer warm_up
+
+    Args:
+        label: Rótulo da página no menu
+        data_service: Instância de DataService usada na construção
+
+    Returns:
+        True se a página tinha aquecimento
+    """
+    load_page(label)
+    module = importlib.import_module(PAGES[label][0])
+    warm_up = getattr(module, "warm_up", None)
+    if warm_up is None:
+        return False
+
+    warm_up(data_service)
+    return True
+
+
+def render_page(label: str) -> None:
+    """
+    Renderiza a página selecionada no menu
+
+    Na primeira renderização do processo registra o relatório de
+    inicialização (ver get_startup_report) e o imprime no log.
+
+    Args:
+        label: Rótulo da página no menu
+    """
+    if label not in PAGES:
+        return
+
+    renderer = load_page(label)
+    if _startup:
+        renderer()
+        return
+
+    start = time.perf_counter()
+    renderer()
+    end = time.perf_counter()
+
+    with _lock:
+        if _startup:
+            return
+        _startup.update({
+            "pagina": label,
+            "importacao_pagina_ms": round(_import_times.get(label, 0.0), 1),
+            "renderizacao_ms": round((end - start) * 1000, 1),
+            "primeira_pintura_ms": round((end - _process_start) * 1000, 1)
+        })
+
+    print(
+        f"⏱️ Inicialização: '{label}' pronta em {_startup['primeira_pintura_ms']:.0f} ms "
+        f"(importação da página {_startup['importacao_pagina_ms']:.0f} ms, "
+        f"renderização {_startup['renderizacao_ms']:.0f} ms)"
+    )
+
+
+def get_startup_report() -> Dict[str, Any]:
+    """
+    Obtém o relatório de inicialização do processo
+
+    Returns:
+        Dicionário com a primeira página renderizada, o tempo até a primeira
+        pintura, os tempos de importação de cada página já carregada e as
+        páginas ainda não importadas
+    """
+    with _lock:
+        report: Dict[str, Any] = dict(_startup)
+        report["importacoes_ms"] = {label: round(ms, 1) for label, ms in _import_times.items()}
+        report["paginas_nao_carregadas"] = [label for label in PAGES if label not in _renderers]
+
+    return report
@@ -5,6 +5,8 @@ Componente de barra lateral com navegação
 import streamlit as st
 from streamlit_option_menu import option_menu
 
+from .page_registry import page_icons, page_labels
+
 def render_sidebar():
     """Renderiza a barra lateral com menu de navegação"""
     
@@ -18,22 +20,8 @@ def render_sidebar():
         # Menu de navegação
         selected_page = option_menu(
             menu_title=None,
-            options=[
-                "Dashboard",
-                "Sobre o Sistema",
-                "Formação de Professores", 
-                "Estatísticas por Região",
-                "Evolução Temporal",
-                "Comparativos"
-            ],
-            icons=[
-                "house-fill",
-                "info-circle-fill",
-                "mortarboard-fill", 
-                "geo-alt-fill",
-                "graph-up",
-                "bar-chart-fill"
-            ],
+            options=page_labels(),
+            icons=page_icons(),
             menu_icon="cast",
             default_index=0,
             styles={
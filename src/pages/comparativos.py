@@ -3,10 +3,10 @@ Página de análises comparativas
 """
 
 import streamlit as st
-import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
-import numpy as np
+
+from utils.figure_cache import px_figure
 
 def render_comparativos():
     """Renderiza a página de análises comparativas"""
@@ -168,27 +168,29 @@ def render_comparacao_periodos():
     })
     
     # Gráfico de variações
-    fig = px.bar(
+    fig = px_figure(
+        "bar",
         df_variacoes,
         x="Indicador",
         y="Variação (%)",
         color="Tendência",
         title=f"Variação Percentual: {periodo1} → {periodo2}",
-        color_discrete_map={"Positiva": "#28a745", "Negativa": "#dc3545", "Estável": "#6c757d"}
-    )
-    fig.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)'
+        color_discrete_map={"Positiva": "#28a745", "Negativa": "#dc3545", "Estável": "#6c757d"},
+        layout=dict(
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)'
+        )
     )
     st.plotly_chart(fig, width='stretch')
     
     # Tabela de variações
     st.subheader("📋 Resumo das Variações")
     st.dataframe(
-        df_variacoes.style.format({
-            "Variação (%)": "{:+.1f}%"
-        }),
-        width='stretch'
+        df_variacoes,
+        width='stretch',
+        column_config={
+            "Variação (%)": st.column_config.NumberColumn(format="%+.1f%%")
+        }
     )
 
 def render_comparacao_regioes():
@@ -452,7 +454,8 @@ def render_comparacao_indicadores():
     st.markdown("---")
     st.subheader("🔗 Análise de Correlação")
     
-    fig = px.scatter(
+    fig = px_figure(
+        "scatter",
         df_corr,
         x=indicador1,
         y=indicador2,
@@ -460,12 +463,11 @@ def render_comparacao_indicadores():
         labels={indicador1: indicador1, indicador2: indicador2},
         color="Região",
         size="Taxa de Conclusão",
-        hover_name="Região"
-    )
-    
-    fig.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)'
+        hover_name="Região",
+        layout=dict(
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)'
+        )
     )
     
     st.plotly_chart(fig, width='stretch')
@@ -567,29 +569,31 @@ def render_comparacao_benchmark():
     })
     
     # Gráfico de gaps
-    fig = px.bar(
+    fig = px_figure(
+        "bar",
         df_gaps,
         x="Indicador",
         y="Gap",
         color="Status",
         title=f"Gap de Performance: ES vs {benchmark}",
-        color_discrete_map={"Acima": "#28a745", "Abaixo": "#dc3545", "Alinhado": "#6c757d"}
-    )
-    fig.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)'
+        color_discrete_map={"Acima": "#28a745", "Abaixo": "#dc3545", "Alinhado": "#6c757d"},
+        layout=dict(
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)'
+        )
     )
     st.plotly_chart(fig, width='stretch')
     
     # Tabela de gaps
     st.subheader("📋 Resumo dos Gaps")
     st.dataframe(
-        df_gaps.style.format({
-            "ES": "{:.1f}",
-            benchmark: "{:.1f}",
-            "Gap": "{:+.1f}"
-        }),
-        width='stretch'
+        df_gaps,
+        width='stretch',
+        column_config={
+            "ES": st.column_config.NumberColumn(format="%.1f"),
+            benchmark: st.column_config.NumberColumn(format="%.1f"),
+            "Gap": st.column_config.NumberColumn(format="%+.1f")
+        }
     )
     
     # Recomendações baseadas no gap
@@ -631,7 +635,8 @@ def render_comparacao_municipios(municipios_df):
         
         with col1:
             # Gráfico de barras
-            fig = px.bar(
+            fig = px_figure(
+                "bar",
                 top_municipios,
                 x='Total_Professores',
                 y='Municipio',
@@ -639,20 +644,21 @@ def render_comparacao_municipios(municipios_df):
                 title="Top 10 Municípios por Número de Professores",
                 color='Total_Professores',
                 color_continuous_scale='Blues',
-                labels={'Total_Professores': 'Número de Professores', 'Municipio': 'Município'}
+                labels={'Total_Professores': 'Número de Professores', 'Municipio': 'Município'},
+                layout=dict(height=500)
             )
-            fig.update_layout(height=500)
             st.plotly_chart(fig, width='stretch')
         
         with col2:
             # Gráfico de pizza
-            fig = px.pie(
+            fig = px_figure(
+                "pie",
                 top_municipios,
                 values='Total_Professores',
                 names='Municipio',
-                title="Distribuição de Professores - Top 10 Municípios"
+                title="Distribuição de Professores - Top 10 Municípios",
+                layout=dict(height=500)
             )
-            fig.update_layout(height=500)
             st.plotly_chart(fig, width='stretch')
         
         # Tabela comparativa
@@ -671,7 +677,8 @@ def render_comparacao_dependencias(dependencia_df):
         
         with col1:
             # Gráfico de barras
-            fig = px.bar(
+            fig = px_figure(
+                "bar",
                 dependencia_df,
                 x='Dependencia',
                 y='Total_Professores',
@@ -684,7 +691,8 @@ def render_comparacao_dependencias(dependencia_df):
         
         with col2:
             # Gráfico de pizza
-            fig = px.pie(
+            fig = px_figure(
+                "pie",
                 dependencia_df,
                 values='Total_Professores',
                 names='Dependencia',
@@ -708,7 +716,8 @@ def render_comparacao_localizacao(localizacao_df):
         
         with col1:
             # Gráfico de barras
-            fig = px.bar(
+            fig = px_figure(
+                "bar",
                 localizacao_df,
                 x='Localizacao',
                 y='Total_Professores',
@@ -721,7 +730,8 @@ def render_comparacao_localizacao(localizacao_df):
         
         with col2:
             # Gráfico de pizza
-            fig = px.pie(
+            fig = px_figure(
+                "pie",
                 localizacao_df,
                 values='Total_Professores',
                 names='Localizacao',
@@ -742,14 +752,15 @@ def render_comparacao_cursos(cursos_df):
     
     if cursos_df is not None:
         # Top 15 cursos
-        top_cursos = cursos_df['NO_CURSO_EDUC_PROFISSIONAL'].value_counts().head(15).reset_index()
+        top_cursos = cursos_df['NO_CURSO_EDUC_PROFISSIONAL'].astype(str).value_counts().head(15).reset_index()
         top_cursos.columns = ['Curso', 'Ofertas']
         
         col1, col2 = st.columns(2)
         
         with col1:
             # Gráfico de barras
-            fig = px.bar(
+            fig = px_figure(
+                "bar",
                 top_cursos,
                 x='Ofertas',
                 y='Curso',
@@ -757,20 +768,21 @@ def render_comparacao_cursos(cursos_df):
                 title="Top 15 Cursos Técnicos por Ofertas",
                 color='Ofertas',
                 color_continuous_scale='Viridis',
-                labels={'Ofertas': 'Número de Ofertas', 'Curso': 'Curso Técnico'}
+                labels={'Ofertas': 'Número de Ofertas', 'Curso': 'Curso Técnico'},
+                layout=dict(height=600)
             )
-            fig.update_layout(height=600)
             st.plotly_chart(fig, width='stretch')
         
         with col2:
             # Gráfico de pizza
-            fig = px.pie(
+            fig = px_figure(
+                "pie",
                 top_cursos.head(10),
                 values='Ofertas',
                 names='Curso',
-                title="Distribuição dos Top 10 Cursos Técnicos"
+                title="Distribuição dos Top 10 Cursos Técnicos",
+                layout=dict(height=600)
             )
-            fig.update_layout(height=600)
             st.plotly_chart(fig, width='stretch')
         
         # Tabela comparativa
@@ -803,16 +815,17 @@ def render_comparacao_indicadores(escolas_df):
         
         with col1:
             # Gráfico de barras
-            fig = px.bar(
+            fig = px_figure(
+                "bar",
                 df_indicadores,
                 x='Indicador',
                 y='Valor',
                 title="Comparação de Indicadores Educacionais",
                 color='Valor',
                 color_continuous_scale='Reds',
-                labels={'Valor': 'Valor', 'Indicador': 'Indicador'}
+                labels={'Valor': 'Valor', 'Indicador': 'Indicador'},
+                layout=dict(xaxis_tickangle=-45)
             )
-            fig.update_layout(xaxis_tickangle=-45)
             st.plotly_chart(fig, width='stretch')
         
         with col2:
@@ -820,7 +833,8 @@ def render_comparacao_indicadores(escolas_df):
             df_normalizado = df_indicadores.copy()
             df_normalizado['Valor_Normalizado'] = df_normalizado['Valor'] / df_normalizado['Valor'].max() * 100
             
-            fig = px.pie(
+            fig = px_figure(
+                "pie",
                 df_normalizado,
                 values='Valor_Normalizado',
                 names='Indicador',
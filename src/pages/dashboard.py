@@ -8,13 +8,161 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import numpy as np
 
+from utils.formatting import describe_table, format_columns
+
+def _build_descritiva(escolas_df: pd.DataFrame, municipios_df: pd.DataFrame):
+    """Calcula as tabelas descritivas de escolas ativas e municípios"""
+    # Limpar dados - remover escolas com valores zero (provavelmente inativas)
+    escolas_ativas = escolas_df[
+        (escolas_df['TOTAL_PROFESSORES'] > 0) | 
+        (escolas_df['TOTAL_MATRICULAS'] > 0) | 
+        (escolas_df['TOTAL_TURMAS'] > 0)
+    ].copy()
+    
+    # Criar DataFrame com dados das escolas ativas
+    df_analise_escolas = pd.DataFrame({
+        'Total_Professores': escolas_ativas['TOTAL_PROFESSORES'].values,
+        'Total_Matriculas': escolas_ativas['TOTAL_MATRICULAS'].values,
+        'Total_Turmas': escolas_ativas['TOTAL_TURMAS'].values
+    })
+    
+    # Criar DataFrame separado com dados dos municípios
+    df_analise_municipios = pd.DataFrame({
+        'Escolas_por_Municipio': municipios_df['Total_Escolas'].values,
+        'Professores_por_Municipio': municipios_df['Total_Professores'].values,
+        'Matriculas_por_Municipio': municipios_df['Total_Matriculas'].values
+    })
+    
+    # Estatísticas descritivas com rótulos em português, formatadas por coluna
+    df_stats_escolas_formatted = describe_table(df_analise_escolas, [
+        '👨‍🏫 Professores por Escola',
+        '👥 Matrículas por Escola', 
+        '🏫 Turmas por Escola'
+    ])
+    
+    df_stats_municipios_formatted = describe_table(df_analise_municipios, [
+        '🏢 Escolas por Município',
+        '👨‍🏫 Professores por Município',
+        '👥 Matrículas por Município'
+    ])
+    
+    return len(escolas_ativas), df_stats_escolas_formatted, df_stats_municipios_formatted
+
+def _build_tabela_municipios(municipios_df: pd.DataFrame) -> pd.DataFrame:
+    """Monta a tabela formatada dos 10 municípios com mais professores"""
+    # Criar tabela com dados agregados por município (top 10)
+    top_municipios = municipios_df.nlargest(10, 'Total_Professores').copy()
+    
+    # Formatar dados para apresentação
+    df_detalhado = pd.DataFrame({
+        '🏢 Município': top_municipios['Municipio'],
+        '👨‍🏫 Total de Professores': top_municipios['Total_Professores'],
+        '👥 Total de Matrículas': top_municipios['Total_Matriculas'],
+        '🏫 Total de Turmas': top_municipios['Total_Turmas'],
+        '🏢 Número de Escolas': top_municipios['Total_Escolas'],
+        '📊 Professores/Escola': (top_municipios['Total_Professores'] / top_municipios['Total_Escolas']).round(1)
+    })
+    df_detalhado = format_columns(df_detalhado, {
+        '👨‍🏫 Total de Professores': 'integer',
+        '👥 Total de Matrículas': 'integer',
+        '🏫 Total de Turmas': 'integer',
+        '🏢 Número de Escolas': 'integer'
+    })
+    
+    return df_detalhado
+
+def _build_fig_dependencia(dependencia_df: pd.DataFrame) -> go.Figure:
+    """Gráfico de professores por dependência administrativa"""
+    fig = px.bar(
+        dependencia_df,
+        x='Dependencia',
+        y='Total_Professores',
+        title="Professores por Dependência Administrativa",
+        color='Total_Professores',
+        color_continuous_scale='Blues',
+        labels={'Total_Professores': 'Número de Professores', 'Dependencia': 'Dependência'}
+    )
+    fig.update_layout(height=400, showlegend=False)
+    return fig
+
+def _build_fig_localizacao(localizacao_df: pd.DataFrame) -> go.Figure:
+    """Gráfico de pizza de professores por localização"""
+    fig = px.pie(
+        localizacao_df,
+        values='Total_Professores',
+        names='Localizacao',
+        title="Distribuição de Professores por Localização",
+        color_discrete_sequence=px.colors.qualitative.Set3
+    )
+    fig.update_layout(height=400)
+    return fig
+
+def _build_fig_top_municipios(municipios_df: pd.DataFrame) -> go.Figure:
+    """Gráfico dos 10 municípios com mais professores"""
+    # Pegar top 10 municípios
+    top_municipios = municipios_df.nlargest(10, 'Total_Professores')
+    
+    fig = px.bar(
+        top_municipios,
+        x='Total_Professores',
+        y='Municipio',
+        orientation='h',
+        title="Top 10 Municípios por Número de Professores",
+        color='Total_Professores',
+        color_continuous_scale='Viridis',
+        labels={'Total_Professores': 'Número de Professores', 'Municipio': 'Município'}
+    )
+    fig.update_layout(height=500, showlegend=False)
+    return fig
+
+def _secoes_dashboard(escolas_df, municipios_df, dependencia_df, localizacao_df):
+    """
+    Construtores das seções memorizadas da página, compartilhados por render_dashboard e warm_up
+    
+    Returns:
+        Dicionário nome da seção -> construtor, só com as seções cujos dados existem
+    """
+    secoes = {}
+    
+    if escolas_df is not None and municipios_df is not None:
+        secoes["dashboard.descritiva"] = lambda: _build_descritiva(escolas_df, municipios_df)
+        secoes["dashboard.tabela_municipios"] = lambda: _build_tabela_municipios(municipios_df)
+    
+    if dependencia_df is not None:
+        secoes["dashboard.fig_dependencia"] = lambda: _build_fig_dependencia(dependencia_df)
+    
+    if localizacao_df is not None:
+        secoes["dashboard.fig_localizacao"] = lambda: _build_fig_localizacao(localizacao_df)
+    
+    if municipios_df is not None:
+        secoes["dashboard.fig_top_municipios"] = lambda: _build_fig_top_municipios(municipios_df)
+    
+    return secoes
+
+def warm_up(data_service) -> None:
+    """Pré-constrói as seções memorizadas da página (ver services.warmup)"""
+    from utils.section_cache import memoize_section
+    versao_dados = data_service.data_version()
+    
+    secoes = _secoes_dashboard(
+        data_service.get_data("escolas"),
+        data_service.get_data("municipios"),
+        data_service.get_data("dependencia"),
+        data_service.get_data("localizacao")
+    )
+    
+    for nome, construtor in secoes.items():
+        memoize_section(nome, versao_dados, None, construtor)
+
 def render_dashboard():
     st.markdown("## 🏠 Dashboard Principal - Sistema de Análise Educacional")
     st.markdown("---")
     
     # Carregar dados reais
     from services.data_service import DataService
+    from utils.section_cache import memoize_section
     data_service = DataService()
+    versao_dados = data_service.data_version()
     
     # Seção de introdução e bases de dados
     st.markdown("""
@@ -53,99 +201,24 @@ def render_dashboard():
     # Carregar dados reais para análise
     escolas_df = data_service.get_data("escolas")
     municipios_df = data_service.get_data("municipios")
+    dependencia_df = data_service.get_data("dependencia")
+    localizacao_df = data_service.get_data("localizacao")
+    
+    # Seções recalculadas só quando a versão dos dados muda
+    secoes = _secoes_dashboard(escolas_df, municipios_df, dependencia_df, localizacao_df)
+    
+    def secao(nome):
+        return memoize_section(nome, versao_dados, None, secoes[nome])
     
     if escolas_df is not None and municipios_df is not None:
-        # Limpar dados - remover escolas com valores zero (provavelmente inativas)
-        escolas_ativas = escolas_df[
-            (escolas_df['TOTAL_PROFESSORES'] > 0) | 
-            (escolas_df['TOTAL_MATRICULAS'] > 0) | 
-            (escolas_df['TOTAL_TURMAS'] > 0)
-        ].copy()
-        
-        st.info(f"📊 **Dados Limpos:** {len(escolas_ativas)} escolas ativas de {len(escolas_df)} total (removidas {len(escolas_df) - len(escolas_ativas)} escolas inativas)")
-        
-        # Criar DataFrame com dados das escolas ativas
-        df_analise_escolas = pd.DataFrame({
-            'Total_Professores': escolas_ativas['TOTAL_PROFESSORES'].values,
-            'Total_Matriculas': escolas_ativas['TOTAL_MATRICULAS'].values,
-            'Total_Turmas': escolas_ativas['TOTAL_TURMAS'].values
-        })
-        
-        # Criar DataFrame separado com dados dos municípios
-        df_analise_municipios = pd.DataFrame({
-            'Escolas_por_Municipio': municipios_df['Total_Escolas'].values,
-            'Professores_por_Municipio': municipios_df['Total_Professores'].values,
-            'Matriculas_por_Municipio': municipios_df['Total_Matriculas'].values
-        })
-        
-        # Calcular estatísticas descritivas para escolas
-        df_stats_escolas = df_analise_escolas.describe().round(2)
-        
-        # Renomear colunas para nomes mais descritivos
-        df_stats_escolas.columns = [
-            '👨‍🏫 Professores por Escola',
-            '👥 Matrículas por Escola', 
-            '🏫 Turmas por Escola'
-        ]
-        
-        # Renomear índice para português
-        df_stats_escolas.index = [
-            'Contagem',
-            'Média',
-            'Desvio Padrão',
-            'Valor Mínimo',
-            'Primeiro Quartil (25%)',
-            'Mediana (50%)',
-            'Terceiro Quartil (75%)',
-            'Valor Máximo'
-        ]
-        
-        # Formatar valores para melhor apresentação
-        df_stats_escolas_formatted = df_stats_escolas.copy()
-        
-        # Aplicar formatação específica por coluna
-        for col in df_stats_escolas_formatted.columns:
-            # Formatar números inteiros
-            df_stats_escolas_formatted[col] = df_stats_escolas_formatted[col].apply(
-                lambda x: f"{int(x):,}" if pd.notna(x) and x != 0 else f"{x:.2f}"
-            )
+        total_ativas, df_stats_escolas_formatted, df_stats_municipios_formatted = secao("dashboard.descritiva")
+        
+        st.info(f"📊 **Dados Limpos:** {total_ativas} escolas ativas de {len(escolas_df)} total (removidas {len(escolas_df) - total_ativas} escolas inativas)")
         
         # Exibir tabela formatada das escolas
-        st.markdown(f"**📊 Estatísticas por Escola ({len(escolas_ativas):,} escolas ativas do ES)**")
+        st.markdown(f"**📊 Estatísticas por Escola ({total_ativas:,} escolas ativas do ES)**")
         st.dataframe(df_stats_escolas_formatted, width='stretch')
         
-        # Calcular estatísticas descritivas para municípios
-        df_stats_municipios = df_analise_municipios.describe().round(2)
-        
-        # Renomear colunas para nomes mais descritivos
-        df_stats_municipios.columns = [
-            '🏢 Escolas por Município',
-            '👨‍🏫 Professores por Município',
-            '👥 Matrículas por Município'
-        ]
-        
-        # Renomear índice para português
-        df_stats_municipios.index = [
-            'Contagem',
-            'Média',
-            'Desvio Padrão',
-            'Valor Mínimo',
-            'Primeiro Quartil (25%)',
-            'Mediana (50%)',
-            'Terceiro Quartil (75%)',
-            'Valor Máximo'
-        ]
-        
-        # Formatar valores para melhor apresentação
-        df_stats_municipios_formatted = df_stats_municipios.copy()
-        
-        # Aplicar formatação específica por coluna
-        for col in df_stats_municipios_formatted.columns:
-            # Formatar números inteiros
-            df_stats_municipios_formatted[col] = df_stats_municipios_formatted[col].apply(
-                lambda x: f"{int(x):,}" if pd.notna(x) and x != 0 else f"{x:.2f}"
-            )
-        
         # Exibir tabela formatada dos municípios
         st.markdown("**🏢 Estatísticas por Município (78 municípios do ES)**")
         st.dataframe(df_stats_municipios_formatted, width='stretch')
@@ -180,19 +253,7 @@ def render_dashboard():
         # Tabela adicional com dados anuais detalhados
         st.markdown("### 📈 Dados Anuais Detalhados - Espírito Santo 2024")
         
-        # Criar tabela com dados agregados por município (top 10)
-        top_municipios = municipios_df.nlargest(10, 'Total_Professores').copy()
-        
-        # Formatar dados para apresentação
-        df_detalhado = pd.DataFrame({
-            '🏢 Município': top_municipios['Municipio'],
-            '👨‍🏫 Total de Professores': top_municipios['Total_Professores'].apply(lambda x: f"{int(x):,}"),
-            '👥 Total de Matrículas': top_municipios['Total_Matriculas'].apply(lambda x: f"{int(x):,}"),
-            '🏫 Total de Turmas': top_municipios['Total_Turmas'].apply(lambda x: f"{int(x):,}"),
-            '🏢 Número de Escolas': top_municipios['Total_Escolas'].apply(lambda x: f"{int(x):,}"),
-            '📊 Professores/Escola': (top_municipios['Total_Professores'] / top_municipios['Total_Escolas']).round(1)
-        })
-        
+        df_detalhado = secao("dashboard.tabela_municipios")
         st.dataframe(df_detalhado, width='stretch', hide_index=True)
         
         st.markdown("*Top 10 municípios do Espírito Santo por número de professores - Dados INEP 2024*")
@@ -295,19 +356,8 @@ def render_dashboard():
         
         if escolas_df is not None:
             # Dados reais por dependência
-            dependencia_df = data_service.get_data("dependencia")
-            
             if dependencia_df is not None:
-                fig = px.bar(
-                    dependencia_df,
-                    x='Dependencia',
-                    y='Total_Professores',
-                    title="Professores por Dependência Administrativa",
-                    color='Total_Professores',
-                    color_continuous_scale='Blues',
-                    labels={'Total_Professores': 'Número de Professores', 'Dependencia': 'Dependência'}
-                )
-                fig.update_layout(height=400, showlegend=False)
+                fig = secao("dashboard.fig_dependencia")
                 st.plotly_chart(fig, width='stretch')
             else:
                 st.info("Dados de dependência não disponíveis")
@@ -319,17 +369,8 @@ def render_dashboard():
         
         if escolas_df is not None:
             # Dados reais por localização
-            localizacao_df = data_service.get_data("localizacao")
-            
             if localizacao_df is not None:
-                fig = px.pie(
-                    localizacao_df,
-                    values='Total_Professores',
-                    names='Localizacao',
-                    title="Distribuição de Professores por Localização",
-                    color_discrete_sequence=px.colors.qualitative.Set3
-                )
-                fig.update_layout(height=400)
+                fig = secao("dashboard.fig_localizacao")
                 st.plotly_chart(fig, width='stretch')
             else:
                 st.info("Dados de localização não disponíveis")
@@ -342,20 +383,7 @@ def render_dashboard():
     st.markdown("### 📍 Top 10 Municípios por Número de Professores")
     
     if municipios_df is not None:
-        # Pegar top 10 municípios
-        top_municipios = municipios_df.nlargest(10, 'Total_Professores')
-        
-        fig = px.bar(
-            top_municipios,
-            x='Total_Professores',
-            y='Municipio',
-            orientation='h',
-            title="Top 10 Municípios por Número de Professores",
-            color='Total_Professores',
-            color_continuous_scale='Viridis',
-            labels={'Total_Professores': 'Número de Professores', 'Municipio': 'Município'}
-        )
-        fig.update_layout(height=500, showlegend=False)
+        fig = secao("dashboard.fig_top_municipios")
         st.plotly_chart(fig, width='stretch')
     else:
         st.info("Dados de municípios não disponíveis")
@@ -8,6 +8,72 @@ import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
 
+
+def _build_figs_municipios(municipios_filtrados: pd.DataFrame):
+    """Gráficos dos 15 municípios com mais professores e com mais escolas"""
+    # Top 15 municípios por número de professores (usando dados filtrados)
+    top_municipios = municipios_filtrados.nlargest(15, 'Total_Professores')
+    
+    fig_professores = px.bar(
+        top_municipios,
+        x="Total_Professores",
+        y="Municipio",
+        orientation='h',
+        title="Top 15 Municípios por Número de Professores",
+        color="Total_Professores",
+        color_continuous_scale="Blues",
+        labels={"Total_Professores": "Número de Professores", "Municipio": "Município"}
+    )
+    fig_professores.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        height=500
+    )
+    
+    # Distribuição de escolas por município (usando dados filtrados)
+    top_escolas = municipios_filtrados.nlargest(15, 'Total_Escolas')
+    
+    fig_escolas = px.bar(
+        top_escolas,
+        x="Total_Escolas",
+        y="Municipio",
+        orientation='h',
+        title="Top 15 Municípios por Número de Escolas",
+        color="Total_Escolas",
+        color_continuous_scale="Greens",
+        labels={"Total_Escolas": "Número de Escolas", "Municipio": "Município"}
+    )
+    fig_escolas.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        height=500
+    )
+    
+    return fig_professores, fig_escolas
+
+def _render_exportacao(data_service, municipio_selecionado: str, dependencia_selecionada: str):
+    """Botão de download das escolas com os filtros da página, gerado em blocos ao clicar"""
+    from services.export_stream import EXPORT_FORMATS, ExportStream, export_filename, export_mime
+    
+    filtros = {}
+    if municipio_selecionado != "Todos os Municípios":
+        filtros['NO_MUNICIPIO'] = municipio_selecionado
+    if dependencia_selecionada != "Todas":
+        filtros['TP_DEPENDENCIA_NOME'] = dependencia_selecionada
+    
+    with st.expander("📥 Exportar escolas filtradas"):
+        formato = st.selectbox("Formato", list(EXPORT_FORMATS), key="formato_exportacao_estatisticas")
+        
+        # A exportação só é codificada quando o usuário clica, fora da execução da página
+        st.download_button(
+            "Baixar dados",
+            data=lambda: ExportStream(data_service.stream_export("escolas", formato, filters=filtros or None)),
+            file_name=export_filename("escolas_es_2024", formato),
+            mime=export_mime(formato),
+            on_click="ignore",
+            key="download_estatisticas"
+        )
+
 def render_estatisticas():
     """Renderiza a página de estatísticas por região"""
     
@@ -16,7 +82,9 @@ def render_estatisticas():
     
     # Carregar dados reais
     from services.data_service import DataService
+    from utils.section_cache import memoize_section
     data_service = DataService()
+    versao_dados = data_service.data_version()
     
     # Carregar dados
     municipios_df = data_service.get_data("municipios")
@@ -79,23 +147,27 @@ def render_estatisticas():
             municipios_filtrados = municipios_df.copy()
         
         # Filtrar por dependência se aplicável
-        if dependencia_selecionada != "Todas" and escolas_df is not None:
-            # Filtrar escolas por dependência
-            escolas_filtradas = escolas_df[escolas_df['TP_DEPENDENCIA_NOME'] == dependencia_selecionada]
-            if not escolas_filtradas.empty:
-                # Recalcular dados dos municípios baseado nas escolas filtradas
-                municipios_filtrados = escolas_filtradas.groupby('NO_MUNICIPIO').agg({
-                    'TOTAL_PROFESSORES': 'sum',
-                    'TOTAL_MATRICULAS': 'sum',
-                    'TOTAL_TURMAS': 'sum',
-                    'CO_ENTIDADE': 'count'
-                }).reset_index()
-                municipios_filtrados.columns = ['Municipio', 'Total_Professores', 'Total_Matriculas', 'Total_Turmas', 'Total_Escolas']
+        cube = data_service.get_cube() if dependencia_selecionada != "Todas" else None
+        if cube is not None:
+            # Dados dos municípios já agregados no cubo para a dependência
+            municipios_cubo = cube.group('NO_MUNICIPIO', {
+                'TP_DEPENDENCIA_NOME': dependencia_selecionada,
+                'NO_MUNICIPIO': municipio_selecionado if municipio_selecionado != "Todos os Municípios" else None
+            })
+            # Sem escolas na combinação: resultado vazio (métricas zeradas), não os totais do município
+            municipios_filtrados = municipios_cubo[[
+                'NO_MUNICIPIO', 'TOTAL_PROFESSORES', 'TOTAL_MATRICULAS', 'TOTAL_TURMAS', 'TOTAL_ESCOLAS'
+            ]]
+            municipios_filtrados.columns = ['Municipio', 'Total_Professores', 'Total_Matriculas', 'Total_Turmas', 'Total_Escolas']
+            if municipios_filtrados.empty:
+                st.warning(f"Nenhuma escola encontrada para Município = {municipio_selecionado}, Dependência = {dependencia_selecionada}")
         
         # Mostrar informações do filtro aplicado
         if municipio_selecionado != "Todos os Municípios" or dependencia_selecionada != "Todas":
             st.info(f"🔍 Filtros aplicados: Município = {municipio_selecionado}, Dependência = {dependencia_selecionada}")
     
+    _render_exportacao(data_service, municipio_selecionado, dependencia_selecionada)
+    
     # Visão geral dos municípios
     st.subheader("📊 Visão Geral dos Municípios do ES")
     
@@ -148,49 +220,20 @@ def render_estatisticas():
     st.subheader("📈 Análise por Município")
     
     if municipios_df is not None:
+        # Figuras dependem só dos filtros de município e dependência (não da região)
+        fig_professores, fig_escolas = memoize_section(
+            "estatisticas.municipios", versao_dados,
+            (municipio_selecionado, dependencia_selecionada),
+            lambda: _build_figs_municipios(municipios_filtrados)
+        )
+        
         col1, col2 = st.columns(2)
         
         with col1:
-            # Top 15 municípios por número de professores (usando dados filtrados)
-            top_municipios = municipios_filtrados.nlargest(15, 'Total_Professores')
-            
-            fig = px.bar(
-                top_municipios,
-                x="Total_Professores",
-                y="Municipio",
-                orientation='h',
-                title="Top 15 Municípios por Número de Professores",
-                color="Total_Professores",
-                color_continuous_scale="Blues",
-                labels={"Total_Professores": "Número de Professores", "Municipio": "Município"}
-            )
-            fig.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                height=500
-            )
-            st.plotly_chart(fig, width='stretch')
+            st.plotly_chart(fig_professores, width='stretch')
         
         with col2:
-            # Distribuição de escolas por município (usando dados filtrados)
-            top_escolas = municipios_filtrados.nlargest(15, 'Total_Escolas')
-            
-            fig = px.bar(
-                top_escolas,
-                x="Total_Escolas",
-                y="Municipio",
-                orientation='h',
-                title="Top 15 Municípios por Número de Escolas",
-                color="Total_Escolas",
-                color_continuous_scale="Greens",
-                labels={"Total_Escolas": "Número de Escolas", "Municipio": "Município"}
-            )
-            fig.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                height=500
-            )
-            st.plotly_chart(fig, width='stretch')
+            st.plotly_chart(fig_escolas, width='stretch')
     else:
         st.info("Carregando dados dos municípios...")
     
@@ -264,10 +307,11 @@ def render_estatisticas():
     # Tabela de dados por estado
     st.subheader("📋 Dados Detalhados por Estado")
     st.dataframe(
-        df_estados.style.format({
-            "Taxa_Conclusao": "{:.1f}%"
-        }),
-        width='stretch'
+        df_estados,
+        width='stretch',
+        column_config={
+            "Taxa_Conclusao": st.column_config.NumberColumn(format="%.1f%%")
+        }
     )
     
     # Indicadores de desenvolvimento educacional
@@ -79,11 +79,16 @@ def render_formacao():
     st.subheader("📊 Estatísticas da Educação no ES - Dados Reais 2024")
     
     if escolas_df is not None:
-        # Calcular métricas reais
-        total_professores = int(escolas_df['TOTAL_PROFESSORES'].sum())
-        total_escolas = len(escolas_df)
-        total_matriculas = int(escolas_df['TOTAL_MATRICULAS'].sum())
-        total_turmas = int(escolas_df['TOTAL_TURMAS'].sum())
+        # Calcular métricas reais para os filtros (consulta ao cubo pré-agregado)
+        totais = data_service.get_cube().totals({
+            'TP_DEPENDENCIA_NOME': dependencia_selecionada if dependencia_selecionada != "Todas" else None,
+            'TP_LOCALIZACAO_NOME': localizacao_selecionada if localizacao_selecionada != "Todas" else None,
+            'NO_MUNICIPIO': municipio_selecionado if municipio_selecionado != "Todos" else None
+        })
+        total_professores = totais['TOTAL_PROFESSORES']
+        total_escolas = totais['TOTAL_ESCOLAS']
+        total_matriculas = totais['TOTAL_MATRICULAS']
+        total_turmas = totais['TOTAL_TURMAS']
         
         col1, col2, col3, col4 = st.columns(4)
         
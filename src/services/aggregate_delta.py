@@ -0,0 +1,100 @@
+"""
+Manutenção incremental de agregados por grupo a partir de deltas de linhas
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# (coluna de agrupamento, agregações, colunas de saída), como em GROUPED_AGGREGATES
+GroupSpec = Tuple[str, Dict[str, str], List[str]]
+
+# Agregações que podem ser mantidas subtraindo e somando contribuições
+INCREMENTAL_FUNCTIONS = ('sum', 'count')
+
+
+def group_contributions(rows: pd.DataFrame, spec: GroupSpec) -> pd.DataFrame:
+    """
+    Calcula a contribuição de um conjunto de linhas para um agregado por grupo
+
+    Args:
+        rows: Linhas do dataset de origem
+        spec: Especificação do agregado
+
+    Returns:
+        DataFrame indexado pelo rótulo do grupo (texto), com as colunas de saída
+    """
+    group_column, agg_functions, columns = spec
+    contributions = rows.groupby(group_column, observed=True).agg(agg_functions)
+    contributions.index = contributions.index.astype(str)
+    contributions.index.name = columns[0]
+    contributions.columns = columns[1:]
+
+    # Inteiros sem sinal não suportam subtração; acumula em int64
+    for column in contributions.columns:
+        if pd.api.types.is_integer_dtype(contributions[column]):
+            contributions[column] = contributions[column].astype(np.int64)
+
+    return contributions
+
+
+def apply_group_delta(aggregate: pd.DataFrame, spec: GroupSpec,
+                      removed: pd.DataFrame, added: pd.DataFrame) -> pd.DataFrame:
+    """
+    Atualiza um agregado por grupo subtraindo as linhas removidas e somando as novas
+
+    Args:
+        aggregate: Agregado atual (como criado por _create_aggregate)
+        spec: Especificação do agregado
+        removed: Linhas antigas (removidas ou substituídas) do dataset de origem
+        added: Linhas novas do dataset de origem
+
+    Returns:
+        Novo DataFrame agregado, na mesma ordem de um recálculo completo
+    """
+    _, agg_functions, columns = spec
+    if any(function not in INCREMENTAL_FUNCTIONS for function in agg_functions.values()):
+        raise ValueError("Agregado com funções não incrementais")
+
+    key = columns[0]
+    # Grupos que ficam sem linhas somem, como no groupby completo
+    count_columns = [
+        column for column, function in zip(columns[1:], agg_functions.values())
+        if function == 'count'
+    ]
+
+    result = aggregate.set_index(key)
+    dtypes = result.dtypes
+    result = result.sub(group_contributions(removed, spec), fill_value=0)
+    result = result.add(group_contributions(added, spec), fill_value=0)
+
+    if count_columns:
+        result = result[(result[count_columns] > 0).any(axis=1)]
+
+    for column in result.columns:
+        if pd.api.types.is_integer_dtype(dtypes[column]):
+            result[column] = result[column].round().astype(dtypes[column])
+
+    return result.sort_index().reset_index()[columns]
+
+
+def aggregates_equal(left: pd.DataFrame, right: pd.DataFrame) -> bool:
+    """
+    Compara dois agregados (mesmas colunas, linhas e valores)
+
+    Args:
+        left: Agregado atualizado incrementalmente
+        right: Agregado recalculado
+
+    Returns:
+        True se forem equivalentes
+    """
+    try:
+        pd.testing.assert_frame_equal(
+            left.reset_index(drop=True), right.reset_index(drop=True), check_dtype=False
+        )
+    except AssertionError:
+        return False
+
+    return True
@@ -0,0 +1,167 @@
+"""
+Artefatos de agregados pré-calculados na ingestão
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from .snapshot import file_md5, read_snapshot, write_snapshot
+
+AGGREGATES_MANIFEST = 'manifest.json'
+
+
+def read_md5_listing(md5_path: str) -> Dict[str, str]:
+    """
+    Lê um arquivo de MD5 no formato do INEP ("<md5> *<arquivo>")
+
+    Args:
+        md5_path: Caminho do arquivo de MD5
+
+    Returns:
+        Dicionário arquivo -> MD5 (vazio se o arquivo não existir)
+    """
+    if not os.path.exists(md5_path):
+        return {}
+
+    listing = {}
+    with open(md5_path, encoding='utf-8') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 2:
+                listing[parts[1].lstrip('*')] = parts[0].upper()
+
+    return listing
+
+
+def aggregate_inputs(md5_path: str, extracted_paths: List[str]) -> Dict[str, str]:
+    """
+    Monta as entradas que identificam uma versão dos agregados
+
+    Args:
+        md5_path: Arquivo de MD5 dos microdados nacionais do INEP
+        extracted_paths: CSVs extraídos usados na agregação
+
+    Returns:
+        Dicionário arquivo -> MD5 com os microdados e os CSVs extraídos
+    """
+    inputs = read_md5_listing(md5_path)
+    for path in extracted_paths:
+        inputs[os.path.basename(path)] = file_md5(path) if os.path.exists(path) else None
+
+    return inputs
+
+
+def aggregate_key(inputs: Dict[str, str]) -> str:
+    """
+    Calcula a chave de versão dos agregados a partir das entradas
+
+    Args:
+        inputs: Dicionário arquivo -> MD5
+
+    Returns:
+        Chave hexadecimal curta
+    """
+    payload = json.dumps(inputs, sort_keys=True).encode('utf-8')
+    return hashlib.sha1(payload).hexdigest()[:16]
+
+
+def write_aggregate_artifacts(aggregates: Dict[str, pd.DataFrame],
+                              inputs: Dict[str, str], base_dir: str) -> str:
+    """
+    Grava os agregados em um diretório versionado pela chave das entradas
+
+    Args:
+        aggregates: Dicionário nome -> DataFrame agregado
+        inputs: Dicionário arquivo -> MD5 das entradas
+        base_dir: Diretório base dos artefatos
+
+    Returns:
+        Caminho do diretório da versão gravada
+    """
+    version_dir = os.path.join(base_dir, aggregate_key(inputs))
+    tmp_dir = version_dir + '.tmp'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    for name, df in aggregates.items():
+        write_snapshot(df, os.path.join(tmp_dir, f'{name}.snapshot'))
+
+    manifest = {
+        "inputs": inputs,
+        "datasets": list(aggregates.keys())
+    }
+    with open(os.path.join(tmp_dir, AGGREGATES_MANIFEST), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    shutil.rmtree(version_dir, ignore_errors=True)
+    os.replace(tmp_dir, version_dir)
+
+    return version_dir
+
+
+def _read_manifest(inputs: Dict[str, str], base_dir: str) -> Optional[Dict[str, Any]]:
+    """Lê o manifesto da versão correspondente às entradas, se existir"""
+    version_dir = os.path.join(base_dir, aggregate_key(inputs))
+    manifest_path = os.path.join(version_dir, AGGREGATES_MANIFEST)
+    if not os.path.exists(manifest_path):
+        return None
+
+    with open(manifest_path, encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    if manifest.get("inputs") != inputs:
+        return None
+
+    manifest["dir"] = version_dir
+    return manifest
+
+
+def read_aggregate_artifact(inputs: Dict[str, str], base_dir: str,
+                            name: str) -> Optional[pd.DataFrame]:
+    """
+    Lê um único agregado gravado para as entradas atuais
+
+    Args:
+        inputs: Dicionário arquivo -> MD5 das entradas atuais
+        base_dir: Diretório base dos artefatos
+        name: Nome do agregado
+
+    Returns:
+        DataFrame ou None se não houver versão correspondente
+    """
+    manifest = _read_manifest(inputs, base_dir)
+    if manifest is None or name not in manifest["datasets"]:
+        return None
+
+    return read_snapshot(os.path.join(manifest["dir"], f'{name}.snapshot'))
+
+
+def read_aggregate_artifacts(inputs: Dict[str, str],
+                             base_dir: str) -> Optional[Dict[str, pd.DataFrame]]:
+    """
+    Lê os agregados gravados para as entradas atuais
+
+    Args:
+        inputs: Dicionário arquivo -> MD5 das entradas atuais
+        base_dir: Diretório base dos artefatos
+
+    Returns:
+        Dicionário nome -> DataFrame ou None se não houver versão correspondente
+    """
+    manifest = _read_manifest(inputs, base_dir)
+    if manifest is None:
+        return None
+
+    aggregates = {}
+    for name in manifest["datasets"]:
+        df = read_snapshot(os.path.join(manifest["dir"], f'{name}.snapshot'))
+        if df is None:
+            return None
+        aggregates[name] = df
+
+    return aggregates
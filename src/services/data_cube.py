@@ -0,0 +1,133 @@
+"""
+Cubo OLAP pré-agregado para filtros por dependência, localização e município
+"""
+
+from itertools import combinations
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+CUBE_DIMENSIONS = ['TP_DEPENDENCIA_NOME', 'TP_LOCALIZACAO_NOME', 'NO_MUNICIPIO']
+CUBE_MEASURES = ['TOTAL_PROFESSORES', 'TOTAL_MATRICULAS', 'TOTAL_TURMAS']
+CUBE_COUNT = 'TOTAL_ESCOLAS'
+
+
+class DataCube:
+    """Somas e contagens materializadas para todas as combinações de dimensões"""
+
+    def __init__(self, df: pd.DataFrame,
+                 dimensions: Optional[List[str]] = None,
+                 measures: Optional[List[str]] = None,
+                 count_column: str = 'CO_ENTIDADE'):
+        """
+        Constrói o cubo com todos os rollups das dimensões
+
+        Args:
+            df: DataFrame no nível de linha (ex.: escolas)
+            dimensions: Colunas de dimensão
+            measures: Colunas somadas
+            count_column: Coluna contada em TOTAL_ESCOLAS
+        """
+        self.dimensions = list(dimensions or CUBE_DIMENSIONS)
+        self.measures = list(measures or CUBE_MEASURES)
+        self.columns = self.measures + [CUBE_COUNT]
+
+        # Única passada sobre as linhas; os rollups partem deste cuboide base
+        base = df.groupby(self.dimensions, observed=True).agg(
+            **{measure: (measure, 'sum') for measure in self.measures},
+            **{CUBE_COUNT: (count_column, 'count')}
+        ).reset_index()
+        for dimension in self.dimensions:
+            if isinstance(base[dimension].dtype, pd.CategoricalDtype):
+                base[dimension] = base[dimension].astype(str)
+        base[self.columns] = base[self.columns].astype(np.int64)
+
+        self._totals: Dict[Tuple[str, ...], Dict[Tuple[Any, ...], Dict[str, int]]] = {}
+        self._groups: Dict[Tuple[Tuple[str, ...], str], Dict[Tuple[Any, ...], pd.DataFrame]] = {}
+
+        for size in range(len(self.dimensions) + 1):
+            for dims in combinations(self.dimensions, size):
+                self._totals[dims] = self._rollup_totals(base, dims)
+
+        for group_by in self.dimensions:
+            others = [d for d in self.dimensions if d != group_by]
+            for size in range(len(others) + 1):
+                for filter_dims in combinations(others, size):
+                    self._groups[(filter_dims, group_by)] = self._rollup_groups(base, filter_dims, group_by)
+
+    def _rollup_totals(self, base: pd.DataFrame,
+                       dims: Tuple[str, ...]) -> Dict[Tuple[Any, ...], Dict[str, int]]:
+        """Materializa os totais de um cuboide indexados pela chave das dimensões"""
+        if not dims:
+            return {(): {column: int(base[column].sum()) for column in self.columns}}
+
+        cuboid = base.groupby(list(dims))[self.columns].sum()
+        keys = cuboid.index if len(dims) > 1 else [(key,) for key in cuboid.index]
+        return {
+            tuple(key): dict(zip(self.columns, (int(v) for v in row)))
+            for key, row in zip(keys, cuboid.to_numpy())
+        }
+
+    def _rollup_groups(self, base: pd.DataFrame, filter_dims: Tuple[str, ...],
+                       group_by: str) -> Dict[Tuple[Any, ...], pd.DataFrame]:
+        """Materializa as tabelas por group_by para cada combinação de filtros"""
+        cuboid = base.groupby(list(filter_dims) + [group_by])[self.columns].sum().reset_index()
+        if not filter_dims:
+            return {(): cuboid}
+
+        return {
+            key if isinstance(key, tuple) else (key,): frame.drop(columns=list(filter_dims)).reset_index(drop=True)
+            for key, frame in cuboid.groupby(list(filter_dims))
+        }
+
+    def _normalize_filters(self, filters: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Remove filtros vazios e valida as dimensões"""
+        filters = {d: v for d, v in (filters or {}).items() if v is not None}
+        unknown = set(filters) - set(self.dimensions)
+        if unknown:
+            raise ValueError(f"Dimensões não presentes no cubo: {sorted(unknown)}")
+        return filters
+
+    def totals(self, filters: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+        """
+        Obtém somas e contagem de escolas para uma combinação de filtros
+
+        Args:
+            filters: Dicionário dimensão -> valor (None ignora a dimensão)
+
+        Returns:
+            Dicionário com os totais (zeros se a combinação não existir)
+        """
+        filters = self._normalize_filters(filters)
+        dims = tuple(d for d in self.dimensions if d in filters)
+        key = tuple(filters[d] for d in dims)
+        return dict(self._totals[dims].get(key, dict.fromkeys(self.columns, 0)))
+
+    def group(self, group_by: str, filters: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+        """
+        Obtém os totais por valor de uma dimensão, com filtros nas demais
+
+        Args:
+            group_by: Dimensão de agrupamento
+            filters: Dicionário dimensão -> valor (None ignora a dimensão)
+
+        Returns:
+            DataFrame com a coluna group_by, as medidas e TOTAL_ESCOLAS
+        """
+        filters = self._normalize_filters(filters)
+        if group_by not in self.dimensions:
+            raise ValueError(f"Dimensão '{group_by}' não presente no cubo")
+
+        # Filtro na própria dimensão de agrupamento restringe as linhas do resultado
+        group_value = filters.pop(group_by, None)
+        filter_dims = tuple(d for d in self.dimensions if d in filters)
+        key = tuple(filters[d] for d in filter_dims)
+
+        frame = self._groups[(filter_dims, group_by)].get(key)
+        if frame is None:
+            return pd.DataFrame(columns=[group_by] + self.columns)
+        if group_value is not None:
+            frame = frame[frame[group_by] == group_value]
+
+        return frame.copy()
@@ -4,11 +4,121 @@ Serviço para gerenciamento de dados
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Optional, Tuple
-from datetime import datetime, timedelta
-import json
+from typing import Dict, List, Any, BinaryIO, Iterator, Optional, Tuple
+from datetime import datetime
 import os
-import streamlit as st
+import threading
+
+from .dataset_registry import compute_source_fingerprint, get_dataset_registry
+from .snapshot import SNAPSHOT_META, read_snapshot, snapshot_path_for
+from .aggregates import aggregate_inputs, read_aggregate_artifact, write_aggregate_artifacts
+from .dtype_plan import CURSOS_DTYPE_PLAN, ESCOLAS_DTYPE_PLAN, apply_dtype_plan
+from .data_cube import DataCube
+from .query_plan import compile_filters, compile_operations
+from .indexes import INDEXED_COLUMNS, DatasetIndexes
+from .dataset_graph import DatasetGraph, LazyDatasets
+from .reloader import RELOAD_INTERVAL, SourceReloader
+from .export_stream import EXPORT_CHUNK_ROWS, export_filename, iter_export, write_chunks
+from .aggregate_delta import aggregates_equal, apply_group_delta
+from utils.summary_stats import summary_statistics
+from utils.profiler import profile_frame
+from utils.schema_contract import get_contract
+
+# Arquivos de dados reais do ES
+DATA_DIR = os.path.join('data', 'dados')
+ESCOLAS_CSV = os.path.join(DATA_DIR, 'escolas_es_2024.csv')
+CURSOS_CSV = os.path.join(DATA_DIR, 'cursos_tecnicos_es_2024.csv')
+
+# MD5 dos microdados nacionais e agregados pré-calculados
+MD5_LISTING = os.path.join(DATA_DIR, 'md5_microdados_ed_basica_2024.txt')
+AGGREGATES_DIR = os.path.join(DATA_DIR, 'agregados')
+
+# Agregados e o dataset de que cada um depende
+AGGREGATE_SOURCES = {
+    "municipios": "escolas",
+    "dependencia": "escolas",
+    "localizacao": "escolas",
+    "cursos_municipio": "cursos_tecnicos",
+    "top_cursos": "cursos_tecnicos"
+}
+
+# Agregados por grupo: (coluna de agrupamento, agregações, colunas de saída)
+GROUPED_AGGREGATES = {
+    # Dados por município
+    "municipios": ('NO_MUNICIPIO', {
+        'TOTAL_PROFESSORES': 'sum',
+        'TOTAL_MATRICULAS': 'sum',
+        'TOTAL_TURMAS': 'sum',
+        'CO_ENTIDADE': 'count'
+    }, ['Municipio', 'Total_Professores', 'Total_Matriculas', 'Total_Turmas', 'Total_Escolas']),
+    # Dados por dependência
+    "dependencia": ('TP_DEPENDENCIA_NOME', {
+        'TOTAL_PROFESSORES': 'sum',
+        'TOTAL_MATRICULAS': 'sum',
+        'CO_ENTIDADE': 'count'
+    }, ['Dependencia', 'Total_Professores', 'Total_Matriculas', 'Total_Escolas']),
+    # Dados por localização
+    "localizacao": ('TP_LOCALIZACAO_NOME', {
+        'TOTAL_PROFESSORES': 'sum',
+        'TOTAL_MATRICULAS': 'sum',
+        'CO_ENTIDADE': 'count'
+    }, ['Localizacao', 'Total_Professores', 'Total_Matriculas', 'Total_Escolas']),
+    # Dados dos cursos técnicos por município
+    "cursos_municipio": ('NO_MUNICIPIO', {
+        'TOTAL_MATRICULAS': 'sum',
+        'TOTAL_CURSOS': 'sum',
+        'NO_CURSO_EDUC_PROFISSIONAL': 'count'
+    }, ['Municipio', 'Total_Matriculas', 'Total_Cursos', 'Ofertas_Cursos'])
+}
+
+# Datasets simulados servidos quando os dados reais não estão disponíveis
+SAMPLE_DATASETS = ["evolucao", "regioes", "programas", "sazonal", "estados"]
+
+SOURCE_FILES = [
+    ESCOLAS_CSV,
+    CURSOS_CSV,
+    MD5_LISTING,
+    os.path.join(snapshot_path_for(ESCOLAS_CSV), SNAPSHOT_META),
+    os.path.join(snapshot_path_for(CURSOS_CSV), SNAPSHOT_META)
+]
+
+# Recarregador em segundo plano do processo (ver start_background_reload)
+_reloader: Optional[SourceReloader] = None
+_reloader_lock = threading.Lock()
+
+
+def start_background_reload(interval: float = RELOAD_INTERVAL) -> SourceReloader:
+    """
+    Inicia (uma vez por processo) a recarga em segundo plano dos datasets
+    
+    Com o recarregador ativo, as sessões servem a versão atual do registro
+    sem verificar as fontes; a nova versão é preparada em outra thread e
+    trocada atomicamente quando fica pronta.
+    
+    Args:
+        interval: Intervalo entre verificações das fontes em segundos
+        
+    Returns:
+        SourceReloader ativo
+    """
+    global _reloader
+    with _reloader_lock:
+        if _reloader is None:
+            _reloader = SourceReloader(
+                SOURCE_FILES,
+                lambda current: DataService()._prepare_reload(current),
+                get_dataset_registry(),
+                interval=interval
+            )
+        _reloader.start()
+    
+    return _reloader
+
+
+def _source_available(csv_path: str) -> bool:
+    """Verifica se um dataset extraído pode ser lido (CSV ou snapshot colunar)"""
+    return os.path.exists(csv_path) or os.path.exists(os.path.join(snapshot_path_for(csv_path), SNAPSHOT_META))
+
 
 class DataService:
     """Serviço para gerenciamento e manipulação de dados"""
@@ -18,6 +128,89 @@ class DataService:
         self.data_cache = {}
         self.data_sources = {}
         self.last_update = None
+        self._fingerprint = None
+        self._derived = {}
+        self._datasets = None
+    
+    def _dataset_graph(self, sample_fallback: bool = True) -> DatasetGraph:
+        """
+        Monta o grafo de datasets reais com suas dependências
+        
+        Args:
+            sample_fallback: Sem os arquivos de origem, monta o grafo dos
+                dados simulados (como o fallback de load_real_data)
+        
+        Returns:
+            DatasetGraph com escolas, cursos técnicos e agregados
+        """
+        graph = DatasetGraph()
+        
+        if sample_fallback and not all(_source_available(path) for path in (ESCOLAS_CSV, CURSOS_CSV)):
+            def build_sample(get):
+                print("Dados reais não encontrados. Carregando dados simulados como fallback...")
+                return self._sample_datasets()
+            
+            graph.register("_sample", build_sample)
+            for name in SAMPLE_DATASETS:
+                graph.register(name, lambda get, name=name: get("_sample")[name], depends_on=("_sample",))
+            return graph
+        
+        graph.register("escolas", lambda get: apply_dtype_plan(
+            self._process_escolas_data(self._read_source(ESCOLAS_CSV, ESCOLAS_DTYPE_PLAN)),
+            ESCOLAS_DTYPE_PLAN
+        ))
+        graph.register("cursos_tecnicos", lambda get: apply_dtype_plan(
+            self._process_cursos_data(self._read_source(CURSOS_CSV, CURSOS_DTYPE_PLAN)),
+            CURSOS_DTYPE_PLAN
+        ))
+        
+        # Entradas dos artefatos: apenas MD5 dos arquivos, sem parsing
+        graph.register("_aggregate_inputs", 
+                       lambda get: aggregate_inputs(MD5_LISTING, [ESCOLAS_CSV, CURSOS_CSV]))
+        
+        for name, source in AGGREGATE_SOURCES.items():
+            graph.register(name, self._aggregate_builder(name, source), 
+                           depends_on=("_aggregate_inputs", source))
+        
+        return graph
+    
+    def _aggregate_builder(self, name: str, source: str):
+        """Builder de agregado: usa o artefato pré-calculado e só carrega a origem se faltar"""
+        def build(get):
+            aggregate = read_aggregate_artifact(get("_aggregate_inputs"), AGGREGATES_DIR, name)
+            if aggregate is None:
+                aggregate = self._create_aggregate(name, get(source))
+            return aggregate
+        return build
+    
+    def _prepare_reload(self, current: Tuple[Any, LazyDatasets]) -> Tuple[LazyDatasets, Dict[str, Any]]:
+        """
+        Prepara uma nova versão dos datasets antes de publicá-la no registro
+        
+        Os datasets e estruturas derivadas já usados na versão atual são
+        construídos de antemão, para que a troca não cause espera nas sessões.
+        
+        Args:
+            current: Tupla (impressão digital, datasets) da versão atual
+            
+        Returns:
+            Tupla (datasets, estruturas derivadas) da nova versão
+        """
+        fingerprint, previous = current
+        self._datasets = LazyDatasets(self._dataset_graph())
+        
+        for name in previous.loaded():
+            if self._datasets.get(name) is None:
+                raise ValueError(f"Dataset '{name}' não pôde ser recarregado")
+        
+        # Sem impressão digital, as estruturas derivadas ficam em self._derived
+        for name in get_dataset_registry().derived_names(fingerprint):
+            if name == "cube":
+                self.get_cube()
+            elif name.startswith("indexes:"):
+                self.get_indexes(name.split(":", 1)[1])
+        
+        return self._datasets, self._derived
     
     def load_real_data(self) -> Dict[str, pd.DataFrame]:
         """
@@ -27,26 +220,9 @@ class DataService:
             Dicionário com DataFrames dos dados reais
         """
         try:
-            # Carregar dados das escolas do ES
-            escolas_df = pd.read_csv('data/dados/escolas_es_2024.csv', encoding='utf-8')
-            
-            # Carregar dados dos cursos técnicos do ES
-            cursos_df = pd.read_csv('data/dados/cursos_tecnicos_es_2024.csv', encoding='utf-8')
-            
-            # Processar dados das escolas
-            escolas_processed = self._process_escolas_data(escolas_df)
-            
-            # Processar dados dos cursos
-            cursos_processed = self._process_cursos_data(cursos_df)
-            
-            # Criar dados agregados para visualizações
-            aggregated_data = self._create_aggregated_data(escolas_processed, cursos_processed)
-            
-            data = {
-                "escolas": escolas_processed,
-                "cursos_tecnicos": cursos_processed,
-                **aggregated_data
-            }
+            # Carregar e processar todos os datasets do grafo
+            datasets = LazyDatasets(self._dataset_graph(), raise_errors=True)
+            data = {name: datasets.get(name) for name in self._dataset_graph().names()}
             
             # Armazenando no cache
             self.data_cache = data
@@ -59,10 +235,38 @@ class DataService:
             print("Carregando dados simulados como fallback...")
             return self.load_sample_data()
     
+    def build_aggregate_artifacts(self) -> str:
+        """
+        Pré-calcula os agregados e grava os artefatos versionados pelas entradas
+        
+        Returns:
+            Caminho do diretório da versão gravada
+        """
+        datasets = LazyDatasets(self._dataset_graph(sample_fallback=False), raise_errors=True)
+        aggregated_data = self._create_aggregated_data(datasets.get("escolas"), datasets.get("cursos_tecnicos"))
+        
+        inputs = aggregate_inputs(MD5_LISTING, [ESCOLAS_CSV, CURSOS_CSV])
+        return write_aggregate_artifacts(aggregated_data, inputs, AGGREGATES_DIR)
+    
     def load_sample_data(self) -> Dict[str, pd.DataFrame]:
         """
         Carrega dados de exemplo para demonstração
         
+        Returns:
+            Dicionário com DataFrames de exemplo
+        """
+        data = self._sample_datasets()
+        
+        # Armazenando no cache
+        self.data_cache = data
+        self.last_update = datetime.now()
+        
+        return data
+    
+    def _sample_datasets(self) -> Dict[str, pd.DataFrame]:
+        """
+        Monta os DataFrames de exemplo (SAMPLE_DATASETS)
+        
         Returns:
             Dicionário com DataFrames de exemplo
         """
@@ -132,10 +336,6 @@ class DataService:
             "estados": pd.DataFrame(estados_data)
         }
         
-        # Armazenando no cache
-        self.data_cache = data
-        self.last_update = datetime.now()
-        
         return data
     
     def get_data(self, dataset_name: str) -> Optional[pd.DataFrame]:
@@ -148,10 +348,187 @@ class DataService:
         Returns:
             DataFrame ou None se não encontrado
         """
+        if self.data_cache:
+            return self.data_cache.get(dataset_name)
+        
+        self._resolve_datasets()
+        
+        # Apenas o subgrafo necessário para o dataset é calculado
+        if dataset_name.startswith('_'):
+            return None
+        return self._datasets.get(dataset_name)
+    
+    def _resolve_datasets(self) -> None:
+        """Associa a instância à versão dos datasets servida pelo registro"""
+        if self._datasets is None:
+            # Datasets compartilhados entre sessões, recarregados só quando as fontes mudam
+            registry = get_dataset_registry()
+            current = registry.current()
+            if current is not None and _reloader is not None and _reloader.is_running():
+                # O recarregador mantém a versão atualizada: nenhuma sessão espera pela recarga
+                fingerprint, self._datasets = current
+            else:
+                fingerprint = compute_source_fingerprint(SOURCE_FILES)
+                self._datasets = registry.get_or_load(fingerprint, lambda: LazyDatasets(self._dataset_graph()))
+            self.last_update = registry.loaded_at(fingerprint)
+            self._fingerprint = fingerprint
+    
+    def data_version(self) -> Tuple[Any, Optional[datetime]]:
+        """
+        Obtém um identificador da versão dos dados servida por esta instância
+        
+        Muda quando as fontes mudam, quando uma recarga é publicada ou quando
+        um delta é aplicado; serve de chave para caches de páginas.
+        
+        Returns:
+            Tupla (impressão digital das fontes, momento da carga)
+        """
         if not self.data_cache:
-            self.load_real_data()
+            self._resolve_datasets()
+        
+        return self._fingerprint, self.last_update
+    
+    def _get_derived(self, name: str, builder) -> Any:
+        """
+        Obtém uma estrutura derivada dos datasets, compartilhada pelo registro
+        
+        Args:
+            name: Nome da estrutura derivada
+            builder: Função que constrói a estrutura
+            
+        Returns:
+            Estrutura derivada
+        """
+        if self._fingerprint is not None:
+            return get_dataset_registry().get_derived(self._fingerprint, name, builder)
+        
+        # Dados carregados fora do registro: cache apenas nesta instância
+        if name not in self._derived:
+            self._derived[name] = builder()
+        return self._derived[name]
+    
+    def get_cube(self) -> Optional[DataCube]:
+        """
+        Obtém o cubo pré-agregado das escolas (dependência × localização × município)
+        
+        Returns:
+            DataCube ou None se não houver dados de escolas
+        """
+        escolas_df = self.get_data("escolas")
+        if escolas_df is None:
+            return None
+        
+        return self._get_derived("cube", lambda: DataCube(escolas_df))
+    
+    def get_indexes(self, dataset_name: str) -> Optional[DatasetIndexes]:
+        """
+        Obtém os índices secundários de um dataset, construídos uma vez por carga
+        
+        Args:
+            dataset_name: Nome do dataset
+            
+        Returns:
+            DatasetIndexes ou None se o dataset não tiver colunas indexadas
+        """
+        df = self.get_data(dataset_name)
+        if df is None or dataset_name not in INDEXED_COLUMNS:
+            return None
+        
+        return self._get_derived(f"indexes:{dataset_name}",
+                                 lambda: DatasetIndexes(df, INDEXED_COLUMNS[dataset_name]))
+    
+    def preload_datasets(self) -> List[str]:
+        """
+        Carrega todos os datasets públicos do grafo na versão servida
+        
+        Returns:
+            Nomes dos datasets carregados
+        """
+        names = self._dataset_graph().names()
+        return [name for name in names if self.get_data(name) is not None]
+    
+    def apply_delta(self, dataset_name: str, upserts: Optional[pd.DataFrame] = None,
+                    deletes: Optional[List[Any]] = None, verify: bool = False) -> Dict[str, pd.DataFrame]:
+        """
+        Aplica correções pontuais (por CO_ENTIDADE) a um dataset e atualiza seus agregados
+        
+        Os agregados por grupo são mantidos incrementalmente: a contribuição das
+        linhas antigas é subtraída e a das novas é somada, sem recalcular tudo.
+        
+        Args:
+            dataset_name: "escolas" ou "cursos_tecnicos"
+            upserts: Linhas novas ou corrigidas no formato do CSV de origem; substituem
+                todas as linhas existentes com o mesmo CO_ENTIDADE
+            deletes: Códigos CO_ENTIDADE removidos
+            verify: Compara cada agregado com o recálculo completo e usa o
+                recálculo em caso de divergência
+            
+        Returns:
+            Dicionário com o dataset e os agregados atualizados
+        """
+        pipelines = {
+            "escolas": (self._process_escolas_data, ESCOLAS_DTYPE_PLAN),
+            "cursos_tecnicos": (self._process_cursos_data, CURSOS_DTYPE_PLAN)
+        }
+        if dataset_name not in pipelines:
+            raise ValueError(f"Dataset '{dataset_name}' não suporta atualização incremental")
+        
+        df = self.get_data(dataset_name)
+        if df is None:
+            raise ValueError(f"Dataset '{dataset_name}' não carregado")
+        
+        process, dtype_plan = pipelines[dataset_name]
+        if upserts is not None and len(upserts):
+            added = process(upserts)
+        else:
+            added = df.iloc[0:0]
+        
+        keys = set(deletes or []) | set(added['CO_ENTIDADE'])
+        changed = df['CO_ENTIDADE'].isin(keys).to_numpy()
+        removed = df[changed]
+        updated = apply_dtype_plan(pd.concat([df[~changed], added], ignore_index=True), dtype_plan)
+        
+        results = {dataset_name: updated}
+        for name, source in AGGREGATE_SOURCES.items():
+            if source != dataset_name:
+                continue
+            
+            if name in GROUPED_AGGREGATES:
+                aggregate = apply_group_delta(self.get_data(name), GROUPED_AGGREGATES[name], removed, added)
+            else:
+                # Ranking (head) não é incremental: recalcula a partir do dataset atualizado
+                aggregate = self._create_aggregate(name, updated)
+            
+            if verify:
+                expected = self._create_aggregate(name, updated)
+                if not aggregates_equal(aggregate, expected):
+                    print(f"Agregado '{name}' divergiu do recálculo completo; usando o recálculo")
+                    aggregate = expected
+            
+            results[name] = aggregate
         
-        return self.data_cache.get(dataset_name)
+        if self.data_cache:
+            self.data_cache.update(results)
+            self.last_update = datetime.now()
+        else:
+            # Nova versão no registro: sessões passam a ver as correções; derivados são refeitos
+            self._datasets = self._datasets.with_values(results)
+            get_dataset_registry().publish(self._fingerprint, self._datasets)
+            self.last_update = get_dataset_registry().loaded_at(self._fingerprint)
+        self._derived = {}
+        
+        return results
+    
+    def invalidate_cache(self) -> None:
+        """
+        Descarta os datasets em cache, forçando nova carga das fontes
+        """
+        get_dataset_registry().invalidate()
+        self.data_cache = {}
+        self._datasets = None
+        self.last_update = None
+        self._fingerprint = None
+        self._derived = {}
     
     def get_filtered_data(self, dataset_name: str, 
                          filters: Dict[str, Any]) -> Optional[pd.DataFrame]:
@@ -169,21 +546,8 @@ class DataService:
         if df is None:
             return None
         
-        filtered_df = df.copy()
-        
-        for column, value in filters.items():
-            if column in filtered_df.columns:
-                if isinstance(value, (list, tuple)):
-                    filtered_df = filtered_df[filtered_df[column].isin(value)]
-                elif isinstance(value, dict):
-                    if 'min' in value:
-                        filtered_df = filtered_df[filtered_df[column] >= value['min']]
-                    if 'max' in value:
-                        filtered_df = filtered_df[filtered_df[column] <= value['max']]
-                else:
-                    filtered_df = filtered_df[filtered_df[column] == value]
-        
-        return filtered_df
+        # Igualdades e "in" por índices; demais predicados só sobre as linhas restantes
+        return compile_filters(filters).execute(df, indexes=self.get_indexes(dataset_name))
     
     def get_summary_statistics(self, dataset_name: str, 
                               group_by: Optional[str] = None) -> Dict[str, Any]:
@@ -201,13 +565,11 @@ class DataService:
         if df is None:
             return {}
         
-        if group_by and group_by in df.columns:
-            summary = df.groupby(group_by).agg({
-                col: ['count', 'mean', 'std', 'min', 'max'] 
-                for col in df.select_dtypes(include=[np.number]).columns
-            }).round(2)
-        else:
-            summary = df.describe().round(2)
+        # Calculadas uma vez por versão dos dados no armazenamento de estatísticas
+        group_by = group_by if group_by and group_by in df.columns else None
+        summary = summary_statistics(
+            df, group_by, version=(dataset_name,) + self.data_version()
+        ).round(2)
         
         return {
             "dataset": dataset_name,
@@ -224,11 +586,12 @@ class DataService:
         Returns:
             Dicionário com informações dos datasets
         """
-        if not self.data_cache:
-            self.load_sample_data()
+        datasets = self.data_cache or (self._datasets.loaded() if self._datasets else {})
+        if not datasets:
+            datasets = self.load_sample_data()
         
         info = {}
-        for name, df in self.data_cache.items():
+        for name, df in datasets.items():
             info[name] = {
                 "shape": df.shape,
                 "columns": list(df.columns),
@@ -239,38 +602,74 @@ class DataService:
         
         return info
     
+    def _export_frame(self, dataset_name: str, 
+                      filters: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+        """Dataset (ou sua seleção filtrada) a exportar"""
+        if filters:
+            df = self.get_filtered_data(dataset_name, filters)
+        else:
+            df = self.get_data(dataset_name)
+        if df is None:
+            raise ValueError(f"Dataset '{dataset_name}' não encontrado")
+        return df
+    
+    def stream_export(self, dataset_name: str, format: str = "csv", 
+                      filters: Optional[Dict[str, Any]] = None,
+                      chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[bytes]:
+        """
+        Exporta dados como blocos codificados, sem arquivo intermediário
+        
+        Args:
+            dataset_name: Nome do dataset
+            format: "csv", "ndjson", "json" ou "parquet"
+            filters: Filtros como em get_filtered_data
+            chunk_rows: Linhas por bloco
+            
+        Returns:
+            Iterador de bytes (para st.download_button, HTTP ou sys.stdout.buffer)
+        """
+        return iter_export(self._export_frame(dataset_name, filters), format, chunk_rows)
+    
     def export_data(self, dataset_name: str, format: str = "csv", 
-                    filename: Optional[str] = None) -> str:
+                    filename: Optional[str] = None,
+                    fileobj: Optional[BinaryIO] = None,
+                    filters: Optional[Dict[str, Any]] = None) -> str:
         """
         Exporta dados para arquivo
         
+        CSV, NDJSON, JSON e Parquet são escritos bloco a bloco; Excel é
+        gerado de uma vez.
+        
         Args:
             dataset_name: Nome do dataset
-            format: Formato de exportação
-            filename: Nome do arquivo
+            format: Formato de exportação ("csv", "ndjson", "json", "parquet" ou "excel")
+            filename: Nome do arquivo (sem extensão)
+            fileobj: Arquivo binário aberto; se informado, nada é gravado em disco
+            filters: Filtros como em get_filtered_data
             
         Returns:
-            Caminho do arquivo exportado
+            Caminho (ou nome, com fileobj) do arquivo exportado
         """
-        df = self.get_data(dataset_name)
-        if df is None:
-            raise ValueError(f"Dataset '{dataset_name}' não encontrado")
+        df = self._export_frame(dataset_name, filters)
         
         if not filename:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"{dataset_name}_{timestamp}"
         
-        if format.lower() == "csv":
-            filepath = f"{filename}.csv"
-            df.to_csv(filepath, index=False)
-        elif format.lower() == "excel":
+        if format.lower() == "excel":
             filepath = f"{filename}.xlsx"
-            df.to_excel(filepath, index=False)
-        elif format.lower() == "json":
-            filepath = f"{filename}.json"
-            df.to_json(filepath, orient="records", indent=2)
+            df.to_excel(fileobj if fileobj is not None else filepath, index=False)
+            return filepath
+        
+        # Valida o formato antes de abrir o arquivo de destino
+        chunks = iter_export(df, format)
+        filepath = export_filename(filename, format)
+        
+        if fileobj is not None:
+            write_chunks(chunks, fileobj)
         else:
-            raise ValueError(f"Formato '{format}' não suportado")
+            with open(filepath, 'wb') as f:
+                write_chunks(chunks, f)
         
         return filepath
     
@@ -290,46 +689,8 @@ class DataService:
         if df is None:
             raise ValueError(f"Dataset '{base_dataset}' não encontrado")
         
-        derived_df = df.copy()
-        
-        for operation in operations:
-            op_type = operation.get("type")
-            
-            if op_type == "filter":
-                column = operation.get("column")
-                value = operation.get("value")
-                operator = operation.get("operator", "==")
-                
-                if operator == "==":
-                    derived_df = derived_df[derived_df[column] == value]
-                elif operator == "!=":
-                    derived_df = derived_df[derived_df[column] != value]
-                elif operator == ">":
-                    derived_df = derived_df[derived_df[column] > value]
-                elif operator == "<":
-                    derived_df = derived_df[derived_df[column] < value]
-                elif operator == ">=":
-                    derived_df = derived_df[derived_df[column] >= value]
-                elif operator == "<=":
-                    derived_df = derived_df[derived_df[column] <= value]
-                elif operator == "in":
-                    derived_df = derived_df[derived_df[column].isin(value)]
-            
-            elif op_type == "groupby":
-                columns = operation.get("columns", [])
-                agg_functions = operation.get("agg_functions", {})
-                derived_df = derived_df.groupby(columns).agg(agg_functions).reset_index()
-            
-            elif op_type == "sort":
-                columns = operation.get("columns", [])
-                ascending = operation.get("ascending", True)
-                derived_df = derived_df.sort_values(columns, ascending=ascending)
-            
-            elif op_type == "select":
-                columns = operation.get("columns", [])
-                derived_df = derived_df[columns]
-        
-        return derived_df
+        # Filtros combinados por estágio e projeção antecipada dos "select"
+        return compile_operations(operations).execute(df)
     
     def get_data_quality_report(self, dataset_name: str) -> Dict[str, Any]:
         """
@@ -345,33 +706,55 @@ class DataService:
         if df is None:
             return {}
         
-        report = {
-            "dataset": dataset_name,
-            "total_rows": len(df),
-            "total_columns": len(df.columns),
-            "missing_values": df.isnull().sum().to_dict(),
-            "missing_percentage": (df.isnull().sum() / len(df) * 100).to_dict(),
-            "duplicate_rows": df.duplicated().sum(),
-            "data_types": df.dtypes.to_dict(),
-            "unique_values": {col: df[col].nunique() for col in df.columns},
-            "memory_usage": df.memory_usage(deep=True).sum()
-        }
+        # Perfil em uma única passagem pelas colunas (distintos estimados em arquivos grandes)
+        report = {"dataset": dataset_name}
+        report.update(profile_frame(df).quality_report())
         
-        # Estatísticas para colunas numéricas
-        numeric_columns = df.select_dtypes(include=[np.number]).columns
-        if len(numeric_columns) > 0:
-            report["numeric_stats"] = {
-                col: {
-                    "mean": df[col].mean(),
-                    "std": df[col].std(),
-                    "min": df[col].min(),
-                    "max": df[col].max(),
-                    "median": df[col].median()
-                } for col in numeric_columns
-            }
+        return report
+    
+    def validate_dataset(self, dataset_name: str) -> Dict[str, Any]:
+        """
+        Valida um dataset contra seu contrato de esquema
+        
+        Args:
+            dataset_name: Nome do dataset ("escolas" ou "cursos_tecnicos")
+            
+        Returns:
+            Dicionário no formato de comprehensive_data_validation, ou vazio
+            se o dataset não existir ou não tiver contrato
+        """
+        df = self.get_data(dataset_name)
+        contract = get_contract(dataset_name)
+        if df is None or contract is None:
+            return {}
+        
+        # Verificações compiladas uma vez por conjunto de colunas e reaproveitadas
+        report = {"dataset": dataset_name}
+        report.update(contract.validate(df))
         
         return report
     
+    def _read_source(self, csv_path: str, 
+                     dtype_plan: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+        """
+        Lê um dataset extraído, preferindo o snapshot colunar ao CSV
+        
+        Args:
+            csv_path: Caminho do CSV extraído
+            dtype_plan: Plano de tipos; suas colunas categóricas são lidas
+                do snapshot sem decodificar
+            
+        Returns:
+            DataFrame com os dados
+        """
+        categorical_columns = dtype_plan.get("category") if dtype_plan else None
+        df = read_snapshot(snapshot_path_for(csv_path), source_path=csv_path,
+                           categorical_columns=categorical_columns)
+        if df is not None:
+            return df
+        
+        return pd.read_csv(csv_path, encoding='utf-8')
+    
     def _process_escolas_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Processa dados das escolas do ES
@@ -440,47 +823,43 @@ class DataService:
         Returns:
             Dicionário com dados agregados
         """
-        # Dados por município
-        municipios_data = escolas_df.groupby('NO_MUNICIPIO').agg({
-            'TOTAL_PROFESSORES': 'sum',
-            'TOTAL_MATRICULAS': 'sum',
-            'TOTAL_TURMAS': 'sum',
-            'CO_ENTIDADE': 'count'
-        }).reset_index()
-        municipios_data.columns = ['Municipio', 'Total_Professores', 'Total_Matriculas', 'Total_Turmas', 'Total_Escolas']
-        
-        # Dados por dependência
-        dependencia_data = escolas_df.groupby('TP_DEPENDENCIA_NOME').agg({
-            'TOTAL_PROFESSORES': 'sum',
-            'TOTAL_MATRICULAS': 'sum',
-            'CO_ENTIDADE': 'count'
-        }).reset_index()
-        dependencia_data.columns = ['Dependencia', 'Total_Professores', 'Total_Matriculas', 'Total_Escolas']
-        
-        # Dados por localização
-        localizacao_data = escolas_df.groupby('TP_LOCALIZACAO_NOME').agg({
-            'TOTAL_PROFESSORES': 'sum',
-            'TOTAL_MATRICULAS': 'sum',
-            'CO_ENTIDADE': 'count'
-        }).reset_index()
-        localizacao_data.columns = ['Localizacao', 'Total_Professores', 'Total_Matriculas', 'Total_Escolas']
-        
-        # Dados dos cursos técnicos por município
-        cursos_municipio = cursos_df.groupby('NO_MUNICIPIO').agg({
-            'TOTAL_MATRICULAS': 'sum',
-            'TOTAL_CURSOS': 'sum',
-            'NO_CURSO_EDUC_PROFISSIONAL': 'count'
-        }).reset_index()
-        cursos_municipio.columns = ['Municipio', 'Total_Matriculas', 'Total_Cursos', 'Ofertas_Cursos']
-        
-        # Top cursos técnicos
-        top_cursos = cursos_df['NO_CURSO_EDUC_PROFISSIONAL'].value_counts().head(20).reset_index()
-        top_cursos.columns = ['Curso', 'Ofertas']
+        sources = {"escolas": escolas_df, "cursos_tecnicos": cursos_df}
         
         return {
-            "municipios": municipios_data,
-            "dependencia": dependencia_data,
-            "localizacao": localizacao_data,
-            "cursos_municipio": cursos_municipio,
-            "top_cursos": top_cursos
+            name: self._create_aggregate(name, sources[source])
+            for name, source in AGGREGATE_SOURCES.items()
         }
+    
+    def _create_aggregate(self, name: str, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Cria um agregado para visualizações
+        
+        Args:
+            name: Nome do agregado (chave de AGGREGATE_SOURCES)
+            df: DataFrame de origem do agregado
+            
+        Returns:
+            DataFrame agregado
+        """
+        if name in GROUPED_AGGREGATES:
+            group_column, agg_functions, columns = GROUPED_AGGREGATES[name]
+            aggregate = df.groupby(group_column, observed=True).agg(agg_functions).reset_index()
+            aggregate.columns = columns
+        
+        elif name == "top_cursos":
+            # Top cursos técnicos
+            # Contagem sobre texto: empates mantêm a ordem de aparição, não a das categorias
+            aggregate = df['NO_CURSO_EDUC_PROFISSIONAL'].astype(str).value_counts().head(20).reset_index()
+            aggregate.columns = ['Curso', 'Ofertas']
+        
+        else:
+            raise ValueError(f"Agregado '{name}' não suportado")
+        
+        # Agregados são pequenos: rótulos como texto e totais como int64 com sinal
+        for column in aggregate.columns:
+            if isinstance(aggregate[column].dtype, pd.CategoricalDtype):
+                aggregate[column] = aggregate[column].astype(str)
+            elif pd.api.types.is_unsigned_integer_dtype(aggregate[column]):
+                aggregate[column] = aggregate[column].astype(np.int64)
+        
+        return aggregate
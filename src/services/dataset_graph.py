@@ -0,0 +1,122 @@
+"""
+Grafo de datasets com avaliação preguiçosa por dependências declaradas
+"""
+
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Builder recebe uma função get(nome) restrita às dependências declaradas
+Builder = Callable[[Callable[[str], Any]], Any]
+
+
+class DatasetGraph:
+    """Registro de nós (datasets) com suas funções de construção e dependências"""
+
+    def __init__(self):
+        """Inicializa o grafo vazio"""
+        self._nodes: Dict[str, Tuple[Builder, Tuple[str, ...]]] = {}
+
+    def register(self, name: str, builder: Builder, depends_on: Iterable[str] = ()) -> None:
+        """
+        Registra um nó do grafo
+
+        Args:
+            name: Nome do nó (nomes iniciados por "_" são internos)
+            builder: Função que recebe get(dependência) e retorna o valor do nó
+            depends_on: Nós que o builder pode solicitar
+        """
+        self._nodes[name] = (builder, tuple(depends_on))
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._nodes
+
+    def names(self) -> List[str]:
+        """Nomes públicos (datasets) do grafo"""
+        return [name for name in self._nodes if not name.startswith('_')]
+
+    def node(self, name: str) -> Tuple[Builder, Tuple[str, ...]]:
+        """Obtém builder e dependências de um nó"""
+        return self._nodes[name]
+
+
+class LazyDatasets:
+    """Valores de um grafo calculados sob demanda, uma única vez cada"""
+
+    def __init__(self, graph: DatasetGraph, raise_errors: bool = False):
+        """
+        Inicializa a avaliação preguiçosa
+
+        Args:
+            graph: Grafo de datasets
+            raise_errors: Propaga erros dos builders (senão o nó vale None)
+        """
+        self._graph = graph
+        self._raise_errors = raise_errors
+        self._values: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def get(self, name: str) -> Optional[Any]:
+        """
+        Obtém o valor de um nó, calculando apenas o subgrafo necessário
+
+        Args:
+            name: Nome do nó
+
+        Returns:
+            Valor do nó ou None se não existir ou falhar
+        """
+        if name in self._values:
+            return self._values[name]
+        if name not in self._graph:
+            return None
+
+        with self._lock:
+            if name in self._values:
+                return self._values[name]
+
+            builder, depends_on = self._graph.node(name)
+
+            def get_dependency(dependency: str) -> Any:
+                if dependency not in depends_on:
+                    raise KeyError(f"'{name}' não declara dependência de '{dependency}'")
+                return self.get(dependency)
+
+            try:
+                value = builder(get_dependency)
+            except Exception as e:
+                if self._raise_errors:
+                    raise
+                print(f"Erro ao carregar dataset '{name}': {e}")
+                value = None
+
+            self._values[name] = value
+            return value
+
+    def with_values(self, values: Dict[str, Any]) -> 'LazyDatasets':
+        """
+        Cria uma nova avaliação do mesmo grafo com alguns nós já definidos
+
+        Args:
+            values: Dicionário nome -> valor que substitui o cálculo do nó
+
+        Returns:
+            Nova instância; os demais valores já calculados são reaproveitados
+        """
+        datasets = LazyDatasets(self._graph, raise_errors=self._raise_errors)
+        with self._lock:
+            datasets._values = {**self._values, **values}
+
+        return datasets
+
+    def loaded(self) -> Dict[str, Any]:
+        """
+        Obtém os datasets públicos já calculados
+
+        Returns:
+            Dicionário nome -> valor
+        """
+        with self._lock:
+            return {
+                name: value for name, value in self._values.items()
+                if not name.startswith('_') and value is not None
+            }
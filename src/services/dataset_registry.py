@@ -0,0 +1,204 @@
+"""
+Registro de datasets compartilhado por todo o processo
+"""
+
+import os
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+
+def compute_source_fingerprint(paths: Iterable[str]) -> Tuple[Tuple[str, Optional[int], Optional[int]], ...]:
+    """
+    Calcula a impressão digital dos arquivos de origem
+
+    Args:
+        paths: Caminhos dos arquivos que compõem o dataset
+
+    Returns:
+        Tupla com (caminho, tamanho, mtime em ns) de cada arquivo
+    """
+    fingerprint = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            fingerprint.append((path, stat.st_size, stat.st_mtime_ns))
+        except OSError:
+            # Arquivo ausente também faz parte da versão
+            fingerprint.append((path, None, None))
+
+    return tuple(fingerprint)
+
+
+class DatasetRegistry:
+    """Cache thread-safe de datasets, uma carga por impressão digital das fontes"""
+
+    def __init__(self):
+        """Inicializa o registro vazio"""
+        self._lock = threading.Lock()
+        self._load_lock = threading.RLock()
+        self._entries: Dict[Any, Tuple[Dict[str, pd.DataFrame], datetime]] = {}
+        self._derived: Dict[Any, Dict[str, Any]] = {}
+
+    def get(self, fingerprint: Any) -> Optional[Dict[str, pd.DataFrame]]:
+        """
+        Obtém os datasets já carregados para uma impressão digital
+
+        Args:
+            fingerprint: Impressão digital das fontes
+
+        Returns:
+            Dicionário de DataFrames ou None se ainda não carregado
+        """
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+
+        return entry[0] if entry else None
+
+    def get_or_load(self, fingerprint: Any,
+                    loader: Callable[[], Dict[str, pd.DataFrame]]) -> Dict[str, pd.DataFrame]:
+        """
+        Obtém os datasets da impressão digital, carregando-os uma única vez
+
+        Os DataFrames retornados são compartilhados entre sessões e reruns
+        e devem ser tratados como somente leitura.
+
+        Args:
+            fingerprint: Impressão digital das fontes
+            loader: Função que carrega os datasets
+
+        Returns:
+            Dicionário de DataFrames
+        """
+        data = self.get(fingerprint)
+        if data is not None:
+            return data
+
+        # Apenas uma thread carrega; as demais aguardam e reutilizam o resultado
+        with self._load_lock:
+            data = self.get(fingerprint)
+            if data is not None:
+                return data
+
+            data = loader()
+            self.publish(fingerprint, data)
+
+        return data
+
+    def publish(self, fingerprint: Any, data: Any,
+                derived: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Troca atomicamente a versão servida pelo registro
+
+        Args:
+            fingerprint: Impressão digital das fontes da nova versão
+            data: Datasets da nova versão, já preparados
+            derived: Estruturas derivadas já construídas para a nova versão
+        """
+        with self._lock:
+            # Versões anteriores das fontes deixam de ser servidas
+            self._entries = {fingerprint: (data, datetime.now())}
+            self._derived = {fingerprint: dict(derived or {})}
+
+    def current(self) -> Optional[Tuple[Any, Any]]:
+        """
+        Obtém a versão servida atualmente, sem verificar as fontes
+
+        Returns:
+            Tupla (impressão digital, datasets) ou None se nada foi carregado
+        """
+        with self._lock:
+            for fingerprint, (data, _) in self._entries.items():
+                return fingerprint, data
+
+        return None
+
+    def derived_names(self, fingerprint: Any) -> List[str]:
+        """
+        Obtém os nomes das estruturas derivadas já construídas para uma versão
+
+        Args:
+            fingerprint: Impressão digital das fontes
+
+        Returns:
+            Lista de nomes
+        """
+        with self._lock:
+            return list(self._derived.get(fingerprint, {}))
+
+    def get_derived(self, fingerprint: Any, name: str, builder: Callable[[], Any]) -> Any:
+        """
+        Obtém uma estrutura derivada dos datasets (cubo, índices...), construída uma vez
+
+        Args:
+            fingerprint: Impressão digital dos datasets de origem
+            name: Nome da estrutura derivada
+            builder: Função que constrói a estrutura
+
+        Returns:
+            Estrutura derivada (não armazenada se a versão não estiver no registro)
+        """
+        with self._lock:
+            derived = self._derived.get(fingerprint)
+            if derived is not None and name in derived:
+                return derived[name]
+
+        with self._load_lock:
+            with self._lock:
+                derived = self._derived.get(fingerprint)
+                if derived is not None and name in derived:
+                    return derived[name]
+
+            value = builder()
+
+            with self._lock:
+                derived = self._derived.get(fingerprint)
+                if derived is not None:
+                    derived[name] = value
+
+        return value
+
+    def loaded_at(self, fingerprint: Any) -> Optional[datetime]:
+        """
+        Obtém o momento da carga de uma impressão digital
+
+        Args:
+            fingerprint: Impressão digital das fontes
+
+        Returns:
+            Data e hora da carga ou None
+        """
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+
+        return entry[1] if entry else None
+
+    def invalidate(self, fingerprint: Optional[Any] = None) -> None:
+        """
+        Remove datasets do registro
+
+        Args:
+            fingerprint: Impressão digital a remover (None remove todas)
+        """
+        with self._lock:
+            if fingerprint is None:
+                self._entries = {}
+                self._derived = {}
+            else:
+                self._entries.pop(fingerprint, None)
+                self._derived.pop(fingerprint, None)
+
+
+_registry = DatasetRegistry()
+
+
+def get_dataset_registry() -> DatasetRegistry:
+    """
+    Obtém o registro de datasets do processo
+
+    Returns:
+        Instância única de DatasetRegistry
+    """
+    return _registry
@@ -0,0 +1,66 @@
+"""
+Planos de tipos compactos para os datasets processados
+"""
+
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+# Nomes repetidos viram categóricos; contagens viram o menor inteiro sem sinal
+ESCOLAS_DTYPE_PLAN = {
+    "category": ['NO_MUNICIPIO', 'TP_DEPENDENCIA_NOME', 'TP_LOCALIZACAO_NOME'],
+    "unsigned": ['CO_ENTIDADE', 'TP_DEPENDENCIA', 'TP_LOCALIZACAO'],
+    "unsigned_prefixes": ('QT_', 'TOTAL_')
+}
+
+CURSOS_DTYPE_PLAN = {
+    "category": ['NO_MUNICIPIO', 'NO_CURSO_EDUC_PROFISSIONAL'],
+    "unsigned": ['CO_ENTIDADE'],
+    "unsigned_prefixes": ('QT_', 'TOTAL_')
+}
+
+
+def _compact_numeric(series: pd.Series) -> pd.Series:
+    """Converte uma coluna numérica para o menor tipo que representa seus valores"""
+    if not pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+        return series
+
+    values = series.to_numpy()
+    if series.isna().any():
+        # Ausentes não cabem em inteiros; float32 representa contagens exatamente até 2**24
+        return series.astype(np.float32) if series.dtype == np.float64 else series
+
+    if len(values) and values.min() >= 0 and np.array_equal(values, np.floor(values)):
+        return pd.to_numeric(series.astype(np.int64), downcast='unsigned')
+
+    return series
+
+
+def apply_dtype_plan(df: pd.DataFrame, plan: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Aplica um plano de tipos compactos a um DataFrame
+
+    Args:
+        df: DataFrame processado
+        plan: Plano com colunas categóricas ("category"), contagens
+            ("unsigned") e prefixos de contagens ("unsigned_prefixes")
+
+    Returns:
+        DataFrame com os tipos compactos
+    """
+    df = df.copy()
+
+    for column in plan.get("category", []):
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype('category')
+
+    prefixes = tuple(plan.get("unsigned_prefixes", ()))
+    unsigned_columns = [
+        column for column in df.columns
+        if column in plan.get("unsigned", []) or (prefixes and column.startswith(prefixes))
+    ]
+    for column in unsigned_columns:
+        df[column] = _compact_numeric(df[column])
+
+    return df
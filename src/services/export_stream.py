@@ -0,0 +1,241 @@
+"""
+Exportação de datasets em blocos codificados (CSV, NDJSON, JSON e Parquet)
+"""
+
+import io
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, Optional
+
+import pandas as pd
+
+# Linhas codificadas por bloco
+EXPORT_CHUNK_ROWS = 50_000
+
+# Formato -> (extensão, tipo MIME)
+EXPORT_FORMATS = {
+    "csv": ("csv", "text/csv"),
+    "ndjson": ("ndjson", "application/x-ndjson"),
+    "json": ("json", "application/json"),
+    "parquet": ("parquet", "application/vnd.apache.parquet")
+}
+
+
+def _row_chunks(df: pd.DataFrame, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """Fatias do DataFrame com até chunk_rows linhas (visões, sem cópia do todo)"""
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def iter_csv(df: pd.DataFrame, chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    Codifica um DataFrame em CSV (UTF-8), um bloco por vez
+
+    Args:
+        df: DataFrame exportado
+        chunk_rows: Linhas por bloco
+
+    Returns:
+        Iterador de bytes; o primeiro bloco traz o cabeçalho
+    """
+    if df.empty:
+        yield df.to_csv(index=False).encode('utf-8')
+        return
+
+    for i, chunk in enumerate(_row_chunks(df, chunk_rows)):
+        yield chunk.to_csv(index=False, header=(i == 0)).encode('utf-8')
+
+
+def iter_ndjson(df: pd.DataFrame, chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    Codifica um DataFrame em NDJSON (um objeto JSON por linha), um bloco por vez
+
+    Args:
+        df: DataFrame exportado
+        chunk_rows: Linhas por bloco
+
+    Returns:
+        Iterador de bytes
+    """
+    for chunk in _row_chunks(df, chunk_rows):
+        text = chunk.to_json(orient="records", lines=True, force_ascii=False, date_format="iso")
+        yield (text if text.endswith("\n") else text + "\n").encode('utf-8')
+
+
+def iter_json(df: pd.DataFrame, chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    Codifica um DataFrame como um array JSON de registros, sem indentação
+
+    Args:
+        df: DataFrame exportado
+        chunk_rows: Linhas por bloco
+
+    Returns:
+        Iterador de bytes que juntos formam um único array
+    """
+    yield b"["
+    for i, chunk in enumerate(_row_chunks(df, chunk_rows)):
+        # Cada bloco vira "[...]"; os colchetes são trocados pelos separadores
+        records = chunk.to_json(orient="records", force_ascii=False, date_format="iso")[1:-1]
+        yield ((b"," if i else b"") + records.encode('utf-8'))
+    yield b"]"
+
+
+class _ChunkSink:
+    """Destino de escrita que acumula bytes até serem recolhidos (usado pelo ParquetWriter)"""
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data: bytes) -> int:
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def iter_parquet(df: pd.DataFrame, chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    Codifica um DataFrame em Parquet, um grupo de linhas por bloco
+
+    Requer pyarrow.
+
+    Args:
+        df: DataFrame exportado
+        chunk_rows: Linhas por grupo de linhas
+
+    Returns:
+        Iterador de bytes; o rodapé do arquivo vem no último bloco
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Exportação em Parquet requer o pacote pyarrow") from e
+
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for chunk in _row_chunks(df, chunk_rows):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+_ENCODERS: Dict[str, Callable[[pd.DataFrame, int], Iterator[bytes]]] = {
+    "csv": iter_csv,
+    "ndjson": iter_ndjson,
+    "json": iter_json,
+    "parquet": iter_parquet
+}
+
+
+def iter_export(df: pd.DataFrame, format: str = "csv",
+                chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    Codifica um DataFrame no formato pedido, um bloco por vez
+
+    Args:
+        df: DataFrame exportado
+        format: "csv", "ndjson", "json" ou "parquet"
+        chunk_rows: Linhas por bloco
+
+    Returns:
+        Iterador de bytes
+    """
+    encoder = _ENCODERS.get(format.lower())
+    if encoder is None:
+        raise ValueError(f"Formato '{format}' não suportado")
+
+    return encoder(df, chunk_rows)
+
+
+def write_chunks(chunks: Iterable[bytes], fileobj: BinaryIO) -> int:
+    """
+    Escreve blocos codificados em um arquivo binário aberto
+
+    Args:
+        chunks: Blocos de bytes (ex.: iter_export)
+        fileobj: Destino com write() (arquivo, sys.stdout.buffer, BytesIO...)
+
+    Returns:
+        Número de bytes escritos
+    """
+    written = 0
+    for chunk in chunks:
+        fileobj.write(chunk)
+        written += len(chunk)
+    return written
+
+
+class ExportStream(io.RawIOBase):
+    """
+    Arquivo somente leitura sobre os blocos de uma exportação
+
+    Os blocos são codificados à medida que são lidos; serve onde se espera
+    um objeto de arquivo (ex.: st.download_button).
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        """
+        Inicializa o arquivo
+
+        Args:
+            chunks: Blocos de bytes (ex.: iter_export)
+        """
+        super().__init__()
+        self._chunks = iter(chunks)
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        while not self._pending:
+            try:
+                self._pending = next(self._chunks)
+            except StopIteration:
+                return 0
+
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+def export_filename(name: str, format: str) -> str:
+    """
+    Nome de arquivo com a extensão do formato
+
+    Args:
+        name: Nome base
+        format: Formato de exportação
+
+    Returns:
+        Nome do arquivo
+    """
+    extension, _ = EXPORT_FORMATS.get(format.lower(), (format.lower(), None))
+    return f"{name}.{extension}"
+
+
+def export_mime(format: str) -> Optional[str]:
+    """Tipo MIME de um formato de exportação"""
+    return EXPORT_FORMATS.get(format.lower(), (None, None))[1]
@@ -0,0 +1,127 @@
+"""
+Índices secundários (valor -> posições de linha) para consultas pontuais
+"""
+
+from typing import Any, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Colunas indexadas por dataset
+INDEXED_COLUMNS = {
+    "escolas": ['NO_MUNICIPIO', 'TP_DEPENDENCIA', 'TP_LOCALIZACAO', 'CO_ENTIDADE'],
+    "cursos_tecnicos": ['NO_MUNICIPIO', 'CO_ENTIDADE']
+}
+
+_EMPTY = np.array([], dtype=np.intp)
+
+
+class SecondaryIndex:
+    """Índice de uma coluna: cada valor aponta para as posições ordenadas das suas linhas"""
+
+    def __init__(self, series: pd.Series):
+        """
+        Constrói o índice em uma passada (factorize + ordenação estável)
+
+        Args:
+            series: Coluna indexada
+        """
+        codes, uniques = pd.factorize(series, sort=False)
+        order = np.argsort(codes, kind='stable')
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+
+        # Ausentes (código -1) ficam no início da ordenação e fora do índice
+        start = int((codes < 0).sum())
+        bounds = start + np.concatenate(([0], np.cumsum(counts)))
+        self._positions = {
+            value: order[bounds[i]:bounds[i + 1]]
+            for i, value in enumerate(uniques.tolist())
+        }
+
+    def lookup(self, value: Any) -> np.ndarray:
+        """
+        Obtém as posições das linhas iguais ao valor
+
+        Args:
+            value: Valor procurado
+
+        Returns:
+            Posições em ordem crescente
+        """
+        try:
+            return self._positions.get(value, _EMPTY)
+        except TypeError:
+            # Valores não hasheáveis nunca são iguais a um valor indexado
+            return _EMPTY
+
+    def lookup_many(self, values: Iterable[Any]) -> np.ndarray:
+        """
+        Obtém as posições das linhas cujo valor está na lista
+
+        Args:
+            values: Valores procurados
+
+        Returns:
+            Posições em ordem crescente
+        """
+        parts = [self.lookup(value) for value in dict.fromkeys(values)]
+        parts = [part for part in parts if len(part)]
+        if not parts:
+            return _EMPTY
+        if len(parts) == 1:
+            return parts[0]
+        return np.sort(np.concatenate(parts))
+
+
+class DatasetIndexes:
+    """Conjunto de índices secundários de um dataset"""
+
+    def __init__(self, df: pd.DataFrame, columns: List[str]):
+        """
+        Constrói os índices das colunas existentes no DataFrame
+
+        Args:
+            df: DataFrame indexado
+            columns: Colunas a indexar
+        """
+        self.indexes = {
+            column: SecondaryIndex(df[column]) for column in columns if column in df.columns
+        }
+
+    def resolve(self, predicates: List[Tuple[str, str, Any]]) -> Tuple[Optional[np.ndarray], List[Tuple[str, str, Any]]]:
+        """
+        Resolve predicados de igualdade e "in" por interseção de índices
+
+        Args:
+            predicates: Predicados (coluna, operador, valor)
+
+        Returns:
+            Tupla (posições candidatas ou None, predicados restantes)
+        """
+        positions = None
+        remaining = []
+
+        for predicate in predicates:
+            column, op, value = predicate
+            index = self.indexes.get(column)
+
+            if index is not None and op == "==" and not _is_missing(value):
+                matched = index.lookup(value)
+            elif (index is not None and op == "in" and isinstance(value, (list, tuple))
+                    and not any(_is_missing(v) for v in value)):
+                matched = index.lookup_many(value)
+            else:
+                remaining.append(predicate)
+                continue
+
+            positions = matched if positions is None else np.intersect1d(positions, matched, assume_unique=True)
+
+        return positions, remaining
+
+
+def _is_missing(value: Any) -> bool:
+    """Indica valor ausente (isin casa NaN, o índice não)"""
+    try:
+        return bool(pd.isna(value))
+    except (TypeError, ValueError):
+        return False
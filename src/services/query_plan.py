@@ -0,0 +1,285 @@
+"""
+Compilação de filtros e operações em planos de consulta
+"""
+
+import copy
+import operator
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Operadores de comparação suportados nos filtros
+OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+    "in": lambda series, value: series.isin(value)
+}
+
+# Fração estimada de linhas mantidas por operador (menor = mais seletivo)
+SELECTIVITY = {
+    "==": 0.05,
+    "in": 0.1,
+    ">": 0.5,
+    "<": 0.5,
+    ">=": 0.5,
+    "<=": 0.5,
+    "!=": 0.95
+}
+
+PLAN_CACHE_SIZE = 256
+
+_plans: "OrderedDict[Hashable, QueryPlan]" = OrderedDict()
+_plans_lock = threading.Lock()
+
+
+def _estimate_selectivity(predicate: Tuple[str, str, Any]) -> float:
+    """Estima a fração de linhas que um predicado mantém"""
+    _, op, value = predicate
+    if op == "in":
+        return min(1.0, SELECTIVITY["in"] * max(len(value), 1))
+    return SELECTIVITY.get(op, 1.0)
+
+
+class QueryPlan:
+    """Plano de consulta compilado: máscara única por estágio e projeção antecipada"""
+
+    def __init__(self, stages: List[Dict[str, Any]], ignore_missing: bool = False):
+        """
+        Inicializa o plano
+
+        Args:
+            stages: Estágios separados por agrupamentos; cada um com
+                predicados, ordenações e seleções em ordem e agrupamento final
+            ignore_missing: Ignora predicados sobre colunas inexistentes
+        """
+        self.stages = stages
+        self.ignore_missing = ignore_missing
+
+    def _filter_positions(self, df: pd.DataFrame,
+                          predicates: List[Tuple[str, str, Any]],
+                          positions: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """
+        Avalia os predicados, do mais ao menos seletivo, sobre as linhas restantes
+
+        Args:
+            df: DataFrame de entrada
+            predicates: Predicados (coluna, operador, valor) já ordenados
+            positions: Posições candidatas iniciais (None = todas as linhas)
+
+        Returns:
+            Posições das linhas mantidas ou None se não houver filtro
+        """
+        for column, op, value in predicates:
+            if column not in df.columns:
+                if self.ignore_missing:
+                    continue
+                raise KeyError(column)
+
+            series = df[column]
+            if positions is None:
+                mask = OPERATORS[op](series, value).to_numpy(dtype=bool)
+                positions = np.flatnonzero(mask)
+            else:
+                # Apenas as linhas que passaram nos predicados anteriores são avaliadas
+                mask = OPERATORS[op](series.iloc[positions], value).to_numpy(dtype=bool)
+                positions = positions[mask]
+
+            if len(positions) == 0:
+                break
+
+        return positions
+
+    def execute(self, df: pd.DataFrame, indexes: Optional[Any] = None) -> pd.DataFrame:
+        """
+        Executa o plano, materializando apenas o resultado de cada estágio
+
+        Args:
+            df: DataFrame de entrada
+            indexes: DatasetIndexes de df; igualdades e "in" do primeiro
+                estágio são resolvidos por interseção de índices
+
+        Returns:
+            Novo DataFrame com o resultado
+        """
+        result = df
+        for i, stage in enumerate(self.stages):
+            predicates = stage["predicates"]
+            positions = None
+            if i == 0 and indexes is not None:
+                positions, predicates = indexes.resolve(predicates)
+
+            stage_positions = self._filter_positions(result, predicates, positions)
+
+            columns = stage["columns"]
+            if columns is not None:
+                columns = [c for c in columns if c in result.columns or not self.ignore_missing]
+            projected = result if columns is None else result[columns]
+
+            if stage_positions is None:
+                output = projected.copy()
+            else:
+                output = projected.take(stage_positions)
+
+            # Ordenações e seleções na ordem em que foram pedidas
+            for step, arguments in stage["steps"]:
+                if step == "sort":
+                    sort_columns, ascending = arguments
+                    output = output.sort_values(sort_columns, ascending=ascending)
+                else:
+                    output = output[arguments]
+
+            if stage["groupby"] is not None:
+                group_columns, agg_functions = stage["groupby"]
+                output = output.groupby(group_columns, observed=True).agg(agg_functions).reset_index()
+
+            result = output
+
+        return result
+
+
+def _new_stage() -> Dict[str, Any]:
+    """Estágio vazio: predicados, passos (sort/select) em ordem e agrupamento"""
+    return {"predicates": [], "steps": [], "groupby": None}
+
+
+def _build_stages(operations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Agrupa operações em estágios e calcula a projeção de cada um"""
+    stages = []
+    stage = _new_stage()
+
+    for operation in operations:
+        op_type = operation.get("type")
+
+        if op_type == "filter":
+            op = operation.get("operator", "==")
+            if op in OPERATORS:
+                stage["predicates"].append((operation.get("column"), op, operation.get("value")))
+        elif op_type == "sort":
+            stage["steps"].append(("sort", (operation.get("columns", []), operation.get("ascending", True))))
+        elif op_type == "select":
+            stage["steps"].append(("select", operation.get("columns", [])))
+        elif op_type == "groupby":
+            stage["groupby"] = (operation.get("columns", []), operation.get("agg_functions", {}))
+            stages.append(stage)
+            stage = _new_stage()
+
+    if stage["predicates"] or stage["steps"] or not stages:
+        stages.append(stage)
+
+    for stage in stages:
+        # Predicados mais seletivos primeiro; ordenação estável preserva empates
+        stage["predicates"].sort(key=_estimate_selectivity)
+        stage["columns"] = _stage_columns(stage)
+
+    return stages
+
+
+def _as_list(columns: Any) -> List[Any]:
+    """Normaliza uma coluna ou lista de colunas em lista"""
+    return [columns] if isinstance(columns, str) else list(columns)
+
+
+def _stage_columns(stage: Dict[str, Any]) -> Optional[List[str]]:
+    """Colunas que precisam ser materializadas no estágio (None = todas)"""
+    # Até a primeira seleção, as ordenações podem usar qualquer coluna
+    needed = []
+    for step, arguments in stage["steps"]:
+        if step == "select":
+            return list(dict.fromkeys(needed + _as_list(arguments)))
+        needed += _as_list(arguments[0])
+
+    if stage["groupby"] is None or not isinstance(stage["groupby"][1], dict):
+        return None
+
+    group_columns, agg_functions = stage["groupby"]
+    return list(dict.fromkeys(_as_list(group_columns) + list(agg_functions.keys()) + needed))
+
+
+def _filters_to_operations(filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Converte o dicionário de filtros de get_filtered_data em operações"""
+    operations = []
+    for column, value in filters.items():
+        if isinstance(value, (list, tuple)):
+            operations.append({"type": "filter", "column": column, "operator": "in", "value": list(value)})
+        elif isinstance(value, dict):
+            if 'min' in value:
+                operations.append({"type": "filter", "column": column, "operator": ">=", "value": value['min']})
+            if 'max' in value:
+                operations.append({"type": "filter", "column": column, "operator": "<=", "value": value['max']})
+        else:
+            operations.append({"type": "filter", "column": column, "operator": "==", "value": value})
+    return operations
+
+
+def _plan_key(value: Any) -> Hashable:
+    """
+    Forma hasheável das operações para a chave do cache
+
+    Cada valor leva o seu tipo, para que listas, tuplas e escalares
+    equivalentes (1, 1.0, True) não compartilhem um plano.
+    """
+    if isinstance(value, dict):
+        return (dict, tuple(sorted((_plan_key(k), _plan_key(v)) for k, v in value.items())))
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(_plan_key(item) for item in value))
+    if isinstance(value, (np.ndarray, pd.Index, pd.Series)):
+        return (type(value), str(value.dtype), tuple(_plan_key(item) for item in value.tolist()))
+
+    hash(value)
+    return (type(value), value)
+
+
+def compile_operations(operations: List[Dict[str, Any]],
+                       ignore_missing: bool = False) -> QueryPlan:
+    """
+    Compila uma lista de operações (filter, sort, select, groupby) em um plano
+
+    Args:
+        operations: Operações no formato de create_derived_dataset
+        ignore_missing: Ignora predicados sobre colunas inexistentes
+
+    Returns:
+        QueryPlan (reutilizado do cache para operações equivalentes)
+    """
+    try:
+        key = (_plan_key(operations), ignore_missing)
+    except TypeError:
+        # Valores não hasheáveis não passam pelo cache
+        return QueryPlan(_build_stages(operations), ignore_missing=ignore_missing)
+
+    with _plans_lock:
+        if key in _plans:
+            _plans.move_to_end(key)
+            return _plans[key]
+
+    # Compila de uma cópia das operações (tuplas e tipos preservados): o plano
+    # guardado não muda se quem chamou alterar suas listas depois
+    plan = QueryPlan(_build_stages(copy.deepcopy(operations)), ignore_missing=ignore_missing)
+
+    with _plans_lock:
+        _plans[key] = plan
+        _plans.move_to_end(key)
+        while len(_plans) > PLAN_CACHE_SIZE:
+            _plans.popitem(last=False)
+
+    return plan
+
+
+def compile_filters(filters: Dict[str, Any]) -> QueryPlan:
+    """
+    Compila o dicionário de filtros de get_filtered_data em um plano
+
+    Args:
+        filters: Dicionário coluna -> valor, lista ou {'min', 'max'}
+
+    Returns:
+        QueryPlan que ignora colunas inexistentes
+    """
+    return compile_operations(_filters_to_operations(filters), ignore_missing=True)
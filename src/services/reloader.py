@@ -0,0 +1,96 @@
+"""
+Recarga em segundo plano quando os arquivos de origem mudam
+"""
+
+import threading
+from typing import Any, Callable, Iterable, Optional, Tuple
+
+from .dataset_registry import DatasetRegistry, compute_source_fingerprint
+
+# Intervalo padrão entre verificações das fontes (segundos)
+RELOAD_INTERVAL = 30.0
+
+# Preparador recebe a versão atual (impressão digital, datasets) e retorna (datasets, derivados)
+Preparer = Callable[[Tuple[Any, Any]], Tuple[Any, dict]]
+
+
+class SourceReloader:
+    """Verifica periodicamente a impressão digital das fontes e troca a versão do registro"""
+
+    def __init__(self, paths: Iterable[str], prepare: Preparer,
+                 registry: DatasetRegistry, interval: float = RELOAD_INTERVAL):
+        """
+        Inicializa o recarregador
+
+        Args:
+            paths: Arquivos de origem monitorados
+            prepare: Função que prepara a nova versão a partir da atual
+            registry: Registro onde a nova versão é publicada
+            interval: Intervalo entre verificações em segundos
+        """
+        self.paths = list(paths)
+        self.prepare = prepare
+        self.registry = registry
+        self.interval = interval
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._pending = None
+        self._failed = None
+
+    def is_running(self) -> bool:
+        """Indica se a thread de verificação está ativa"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Inicia a thread de verificação (idempotente)"""
+        if self.is_running():
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="source-reloader", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Interrompe a thread de verificação"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        """Laço da thread: verifica as fontes a cada intervalo"""
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def check(self) -> bool:
+        """
+        Verifica as fontes e recarrega se mudaram
+
+        A nova versão só é preparada quando a impressão digital se repete em
+        duas verificações seguidas (arquivo não está mais sendo gravado).
+        Enquanto isso, e durante a preparação, a versão atual continua servida.
+
+        Returns:
+            True se uma nova versão foi publicada
+        """
+        fingerprint = compute_source_fingerprint(self.paths)
+        current = self.registry.current()
+        if current is None or current[0] == fingerprint or fingerprint == self._failed:
+            self._pending = None
+            return False
+
+        if fingerprint != self._pending:
+            self._pending = fingerprint
+            return False
+
+        try:
+            data, derived = self.prepare(current)
+        except Exception as e:
+            # Mantém a versão atual; nova tentativa só quando as fontes mudarem de novo
+            print(f"Erro ao recarregar dados: {e}")
+            self._failed = fingerprint
+            return False
+
+        self.registry.publish(fingerprint, data, derived)
+        self._pending = None
+        return True
@@ -0,0 +1,181 @@
+"""
+Snapshots colunares binários dos datasets extraídos do INEP
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_META = 'meta.json'
+
+
+def snapshot_path_for(csv_path: str) -> str:
+    """
+    Obtém o diretório de snapshot correspondente a um CSV
+
+    Args:
+        csv_path: Caminho do CSV
+
+    Returns:
+        Caminho do diretório de snapshot
+    """
+    return os.path.splitext(csv_path)[0] + '.snapshot'
+
+
+def file_md5(path: str, block_size: int = 1 << 20) -> str:
+    """
+    Calcula o MD5 de um arquivo em blocos
+
+    Args:
+        path: Caminho do arquivo
+        block_size: Tamanho do bloco de leitura
+
+    Returns:
+        MD5 em hexadecimal maiúsculo (mesmo formato dos arquivos md5 do INEP)
+    """
+    digest = hashlib.md5()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest().upper()
+
+
+def _describe_source(source_path: str) -> Dict[str, Any]:
+    """Descreve o CSV de origem para verificação de validade do snapshot"""
+    stat = os.stat(source_path)
+    return {
+        "path": os.path.basename(source_path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "md5": file_md5(source_path)
+    }
+
+
+def _is_fresh(meta: Dict[str, Any], source_path: str) -> bool:
+    """Verifica se o snapshot corresponde ao CSV de origem atual"""
+    source = meta.get("source")
+    if source is None or not os.path.exists(source_path):
+        return True
+
+    stat = os.stat(source_path)
+    if stat.st_size != source["size"]:
+        return False
+    if stat.st_mtime_ns == source["mtime_ns"]:
+        return True
+
+    # mtime muda em checkouts/cópias; o conteúdo decide
+    return file_md5(source_path) == source["md5"]
+
+
+def write_snapshot(df: pd.DataFrame, snapshot_path: str,
+                   source_path: Optional[str] = None) -> str:
+    """
+    Grava um DataFrame como snapshot colunar (um .npy por coluna)
+
+    Colunas de texto são gravadas como códigos inteiros mais um dicionário
+    de categorias; colunas float sem ausentes e com valores inteiros são
+    gravadas como int64.
+
+    Args:
+        df: DataFrame a gravar
+        snapshot_path: Diretório de destino
+        source_path: CSV de origem (registrado para verificação de validade)
+
+    Returns:
+        Caminho do snapshot gravado
+    """
+    tmp_path = snapshot_path + '.tmp'
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    columns = []
+    for i, column in enumerate(df.columns):
+        series = df[column]
+        data_file = f'{i}.npy'
+
+        if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+            values = series.to_numpy()
+            if (pd.api.types.is_float_dtype(series) and not series.isna().any()
+                    and np.array_equal(values, np.floor(values))):
+                values = values.astype(np.int64)
+            np.save(os.path.join(tmp_path, data_file), values, allow_pickle=False)
+            columns.append({"name": column, "kind": "numeric", "file": data_file})
+        else:
+            categorical = pd.Categorical(series.astype('string'))
+            categories_file = f'{i}.categories.npy'
+            np.save(os.path.join(tmp_path, data_file),
+                    categorical.codes.astype(np.int32), allow_pickle=False)
+            np.save(os.path.join(tmp_path, categories_file),
+                    np.asarray(categorical.categories, dtype=str), allow_pickle=False)
+            columns.append({"name": column, "kind": "categorical",
+                            "file": data_file, "categories": categories_file})
+
+    meta = {
+        "version": SNAPSHOT_VERSION,
+        "rows": len(df),
+        "columns": columns,
+        "source": _describe_source(source_path) if source_path else None
+    }
+    with open(os.path.join(tmp_path, SNAPSHOT_META), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+    # Troca atômica do diretório para leitores concorrentes
+    shutil.rmtree(snapshot_path, ignore_errors=True)
+    os.replace(tmp_path, snapshot_path)
+
+    return snapshot_path
+
+
+def read_snapshot(snapshot_path: str,
+                  source_path: Optional[str] = None,
+                  categorical_columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+    """
+    Lê um snapshot colunar com memory-map
+
+    As colunas numéricas ficam no memory-map, sem cópia (alterações copiam
+    só as páginas tocadas e não vão para o arquivo); as de texto são
+    decodificadas para o dtype str, como no CSV.
+
+    Args:
+        snapshot_path: Diretório do snapshot
+        source_path: CSV de origem; snapshot desatualizado é ignorado
+        categorical_columns: Colunas de texto mantidas como categóricas
+            (sem decodificar os códigos)
+
+    Returns:
+        DataFrame ou None se o snapshot não existir ou estiver desatualizado
+    """
+    meta_path = os.path.join(snapshot_path, SNAPSHOT_META)
+    if not os.path.exists(meta_path):
+        return None
+
+    with open(meta_path, encoding='utf-8') as f:
+        meta = json.load(f)
+
+    if meta.get("version") != SNAPSHOT_VERSION:
+        return None
+    if source_path and not _is_fresh(meta, source_path):
+        return None
+
+    data = {}
+    for column in meta["columns"]:
+        values = np.load(os.path.join(snapshot_path, column["file"]), mmap_mode='c')
+        if column["kind"] == "categorical":
+            categories = np.load(os.path.join(snapshot_path, column["categories"]))
+            if categorical_columns and column["name"] in categorical_columns:
+                data[column["name"]] = pd.Categorical.from_codes(np.asarray(values), categories)
+                continue
+            # Código -1 representa valor ausente; o resultado tem o dtype str do read_csv
+            data[column["name"]] = pd.array(categories, dtype="str").take(values, allow_fill=True)
+        else:
+            # Visão ndarray do memory-map (a subclasse memmap não vai para o DataFrame)
+            data[column["name"]] = np.asarray(values)
+
+    # copy=False mantém um bloco por coluna: as numéricas continuam no memory-map
+    return pd.DataFrame(data, copy=False)
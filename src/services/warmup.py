@@ -0,0 +1,89 @@
+"""
+Aquecimento dos caches do processo antes do primeiro acesso
+"""
+
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+# Páginas pré-renderizadas por padrão (a página inicial do menu)
+WARMUP_PAGES = ("Dashboard",)
+
+_warmup_thread: Optional[threading.Thread] = None
+_warmup_lock = threading.Lock()
+_warmup_report: Dict[str, float] = {}
+
+
+def warm_caches(pages: Iterable[str] = WARMUP_PAGES) -> Dict[str, float]:
+    """
+    Carrega os datasets, constrói as estruturas derivadas e pré-renderiza páginas
+
+    Tudo vai para os caches compartilhados do processo (registro de datasets,
+    seções memorizadas e cache de figuras), de modo que a primeira sessão
+    encontra o trabalho pronto.
+
+    Args:
+        pages: Rótulos das páginas (ver components.page_registry) a pré-renderizar
+
+    Returns:
+        Dicionário etapa -> duração em milissegundos
+    """
+    from components.page_registry import warm_page
+    from .data_service import DataService
+    from .indexes import INDEXED_COLUMNS
+
+    report: Dict[str, float] = {}
+
+    def step(name: str, action) -> None:
+        start = time.perf_counter()
+        action()
+        report[name] = round((time.perf_counter() - start) * 1000, 1)
+
+    data_service = DataService()
+    step("datasets", data_service.preload_datasets)
+    step("cubo", data_service.get_cube)
+    step("indices", lambda: [data_service.get_indexes(name) for name in INDEXED_COLUMNS])
+
+    for label in pages:
+        step(f"pagina:{label}", lambda: warm_page(label, data_service))
+
+    report["total"] = round(sum(report.values()), 1)
+    return report
+
+
+def start_warmup(pages: Iterable[str] = WARMUP_PAGES) -> threading.Thread:
+    """
+    Inicia (uma vez por processo) o aquecimento dos caches em segundo plano
+
+    Args:
+        pages: Rótulos das páginas a pré-renderizar
+
+    Returns:
+        Thread do aquecimento
+    """
+    global _warmup_thread
+    pages = tuple(pages)
+
+    def run() -> None:
+        try:
+            _warmup_report.update(warm_caches(pages))
+            print(f"🔥 Caches aquecidos em {_warmup_report['total']:.0f} ms: {_warmup_report}")
+        except Exception as e:
+            print(f"Erro ao aquecer caches: {e}")
+
+    with _warmup_lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(target=run, name="cache-warmup", daemon=True)
+            _warmup_thread.start()
+
+    return _warmup_thread
+
+
+def get_warmup_report() -> Dict[str, float]:
+    """
+    Obtém as durações do aquecimento do processo
+
+    Returns:
+        Dicionário etapa -> duração em milissegundos (vazio se não terminou)
+    """
+    return dict(_warmup_report)
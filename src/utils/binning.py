@@ -0,0 +1,105 @@
+"""
+Agrupamento em faixas (histogramas) calculado no servidor
+"""
+
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Número padrão de faixas dos histogramas e de cada eixo dos mapas de densidade
+DISTRIBUTION_BINS = 40
+
+# Colunas de escolas com gráficos de distribuição
+DISTRIBUTION_COLUMNS = ['TOTAL_PROFESSORES', 'TOTAL_MATRICULAS', 'TOTAL_TURMAS']
+
+
+@lru_cache(maxsize=256)
+def _cached_edges(low: float, high: float, bins: int, integer: bool) -> np.ndarray:
+    """Limites das faixas para um intervalo; só depende do intervalo e do número de faixas"""
+    if integer:
+        # Faixas de largura inteira centradas nos valores, sem dividir contagens
+        low, high = np.floor(low), np.ceil(high)
+        width = max(1.0, np.ceil((high - low + 1) / bins))
+        count = int(np.ceil((high - low + 1) / width))
+        edges = low - 0.5 + width * np.arange(count + 1)
+    elif high > low:
+        edges = np.linspace(low, high, bins + 1)
+    else:
+        edges = np.array([low - 0.5, low + 0.5])
+
+    edges.setflags(write=False)
+    return edges
+
+
+def bin_edges(values, bins: int = DISTRIBUTION_BINS,
+              value_range: Optional[Tuple[float, float]] = None) -> np.ndarray:
+    """
+    Obtém os limites das faixas de uma variável
+
+    Os limites são memorizados por intervalo, de modo que filtros com os
+    mesmos extremos reaproveitam as faixas. Valores inteiros usam faixas de
+    largura inteira.
+
+    Args:
+        values: Valores numéricos
+        bins: Número máximo de faixas
+        value_range: Intervalo (mínimo, máximo); padrão é o dos próprios valores
+
+    Returns:
+        Array somente leitura com bins + 1 limites (ou menos, para inteiros)
+    """
+    values = np.asarray(values)
+    integer = np.issubdtype(values.dtype, np.integer)
+    if value_range is None:
+        finite = values[np.isfinite(values)] if not integer else values
+        value_range = (float(finite.min()), float(finite.max())) if len(finite) else (0.0, 0.0)
+
+    return _cached_edges(float(value_range[0]), float(value_range[1]), int(bins), bool(integer))
+
+
+def histogram_counts(values, bins: int = DISTRIBUTION_BINS,
+                     value_range: Optional[Tuple[float, float]] = None) -> pd.DataFrame:
+    """
+    Conta os valores de uma variável por faixa
+
+    Args:
+        values: Valores numéricos (ausentes são ignorados)
+        bins: Número máximo de faixas
+        value_range: Intervalo (mínimo, máximo) das faixas
+
+    Returns:
+        DataFrame com uma linha por faixa: inicio, fim, centro e contagem
+    """
+    values = pd.Series(values).dropna().to_numpy()
+    edges = bin_edges(values, bins, value_range)
+    counts, _ = np.histogram(values, bins=edges)
+
+    return pd.DataFrame({
+        'inicio': edges[:-1],
+        'fim': edges[1:],
+        'centro': (edges[:-1] + edges[1:]) / 2,
+        'contagem': counts
+    })
+
+
+def histogram_2d_counts(x, y, bins: int = DISTRIBUTION_BINS
+                        ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Conta os pares (x, y) em uma grade de faixas
+
+    Args:
+        x: Valores do eixo X
+        y: Valores do eixo Y
+        bins: Número máximo de faixas por eixo
+
+    Returns:
+        Tupla (contagens com uma linha por faixa de Y, limites de X, limites de Y)
+    """
+    frame = pd.DataFrame({'x': x, 'y': y}).dropna()
+    x_edges = bin_edges(frame['x'].to_numpy(), bins)
+    y_edges = bin_edges(frame['y'].to_numpy(), bins)
+    counts, _, _ = np.histogram2d(frame['x'], frame['y'], bins=[x_edges, y_edges])
+
+    return counts.T.astype(np.int64), x_edges, y_edges
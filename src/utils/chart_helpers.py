@@ -4,10 +4,15 @@ Utilitários para criação e personalização de gráficos
 
 import plotly.express as px
 import plotly.graph_objects as go
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional
+import numpy as np
 import pandas as pd
 
-def apply_default_theme(fig: Union[go.Figure, px.Figure]) -> Union[go.Figure, px.Figure]:
+from .figure_cache import cache_figure
+from .downsampling import LARGE_DATA_THRESHOLD, density_bin, downsample_line
+from .binning import DISTRIBUTION_BINS, histogram_2d_counts, histogram_counts
+
+def apply_default_theme(fig: go.Figure) -> go.Figure:
     """
     Aplica tema padrão aos gráficos
     
@@ -30,6 +35,37 @@ def apply_default_theme(fig: Union[go.Figure, px.Figure]) -> Union[go.Figure, px
     
     return fig
 
+def add_elided_points_note(fig: go.Figure, total: int, shown: int) -> go.Figure:
+    """
+    Informa no gráfico quantos pontos foram omitidos pela redução de dados
+    
+    A contagem também fica em fig.layout.meta (pontos_total, pontos_exibidos,
+    pontos_omitidos) para quem precisar exibi-la de outra forma.
+    
+    Args:
+        fig: Figura do Plotly
+        total: Número de pontos nos dados
+        shown: Número de pontos enviados ao navegador
+        
+    Returns:
+        Figura com a nota
+    """
+    elided = total - shown
+    fig.update_layout(meta=dict(
+        pontos_total=total,
+        pontos_exibidos=shown,
+        pontos_omitidos=elided
+    ))
+    fig.add_annotation(
+        text=f"Exibindo {shown:,} de {total:,} pontos ({elided:,} omitidos)".replace(',', '.'),
+        xref="paper", yref="paper", x=1, y=1.02,
+        xanchor="right", yanchor="bottom",
+        showarrow=False,
+        font=dict(size=10, color="#666666")
+    )
+    
+    return fig
+
 def create_metric_card(title: str, value: str, delta: str = "", 
                       delta_color: str = "normal") -> str:
     """
@@ -57,12 +93,17 @@ def create_metric_card(title: str, value: str, delta: str = "",
     </div>
     """
 
+@cache_figure
 def create_line_chart(data: pd.DataFrame, x_col: str, y_col: str, 
                      title: str = "", color_col: Optional[str] = None,
-                     markers: bool = True) -> go.Figure:
+                     markers: bool = True,
+                     max_points: Optional[int] = LARGE_DATA_THRESHOLD) -> go.Figure:
     """
     Cria gráfico de linha padronizado
     
+    Acima de max_points, cada série é reduzida com LTTB e desenhada em
+    WebGL (Scattergl), sem marcadores.
+    
     Args:
         data: DataFrame com os dados
         x_col: Coluna para eixo X
@@ -70,31 +111,33 @@ def create_line_chart(data: pd.DataFrame, x_col: str, y_col: str,
         title: Título do gráfico
         color_col: Coluna para colorir as linhas
         markers: Se deve mostrar marcadores
+        max_points: Limite de pontos do modo normal (None desativa a redução)
         
     Returns:
         Figura do Plotly
     """
-    if color_col:
-        fig = px.line(
-            data, 
-            x=x_col, 
-            y=y_col,
-            color=color_col,
-            title=title,
-            markers=markers
-        )
-    else:
-        fig = px.line(
-            data, 
-            x=x_col, 
-            y=y_col,
-            title=title,
-            markers=markers
-        )
+    total = len(data)
+    large = max_points is not None and total > max_points
+    if large:
+        data = downsample_line(data, x_col, y_col, color_col)
+        markers = False
+    
+    fig = px.line(
+        data, 
+        x=x_col, 
+        y=y_col,
+        color=color_col,
+        title=title,
+        markers=markers,
+        render_mode="webgl" if large else "auto"
+    )
     
     fig = apply_default_theme(fig)
+    if large and len(data) < total:
+        fig = add_elided_points_note(fig, total, len(data))
     return fig
 
+@cache_figure
 def create_bar_chart(data: pd.DataFrame, x_col: str, y_col: str,
                      title: str = "", color_col: Optional[str] = None,
                      orientation: str = "v") -> go.Figure:
@@ -133,6 +176,7 @@ def create_bar_chart(data: pd.DataFrame, x_col: str, y_col: str,
     fig = apply_default_theme(fig)
     return fig
 
+@cache_figure
 def create_pie_chart(data: pd.DataFrame, values_col: str, names_col: str,
                      title: str = "") -> go.Figure:
     """
@@ -158,12 +202,18 @@ def create_pie_chart(data: pd.DataFrame, values_col: str, names_col: str,
     fig = apply_default_theme(fig)
     return fig
 
+@cache_figure
 def create_scatter_plot(data: pd.DataFrame, x_col: str, y_col: str,
                         title: str = "", color_col: Optional[str] = None,
-                        size_col: Optional[str] = None) -> go.Figure:
+                        size_col: Optional[str] = None,
+                        max_points: Optional[int] = LARGE_DATA_THRESHOLD) -> go.Figure:
     """
     Cria gráfico de dispersão padronizado
     
+    Acima de max_points, os pontos são agrupados em uma grade de densidade
+    (um ponto por célula ocupada, com a contagem no hover) e desenhados em
+    WebGL (Scattergl).
+    
     Args:
         data: DataFrame com os dados
         x_col: Coluna para eixo X
@@ -171,10 +221,30 @@ def create_scatter_plot(data: pd.DataFrame, x_col: str, y_col: str,
         title: Título do gráfico
         color_col: Coluna para colorir os pontos
         size_col: Coluna para tamanho dos pontos
+        max_points: Limite de pontos do modo normal (None desativa a redução)
         
     Returns:
         Figura do Plotly
     """
+    total = len(data)
+    if max_points is not None and total > max_points:
+        binned = density_bin(data, x_col, y_col, color_col, size_col)
+        fig = px.scatter(
+            binned,
+            x=x_col,
+            y=y_col,
+            title=title,
+            color=color_col,
+            size=size_col,
+            hover_data=['Pontos'] if 'Pontos' in binned.columns else None,
+            render_mode="webgl"
+        )
+        
+        fig = apply_default_theme(fig)
+        if len(binned) < total:
+            fig = add_elided_points_note(fig, total, len(binned))
+        return fig
+    
     fig = px.scatter(
         data,
         x=x_col,
@@ -188,6 +258,7 @@ def create_scatter_plot(data: pd.DataFrame, x_col: str, y_col: str,
     fig = apply_default_theme(fig)
     return fig
 
+@cache_figure
 def create_heatmap(data: pd.DataFrame, x_col: str, y_col: str, values_col: str,
                    title: str = "") -> go.Figure:
     """
@@ -216,6 +287,91 @@ def create_heatmap(data: pd.DataFrame, x_col: str, y_col: str, values_col: str,
     fig = apply_default_theme(fig)
     return fig
 
+@cache_figure
+def create_histogram(data: pd.DataFrame, column: str, title: str = "",
+                     bins: int = DISTRIBUTION_BINS, label: Optional[str] = None,
+                     log_y: bool = False) -> go.Figure:
+    """
+    Cria histograma com as faixas contadas no servidor
+    
+    Apenas as contagens por faixa são enviadas ao navegador, de modo que o
+    tamanho da figura depende do número de faixas e não do número de linhas.
+    
+    Args:
+        data: DataFrame com os dados
+        column: Coluna numérica analisada
+        title: Título do gráfico
+        bins: Número máximo de faixas
+        label: Rótulo do eixo X (padrão: nome da coluna)
+        log_y: Usa escala logarítmica nas contagens
+        
+    Returns:
+        Figura do Plotly
+    """
+    counts = histogram_counts(data[column], bins)
+    
+    fig = go.Figure(go.Bar(
+        x=counts['centro'],
+        y=counts['contagem'],
+        width=counts['fim'] - counts['inicio'],
+        customdata=counts[['inicio', 'fim']],
+        hovertemplate="%{customdata[0]:.4~g} a %{customdata[1]:.4~g}: %{y}<extra></extra>",
+        marker_color='#1f77b4'
+    ))
+    
+    fig.update_layout(
+        title=title,
+        xaxis_title=label or column,
+        yaxis_title="Quantidade",
+        yaxis_type="log" if log_y else "linear",
+        bargap=0.05
+    )
+    
+    fig = apply_default_theme(fig)
+    return fig
+
+@cache_figure
+def create_density_heatmap(data: pd.DataFrame, x_col: str, y_col: str,
+                           title: str = "", bins: int = DISTRIBUTION_BINS,
+                           labels: Optional[Dict[str, str]] = None) -> go.Figure:
+    """
+    Cria mapa de densidade de duas variáveis com a grade contada no servidor
+    
+    Args:
+        data: DataFrame com os dados
+        x_col: Coluna para eixo X
+        y_col: Coluna para eixo Y
+        title: Título do gráfico
+        bins: Número máximo de faixas por eixo
+        labels: Rótulos dos eixos por coluna
+        
+    Returns:
+        Figura do Plotly
+    """
+    labels = labels or {}
+    counts, x_edges, y_edges = histogram_2d_counts(data[x_col], data[y_col], bins)
+    
+    # Células vazias ficam transparentes
+    z = np.where(counts > 0, counts, np.nan)
+    
+    fig = go.Figure(go.Heatmap(
+        x=(x_edges[:-1] + x_edges[1:]) / 2,
+        y=(y_edges[:-1] + y_edges[1:]) / 2,
+        z=z,
+        colorscale="Blues",
+        colorbar=dict(title="Quantidade"),
+        hovertemplate="x: %{x:.4~g}<br>y: %{y:.4~g}<br>Quantidade: %{z}<extra></extra>"
+    ))
+    
+    fig.update_layout(
+        title=title,
+        xaxis_title=labels.get(x_col, x_col),
+        yaxis_title=labels.get(y_col, y_col)
+    )
+    
+    fig = apply_default_theme(fig)
+    return fig
+
 def create_radar_chart(categories: List[str], values: List[float],
                        title: str = "", name: str = "Dados") -> go.Figure:
     """
@@ -6,6 +6,8 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Any, Optional
 
+from .summary_stats import summary_statistics
+
 def create_sample_data() -> Dict[str, pd.DataFrame]:
     """
     Cria dados de exemplo para demonstração do aplicativo
@@ -203,12 +205,5 @@ def generate_summary_statistics(data: pd.DataFrame,
     Returns:
         DataFrame com estatísticas resumidas
     """
-    if group_by:
-        summary = data.groupby(group_by).agg({
-            col: ['count', 'mean', 'std', 'min', 'max'] 
-            for col in data.select_dtypes(include=[np.number]).columns
-        }).round(2)
-    else:
-        summary = data.describe().round(2)
-    
-    return summary
+    # Acumuladores calculados uma vez por conteúdo dos dados (ver summary_stats.py)
+    return summary_statistics(data, group_by).round(2)
@@ -0,0 +1,155 @@
+"""
+Redução de pontos para gráficos de linha e dispersão com muitos dados
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# Acima deste número de pontos os gráficos entram no modo de grandes volumes
+LARGE_DATA_THRESHOLD = 20000
+
+# Pontos mantidos por série de linha (LTTB)
+LTTB_POINTS = 4000
+
+# Células por eixo na grade de densidade dos gráficos de dispersão
+DENSITY_BINS = 300
+
+
+def _numeric_axis(values: pd.Series) -> Optional[np.ndarray]:
+    """Converte um eixo em float64 (datas viram nanossegundos); None se categórico"""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.to_numpy(dtype='datetime64[ns]').astype(np.int64).astype(np.float64)
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        return values.to_numpy(dtype=np.float64, na_value=np.nan)
+
+    return None
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Seleciona pontos de uma série pelo Largest-Triangle-Three-Buckets
+
+    O primeiro e o último ponto são mantidos; em cada balde intermediário
+    fica o ponto que forma o maior triângulo com o ponto escolhido no balde
+    anterior e a média do balde seguinte, preservando picos e vales.
+
+    Args:
+        x: Eixo X em ordem crescente
+        y: Eixo Y
+        n_out: Número de pontos desejado
+
+    Returns:
+        Índices dos pontos mantidos, em ordem crescente
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Limites dos n_out - 2 baldes entre o primeiro e o último ponto
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    edges[-1] = n - 1
+
+    # Média de cada balde (e do último ponto, que fecha a série)
+    sums_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    sizes = np.diff(edges)
+    mean_x = np.append(sums_x / sizes, x[-1])
+    mean_y = np.append(sums_y / sizes, y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    previous = 0
+
+    for bucket in range(n_out - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        ax, ay = x[previous], y[previous]
+        cx, cy = mean_x[bucket + 1], mean_y[bucket + 1]
+        areas = np.abs((ax - cx) * (y[start:stop] - ay) - (ax - x[start:stop]) * (cy - ay))
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+
+    return selected
+
+
+def downsample_line(data: pd.DataFrame, x_col: str, y_col: str,
+                    color_col: Optional[str] = None,
+                    n_out: int = LTTB_POINTS) -> pd.DataFrame:
+    """
+    Reduz as séries de um gráfico de linha com LTTB (uma série por cor)
+
+    Args:
+        data: DataFrame com os dados
+        x_col: Coluna do eixo X
+        y_col: Coluna do eixo Y
+        color_col: Coluna que separa as séries
+        n_out: Pontos mantidos por série
+
+    Returns:
+        DataFrame com as linhas mantidas (o original se o eixo X não for numérico)
+    """
+    if _numeric_axis(data[x_col]) is None or _numeric_axis(data[y_col]) is None:
+        return data
+
+    groups = data.groupby(color_col, sort=False, observed=True) if color_col else [(None, data)]
+    parts = []
+
+    for _, group in groups:
+        group = group.dropna(subset=[x_col, y_col]).sort_values(x_col, kind='stable')
+        keep = lttb_indices(_numeric_axis(group[x_col]), _numeric_axis(group[y_col]), n_out)
+        parts.append(group.iloc[keep])
+
+    if not parts:
+        return data
+
+    return pd.concat(parts)
+
+
+def density_bin(data: pd.DataFrame, x_col: str, y_col: str,
+                color_col: Optional[str] = None, size_col: Optional[str] = None,
+                bins: int = DENSITY_BINS) -> pd.DataFrame:
+    """
+    Reduz um gráfico de dispersão a um ponto por célula ocupada de uma grade
+
+    Cada célula (por cor) vira o centróide dos seus pontos, com a média do
+    tamanho e o número de pontos representados na coluna "Pontos".
+
+    Args:
+        data: DataFrame com os dados
+        x_col: Coluna do eixo X
+        y_col: Coluna do eixo Y
+        color_col: Coluna de cor (células separadas por cor)
+        size_col: Coluna de tamanho (média por célula)
+        bins: Células por eixo
+
+    Returns:
+        DataFrame reduzido (o original se algum eixo não for numérico)
+    """
+    x = _numeric_axis(data[x_col])
+    y = _numeric_axis(data[y_col])
+    if x is None or y is None:
+        return data
+
+    valid = ~(np.isnan(x) | np.isnan(y))
+    frame = data.loc[valid, [col for col in (x_col, y_col, color_col, size_col) if col]]
+    x, y = x[valid], y[valid]
+
+    def cell(values: np.ndarray) -> np.ndarray:
+        span = values.max() - values.min() if len(values) else 0
+        if span == 0:
+            return np.zeros(len(values), dtype=np.int64)
+        return np.minimum(((values - values.min()) / span * bins).astype(np.int64), bins - 1)
+
+    frame = frame.assign(_celula=cell(x) * bins + cell(y))
+    by = [color_col, '_celula'] if color_col else ['_celula']
+
+    aggregations = {x_col: (x_col, 'mean'), y_col: (y_col, 'mean')}
+    if size_col:
+        aggregations[size_col] = (size_col, 'mean')
+    aggregations['Pontos'] = (x_col, 'size')
+
+    binned = frame.groupby(by, sort=False, observed=True).agg(**aggregations)
+
+    return binned.reset_index().drop(columns='_celula')
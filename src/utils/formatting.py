@@ -0,0 +1,204 @@
+"""
+Formatação de colunas inteiras para exibição em tabelas
+"""
+
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+# Separadores (milhar, decimal) por localidade
+LOCALES = {
+    "en": (",", "."),
+    "pt_BR": (".", ",")
+}
+
+# Rótulos em português das linhas de describe()
+DESCRIBE_LABELS = [
+    'Contagem',
+    'Média',
+    'Desvio Padrão',
+    'Valor Mínimo',
+    'Primeiro Quartil (25%)',
+    'Mediana (50%)',
+    'Terceiro Quartil (75%)',
+    'Valor Máximo'
+]
+
+
+# format() aplicado elemento a elemento como ufunc do NumPy
+_format = np.frompyfunc(format, 2, 1)
+
+
+def _format_array(values: np.ndarray, spec: str, locale: str, suffix: str = '') -> np.ndarray:
+    """
+    Formata todos os valores com a mesma especificação de format()
+
+    Ausentes e infinitos seguem o Python ("nan", "inf"), e inteiros grandes
+    não estouram por serem formatados como float.
+
+    Args:
+        values: Valores float64
+        spec: Especificação de format() com separadores do Python ("," e ".")
+        locale: Localidade dos separadores (chave de LOCALES)
+        suffix: Texto acrescentado ao final
+
+    Returns:
+        Array de textos
+    """
+    text = _format(values, spec).astype(str)
+    if len(text) == 0:
+        return text
+
+    thousands, decimal = LOCALES[locale]
+    if (thousands, decimal) != (",", "."):
+        text = np.char.translate(text, str.maketrans(",.", thousands + decimal))
+    if suffix:
+        text = np.char.add(text, suffix)
+
+    return text
+
+
+def format_integer(values, locale: str = "en") -> np.ndarray:
+    """
+    Formata valores como inteiros (parte inteira, como int()) com separador de milhar
+
+    Ausentes e infinitos viram "nan", "inf" e "-inf", como em format_decimal.
+
+    Args:
+        values: Valores numéricos
+        locale: Localidade dos separadores (chave de LOCALES)
+
+    Returns:
+        Array de textos
+    """
+    # Soma 0.0 para que -0.5 vire "0" e não "-0", como em int()
+    values = np.trunc(np.asarray(values, dtype=np.float64)) + 0.0
+
+    return _format_array(values, ",.0f", locale)
+
+
+def format_decimal(values, decimals: int = 2, locale: str = "en",
+                   thousands: bool = False, plus_sign: bool = False,
+                   suffix: str = '') -> np.ndarray:
+    """
+    Formata valores com número fixo de casas decimais
+
+    Ausentes viram "nan", como na formatação do Python.
+
+    Args:
+        values: Valores numéricos
+        decimals: Casas decimais
+        locale: Localidade dos separadores (chave de LOCALES)
+        thousands: Usa separador de milhar na parte inteira
+        plus_sign: Prefixa "+" em valores positivos (e zero)
+        suffix: Texto acrescentado ao final (ex.: "%")
+
+    Returns:
+        Array de textos
+    """
+    spec = f"{'+' if plus_sign else ''}{',' if thousands else ''}.{decimals}f"
+
+    return _format_array(np.asarray(values, dtype=np.float64), spec, locale, suffix)
+
+
+def format_percent(values, decimals: int = 1, locale: str = "en",
+                   plus_sign: bool = False) -> np.ndarray:
+    """
+    Formata valores já em pontos percentuais com o sufixo "%"
+
+    Args:
+        values: Valores numéricos (ex.: 12.5 para 12,5%)
+        decimals: Casas decimais
+        locale: Localidade dos separadores (chave de LOCALES)
+        plus_sign: Prefixa "+" em valores positivos (e zero)
+
+    Returns:
+        Array de textos
+    """
+    return format_decimal(values, decimals, locale, plus_sign=plus_sign, suffix='%')
+
+
+def format_statistic(values, decimals: int = 2, locale: str = "en") -> np.ndarray:
+    """
+    Formata estatísticas descritivas: inteiro com milhar, zero e ausentes com casas decimais
+
+    Args:
+        values: Valores numéricos
+        decimals: Casas decimais usadas para zero e ausentes
+        locale: Localidade dos separadores (chave de LOCALES)
+
+    Returns:
+        Array de textos
+    """
+    values = np.asarray(values, dtype=np.float64)
+    as_integer = ~np.isnan(values) & (values != 0)
+    integers = format_integer(np.where(as_integer, values, 0), locale)
+
+    return np.where(as_integer, integers, format_decimal(values, decimals, locale))
+
+
+# Formatos por nome; parâmetros após ":" (ex.: "decimal:1", "percent:+1")
+FORMATTERS = {
+    "integer": format_integer,
+    "decimal": format_decimal,
+    "percent": format_percent,
+    "statistic": format_statistic
+}
+
+
+def _parse_format(spec: str):
+    """Converte "nome[:[+]casas]" em (função, argumentos)"""
+    name, _, option = spec.partition(':')
+    kwargs = {}
+    if option.startswith('+'):
+        kwargs["plus_sign"] = True
+        option = option[1:]
+    if option:
+        kwargs["decimals"] = int(option)
+
+    return FORMATTERS[name], kwargs
+
+
+def format_columns(df: pd.DataFrame, formats: Dict[str, str],
+                   locale: str = "en") -> pd.DataFrame:
+    """
+    Formata colunas inteiras de um DataFrame para exibição
+
+    Args:
+        df: DataFrame com valores numéricos
+        formats: Dicionário coluna -> formato ("integer", "decimal:2",
+            "percent:1", "percent:+1", "statistic"...)
+        locale: Localidade dos separadores (chave de LOCALES)
+
+    Returns:
+        Novo DataFrame com as colunas formatadas como texto
+    """
+    formatted = df.copy()
+    for column, spec in formats.items():
+        if column not in formatted.columns:
+            continue
+        formatter, kwargs = _parse_format(spec)
+        formatted[column] = formatter(formatted[column].to_numpy(), locale=locale, **kwargs)
+
+    return formatted
+
+
+def describe_table(df: pd.DataFrame, labels: List[str],
+                   locale: str = "en") -> pd.DataFrame:
+    """
+    Monta a tabela descritiva (describe) com rótulos em português e valores formatados
+
+    Args:
+        df: DataFrame com as colunas numéricas analisadas
+        labels: Rótulos de exibição das colunas, na mesma ordem
+        locale: Localidade dos separadores (chave de LOCALES)
+
+    Returns:
+        DataFrame de textos indexado pelas estatísticas
+    """
+    stats = df.describe().round(2)
+    stats.columns = labels
+    stats.index = DESCRIBE_LABELS
+
+    return format_columns(stats, {label: "statistic" for label in labels}, locale)
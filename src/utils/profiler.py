@@ -0,0 +1,182 @@
+"""
+Perfil de qualidade de dados calculado em uma única passagem pelas colunas
+"""
+
+import warnings
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .row_hash import DUPLICATE_SAMPLE_SIZE, combine_hashes, first_occurrences, hash_numeric, sample_duplicates
+from .sketches import HyperLogLog
+
+# Acima deste número de linhas os valores distintos são estimados com HyperLogLog
+PROFILE_EXACT_DISTINCT_ROWS = 200000
+
+
+class DataProfile:
+    """
+    Perfil de um DataFrame: ausentes, distintos, duplicatas e estatísticas numéricas
+
+    Cada coluna é lida uma vez: da mesma passagem saem a máscara de
+    ausentes, os distintos e a identidade dos valores, combinada no hash
+    das linhas usado para as duplicatas. As estatísticas numéricas saem de
+    uma única matriz com todas as colunas numéricas.
+    """
+
+    def __init__(self, df: pd.DataFrame, exact_distinct_rows: int = PROFILE_EXACT_DISTINCT_ROWS):
+        """
+        Calcula o perfil
+
+        Args:
+            df: DataFrame analisado
+            exact_distinct_rows: Limite de linhas para contar distintos exatamente
+        """
+        rows = len(df)
+        self.total_rows = rows
+        self.total_columns = len(df.columns)
+        self.data_types = df.dtypes.to_dict()
+        self.distinct_is_estimate = rows > exact_distinct_rows
+
+        self.missing_values: Dict[str, int] = {}
+        self.unique_values: Dict[str, int] = {}
+        row_hash = np.zeros(rows, dtype=np.uint64)
+
+        for column in df.columns:
+            missing, identity, distinct = _column_pass(df[column], self.distinct_is_estimate)
+            self.missing_values[column] = int(missing.sum())
+            self.unique_values[column] = distinct
+            row_hash = combine_hashes(row_hash, identity)
+
+        # Duplicatas como em df.duplicated(keep='first'), conferidas pelos valores
+        self.first_occurrence = first_occurrences(df, row_hash)
+        self.duplicate_mask = self.first_occurrence != np.arange(rows)
+
+        self.numeric_stats = _numeric_stats(df)
+        self._df = df
+
+    @property
+    def duplicate_rows(self) -> int:
+        """Número de linhas repetidas (a primeira ocorrência não conta)"""
+        return int(self.duplicate_mask.sum())
+
+    def missing_percentage(self) -> Dict[str, float]:
+        """
+        Percentual de ausentes por coluna
+
+        Returns:
+            Dicionário coluna -> percentual (0 a 100)
+        """
+        rows = self.total_rows
+        return {
+            column: (count / rows * 100) if rows else np.nan
+            for column, count in self.missing_values.items()
+        }
+
+    def quality_report(self) -> Dict[str, Any]:
+        """
+        Monta o relatório no formato de DataService.get_data_quality_report
+
+        Returns:
+            Dicionário com contagens, tipos, distintos, memória e estatísticas
+        """
+        report = {
+            "total_rows": self.total_rows,
+            "total_columns": self.total_columns,
+            "missing_values": dict(self.missing_values),
+            "missing_percentage": self.missing_percentage(),
+            "duplicate_rows": self.duplicate_rows,
+            "duplicate_samples": sample_duplicates(self._df, self.first_occurrence, DUPLICATE_SAMPLE_SIZE),
+            "data_types": dict(self.data_types),
+            "unique_values": dict(self.unique_values),
+            "unique_values_estimated": self.distinct_is_estimate,
+            "memory_usage": int(self._df.memory_usage(deep=True).sum())
+        }
+
+        if self.numeric_stats:
+            report["numeric_stats"] = self.numeric_stats
+
+        return report
+
+
+def _column_pass(series: pd.Series, estimate: bool) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Lê uma coluna uma vez: máscara de ausentes, identidade dos valores e distintos
+
+    A identidade (uint64) é igual para valores iguais da coluna e entra no
+    hash das linhas. Colunas numéricas usam o hash dos valores (hash_numeric),
+    com distintos estimados por HyperLogLog em entradas grandes; as demais
+    são fatoradas (códigos como identidade), o que já dá os distintos exatos.
+
+    Args:
+        series: Coluna do DataFrame
+        estimate: Estima os distintos das colunas numéricas
+
+    Returns:
+        Tupla (ausentes, identidade, número de distintos)
+    """
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        missing = series.isna().to_numpy()
+        identity = hash_numeric(series)
+        present = identity[~missing] if missing.any() else identity
+        if estimate:
+            distinct = HyperLogLog().add_hashes(present).estimate()
+        else:
+            distinct = len(np.unique(present))
+        return missing, identity, distinct
+
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        missing = codes < 0
+        distinct = int(np.count_nonzero(np.bincount(codes[~missing], minlength=1)))
+    else:
+        codes, uniques = pd.factorize(series)
+        missing = codes < 0
+        distinct = len(uniques)
+
+    # Hash dos códigos espalha os bits antes da combinação no hash da linha
+    return missing, pd.util.hash_array(codes.astype(np.int64)), distinct
+
+
+def _numeric_stats(df: pd.DataFrame) -> Dict[str, Dict[str, float]]:
+    """Média, desvio padrão, mínimo, máximo e mediana de todas as colunas numéricas de uma vez"""
+    numeric_columns = df.select_dtypes(include=[np.number]).columns
+    if len(numeric_columns) == 0:
+        return {}
+
+    matrix = df[numeric_columns].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    # Colunas só com ausentes resultam em NaN, como no pandas
+    with warnings.catch_warnings(), np.errstate(invalid='ignore', divide='ignore'):
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        stats = {
+            "mean": np.nanmean(matrix, axis=0),
+            "std": np.nanstd(matrix, axis=0, ddof=1),
+            "min": np.nanmin(matrix, axis=0),
+            "max": np.nanmax(matrix, axis=0),
+            "median": np.nanmedian(matrix, axis=0)
+        }
+
+    return {
+        column: {name: float(values[i]) for name, values in stats.items()}
+        for i, column in enumerate(numeric_columns)
+    }
+
+
+def profile_frame(df: pd.DataFrame, exact_distinct_rows: Optional[int] = None) -> DataProfile:
+    """
+    Calcula o perfil de qualidade de um DataFrame
+
+    Args:
+        df: DataFrame analisado
+        exact_distinct_rows: Limite de linhas para contar distintos exatamente
+            (padrão PROFILE_EXACT_DISTINCT_ROWS)
+
+    Returns:
+        DataProfile
+    """
+    if exact_distinct_rows is None:
+        exact_distinct_rows = PROFILE_EXACT_DISTINCT_ROWS
+
+    return DataProfile(df, exact_distinct_rows)
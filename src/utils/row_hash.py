@@ -0,0 +1,416 @@
+"""
+Detecção de linhas duplicadas por hash de linha com verificação de colisões
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Número de pares (linha repetida, primeira ocorrência) guardados como amostra
+DUPLICATE_SAMPLE_SIZE = 10
+
+# Multiplicadores das duas combinações independentes dos hashes das colunas
+_MULTIPLIER = np.uint64(0x100000001B3)
+_CHECK_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+def hash_numeric(series: pd.Series) -> np.ndarray:
+    """
+    Hash uint64 dos valores de uma coluna numérica
+
+    -0.0 e 0.0 são iguais mas têm bits diferentes; somar 0.0 leva -0.0 a
+    0.0 antes do hash, como em nunique() e na comparação das linhas.
+
+    Args:
+        series: Coluna numérica
+
+    Returns:
+        Array de hashes, um por linha
+    """
+    if series.dtype.kind == 'f':
+        series = series + 0.0
+    return pd.util.hash_pandas_object(series, index=False).to_numpy()
+
+
+def _frame_identity(series: pd.Series) -> np.ndarray:
+    """Identidade uint64 dos valores de uma coluna, válida dentro do mesmo DataFrame"""
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return hash_numeric(series)
+
+    # Códigos da fatoração são mais baratos que o hash dos textos
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+    else:
+        codes, _ = pd.factorize(series)
+    return pd.util.hash_array(codes.astype(np.int64))
+
+
+def _stable_values(series: pd.Series) -> pd.Series:
+    """
+    Normaliza o tipo de uma coluna para que o hash não dependa do bloco
+
+    A leitura em blocos infere o tipo de cada bloco: uma coluna inteira vira
+    float64 no bloco que tem ausentes, uma categórica traz só as categorias
+    vistas e uma coluna toda ausente vira float64. Números (e booleanos)
+    passam a float64 (com -0.0 como 0.0), categóricas aos seus valores e
+    colunas só com ausentes a NaN.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype(object)
+    if series.dtype == object:
+        series = series.infer_objects()
+
+    if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+        return pd.Series(series.to_numpy(dtype=np.float64, na_value=np.nan) + 0.0, copy=False)
+    if series.isna().all():
+        return pd.Series(np.full(len(series), np.nan), copy=False)
+    return series
+
+
+def combine_hashes(row_hash: np.ndarray, column_hash: np.ndarray) -> np.ndarray:
+    """
+    Acrescenta o hash de uma coluna ao hash das linhas
+
+    Args:
+        row_hash: Hash acumulado das linhas (uint64)
+        column_hash: Hash dos valores da coluna (uint64)
+
+    Returns:
+        Novo hash das linhas
+    """
+    return row_hash * _MULTIPLIER ^ column_hash
+
+
+def frame_row_hash(df: pd.DataFrame, columns: Optional[List[str]] = None) -> np.ndarray:
+    """
+    Hash de 64 bits das linhas de um DataFrame (comparável só dentro dele)
+
+    Args:
+        df: DataFrame
+        columns: Colunas consideradas (None usa todas)
+
+    Returns:
+        Array uint64 com um hash por linha
+    """
+    row_hash = np.zeros(len(df), dtype=np.uint64)
+    for column in (columns if columns is not None else df.columns):
+        row_hash = combine_hashes(row_hash, _frame_identity(df[column]))
+    return row_hash
+
+
+def hash_rows(df: pd.DataFrame, columns: Optional[List[str]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hashes das linhas pelos valores, comparáveis entre blocos de um arquivo
+
+    Retorna dois hashes de 64 bits combinados de formas independentes: o
+    principal agrupa as linhas e o de verificação confirma as repetições
+    entre blocos, cujos valores já não estão em memória. Os tipos das
+    colunas são normalizados antes (_stable_values), já que o mesmo valor
+    pode chegar como int64 em um bloco e float64 em outro.
+
+    Args:
+        df: DataFrame ou bloco
+        columns: Colunas consideradas (None usa todas)
+
+    Returns:
+        Tupla (hash principal, hash de verificação), arrays uint64
+    """
+    row_hash = np.zeros(len(df), dtype=np.uint64)
+    check_hash = np.zeros(len(df), dtype=np.uint64)
+    for column in (columns if columns is not None else df.columns):
+        column_hash = pd.util.hash_pandas_object(_stable_values(df[column]), index=False).to_numpy()
+        row_hash = combine_hashes(row_hash, column_hash)
+        check_hash = ((check_hash << np.uint64(17)) | (check_hash >> np.uint64(47))) ^ column_hash
+        check_hash *= _CHECK_MULTIPLIER
+    return row_hash, check_hash
+
+
+def _rows_equal(df: pd.DataFrame, columns: List[str], left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Compara os valores das linhas left[i] e right[i] (ausentes são iguais entre si)"""
+    equal = np.ones(len(left), dtype=bool)
+    for column in columns:
+        series = df[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            values = series.cat.codes.to_numpy()
+        else:
+            values = series.to_numpy()
+        a, b = values[left], values[right]
+        same = np.asarray(a == b, dtype=bool)
+        if not same.all():
+            same |= pd.isna(a) & pd.isna(b)
+        equal &= same
+    return equal
+
+
+def first_occurrences(df: pd.DataFrame, row_hash: np.ndarray,
+                      columns: Optional[List[str]] = None) -> np.ndarray:
+    """
+    Posição da primeira linha com os mesmos valores de cada linha
+
+    As linhas são agrupadas pelo hash e cada repetição é conferida contra a
+    primeira do grupo pelos valores; grupos com colisão de hash são
+    separados comparando as linhas uma a uma.
+
+    Args:
+        df: DataFrame
+        row_hash: Hash das linhas (frame_row_hash ou hash_rows)
+        columns: Colunas consideradas (None usa todas)
+
+    Returns:
+        Array int64: a própria posição para primeiras ocorrências
+    """
+    columns = list(columns if columns is not None else df.columns)
+    rows = len(row_hash)
+    if not rows:
+        return np.zeros(0, dtype=np.int64)
+
+    order = np.argsort(row_hash, kind='stable')
+    sorted_hash = row_hash[order]
+    starts = np.r_[True, sorted_hash[1:] != sorted_hash[:-1]]
+    group_first = order[np.flatnonzero(starts)][np.cumsum(starts) - 1]
+
+    first = np.empty(rows, dtype=np.int64)
+    first[order] = group_first
+
+    candidates = np.flatnonzero(first != np.arange(rows))
+    if not len(candidates):
+        return first
+
+    # Verificação: só as repetições apontadas pelo hash são comparadas
+    equal = _rows_equal(df, columns, candidates, first[candidates])
+    if equal.all():
+        return first
+
+    # Colisão: os grupos afetados são reagrupados pelos próprios valores
+    members = np.flatnonzero(np.isin(first, first[candidates[~equal]]))
+    groups = df.iloc[members][columns].groupby(columns, dropna=False, sort=False, observed=True).ngroup()
+    group_codes = groups.to_numpy()
+    _, group_first = np.unique(group_codes, return_index=True)
+    first[members] = members[group_first[group_codes]]
+
+    return first
+
+
+def duplicate_mask(df: pd.DataFrame, columns: Optional[List[str]] = None,
+                   keep: Any = 'first', row_hash: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Máscara de linhas duplicadas, como df.duplicated(subset=columns, keep=keep)
+
+    Args:
+        df: DataFrame
+        columns: Colunas consideradas (None usa todas)
+        keep: 'first', 'last' ou False (todas as linhas repetidas)
+        row_hash: Hash das linhas já calculado (ex.: pelo perfil)
+
+    Returns:
+        Array booleano com uma posição por linha
+    """
+    if row_hash is None:
+        row_hash = frame_row_hash(df, columns)
+
+    return duplicates_from_first(first_occurrences(df, row_hash, columns), keep)
+
+
+def duplicates_from_first(first: np.ndarray, keep: Any = 'first') -> np.ndarray:
+    """
+    Máscara de duplicadas a partir das primeiras ocorrências
+
+    Args:
+        first: Resultado de first_occurrences
+        keep: 'first', 'last' ou False (todas as linhas repetidas)
+
+    Returns:
+        Array booleano com uma posição por linha
+    """
+    positions = np.arange(len(first))
+    repeated = first != positions
+    if keep == 'first':
+        return repeated
+
+    # Grupos com repetição: todos os membros, ou todos menos o último
+    in_group = np.zeros(len(first), dtype=bool)
+    in_group[first[repeated]] = True
+    in_group |= repeated
+    if keep is False:
+        return in_group
+
+    last = np.zeros(len(first), dtype=np.int64)
+    np.maximum.at(last, first, positions)
+    return in_group & (last[first] != positions)
+
+
+def sample_duplicates(df: pd.DataFrame, first: np.ndarray,
+                      sample_size: int = DUPLICATE_SAMPLE_SIZE) -> List[Dict[str, Any]]:
+    """
+    Amostra de linhas repetidas com a primeira ocorrência de cada uma
+
+    Args:
+        df: DataFrame (os ids são os rótulos do índice)
+        first: Resultado de first_occurrences
+        sample_size: Número máximo de pares
+
+    Returns:
+        Lista de dicionários {"row": id da repetição, "first_row": id da original}
+    """
+    repeated = np.flatnonzero(first != np.arange(len(first)))[:sample_size]
+    index = df.index
+    return [{"row": index[position], "first_row": index[first[position]]} for position in repeated]
+
+
+class DuplicateDetector:
+    """
+    Detecção de linhas duplicadas em um arquivo lido em blocos
+
+    Dentro de cada bloco as repetições são conferidas pelos valores. Entre
+    blocos, os valores anteriores já foram descartados: cada linha distinta
+    fica registrada pelos dois hashes (128 bits) e pela posição global da
+    primeira ocorrência, em arrays ordenados pelo hash principal.
+    """
+
+    def __init__(self, columns: Optional[List[str]] = None,
+                 sample_size: int = DUPLICATE_SAMPLE_SIZE):
+        """
+        Inicializa o detector vazio
+
+        Args:
+            columns: Colunas consideradas (None usa todas)
+            sample_size: Número máximo de pares guardados como amostra
+        """
+        self.columns = columns
+        self.sample_size = sample_size
+        self.rows = 0
+        self.duplicate_count = 0
+        self.samples: List[Dict[str, int]] = []
+        self._hashes = np.zeros(0, dtype=np.uint64)
+        self._checks = np.zeros(0, dtype=np.uint64)
+        self._first_rows = np.zeros(0, dtype=np.int64)
+
+    def _lookup(self, row_hash: np.ndarray, check_hash: np.ndarray) -> np.ndarray:
+        """Posição global da linha já vista com os mesmos hashes (-1 se nenhuma)"""
+        left = np.searchsorted(self._hashes, row_hash, side='left')
+        right = np.searchsorted(self._hashes, row_hash, side='right')
+        found = np.full(len(row_hash), -1, dtype=np.int64)
+
+        single = (right - left) == 1
+        match = single & (self._checks[np.minimum(left, len(self._checks) - 1)] == check_hash)
+        found[match] = self._first_rows[left[match]]
+
+        # Mesmo hash principal para linhas distintas já vistas: confere todas
+        for i in np.flatnonzero((right - left) > 1):
+            same = np.flatnonzero(self._checks[left[i]:right[i]] == check_hash[i])
+            if len(same):
+                found[i] = self._first_rows[left[i] + same[0]]
+
+        return found
+
+    def update(self, chunk: pd.DataFrame) -> np.ndarray:
+        """
+        Processa um bloco
+
+        Args:
+            chunk: Bloco do arquivo
+
+        Returns:
+            Máscara das linhas do bloco que repetem uma linha anterior
+        """
+        offset = self.rows
+        self.rows += len(chunk)
+        if not len(chunk):
+            return np.zeros(0, dtype=bool)
+
+        columns = self.columns if self.columns is not None else list(chunk.columns)
+        row_hash, check_hash = hash_rows(chunk, columns)
+        first = first_occurrences(chunk, row_hash, columns)
+        positions = np.arange(len(chunk))
+
+        # Primeiras ocorrências do bloco podem repetir linhas de blocos anteriores
+        new = np.flatnonzero(first == positions)
+        if len(self._hashes):
+            earlier = self._lookup(row_hash[new], check_hash[new])
+        else:
+            earlier = np.full(len(new), -1, dtype=np.int64)
+
+        # Cada linha aponta para a primeira ocorrência global da sua primeira do bloco
+        global_positions = positions + offset
+        root = global_positions.copy()
+        root[new[earlier >= 0]] = earlier[earlier >= 0]
+        original = root[first]
+
+        repeated = original != global_positions
+        self.duplicate_count += int(np.count_nonzero(repeated))
+
+        if len(self.samples) < self.sample_size:
+            for position in np.flatnonzero(repeated)[:self.sample_size - len(self.samples)]:
+                self.samples.append({"row": int(global_positions[position]),
+                                     "first_row": int(original[position])})
+
+        # Registra as linhas realmente novas, mantendo os arrays ordenados
+        distinct = new[earlier < 0]
+        if len(distinct):
+            distinct = distinct[np.argsort(row_hash[distinct], kind='stable')]
+            insert_at = np.searchsorted(self._hashes, row_hash[distinct])
+            self._hashes = np.insert(self._hashes, insert_at, row_hash[distinct])
+            self._checks = np.insert(self._checks, insert_at, check_hash[distinct])
+            self._first_rows = np.insert(self._first_rows, insert_at, global_positions[distinct])
+
+        return repeated
+
+    def merge(self, other: "DuplicateDetector") -> "DuplicateDetector":
+        """
+        Combina com o detector da parte seguinte do arquivo
+
+        As posições de other são deslocadas pelo número de linhas deste
+        detector; linhas distintas de other que já existiam aqui passam a
+        contar como repetições.
+
+        Args:
+            other: Detector da parte seguinte (mesmas colunas)
+
+        Returns:
+            Novo detector com as duas partes
+        """
+        merged = DuplicateDetector(self.columns, self.sample_size)
+        merged.rows = self.rows + other.rows
+
+        other_first = other._first_rows + self.rows
+        if len(self._hashes) and len(other._hashes):
+            earlier = self._lookup(other._hashes, other._checks)
+        else:
+            earlier = np.full(len(other._hashes), -1, dtype=np.int64)
+        known = earlier >= 0
+
+        merged.duplicate_count = self.duplicate_count + other.duplicate_count + int(np.count_nonzero(known))
+        samples = list(self.samples)
+        samples += [{"row": row["row"] + self.rows, "first_row": row["first_row"] + self.rows}
+                    for row in other.samples]
+        samples += [{"row": int(row), "first_row": int(first)}
+                    for row, first in zip(other_first[known], earlier[known])]
+        merged.samples = samples[:self.sample_size]
+
+        hashes = np.concatenate([self._hashes, other._hashes[~known]])
+        order = np.argsort(hashes, kind='stable')
+        merged._hashes = hashes[order]
+        merged._checks = np.concatenate([self._checks, other._checks[~known]])[order]
+        merged._first_rows = np.concatenate([self._first_rows, other_first[~known]])[order]
+        return merged
+
+    @property
+    def distinct_rows(self) -> int:
+        """Número de linhas distintas já vistas"""
+        return len(self._hashes)
+
+    def result(self) -> Dict[str, Any]:
+        """
+        Resumo da detecção
+
+        Returns:
+            Dicionário com linhas lidas, distintas, duplicadas e a amostra de
+            pares (posição global da repetição e de uma ocorrência anterior)
+        """
+        return {
+            "rows": self.rows,
+            "distinct_rows": self.distinct_rows,
+            "duplicate_count": self.duplicate_count,
+            "sample_rows": list(self.samples)
+        }
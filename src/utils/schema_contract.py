@@ -0,0 +1,466 @@
+"""
+Contratos de esquema declarativos compilados em verificações vetorizadas
+"""
+
+import operator
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# Contrato das escolas processadas (DataService._process_escolas_data)
+ESCOLAS_CONTRACT = {
+    "columns": {
+        'CO_ENTIDADE': {"type": int, "nullable": False, "min": 1},
+        'NO_ENTIDADE': {"type": str, "nullable": False},
+        'NO_MUNICIPIO': {"type": str, "nullable": False},
+        'TP_DEPENDENCIA': {"type": int, "nullable": False, "min": 1, "max": 4},
+        'TP_LOCALIZACAO': {"type": int, "nullable": False, "min": 1, "max": 2},
+        'TP_DEPENDENCIA_NOME': {"type": str, "required": False},
+        'TP_LOCALIZACAO_NOME': {"type": str, "required": False}
+    },
+    # Quantidades podem ter ausentes na origem (float) e nunca são negativas
+    "prefixes": {
+        'QT_': {"type": "number", "min": 0},
+        'TOTAL_': {"type": "number", "min": 0}
+    },
+    "unique": [['CO_ENTIDADE']],
+    "rules": [
+        "QT_MAT_INF >= 0 when QT_TUR_INF > 0",
+        "QT_DOC_INF > 0 when QT_TUR_INF > 0",
+        "TOTAL_MATRICULAS >= QT_MAT_INF",
+        "TOTAL_TURMAS >= QT_TUR_INF"
+    ],
+    "max_missing_percentage": 0.1
+}
+
+# Contrato dos cursos técnicos processados: uma linha por curso de cada escola
+CURSOS_CONTRACT = {
+    "columns": {
+        'CO_ENTIDADE': {"type": int, "nullable": False, "min": 1},
+        'NO_ENTIDADE': {"type": str, "nullable": False},
+        'NO_MUNICIPIO': {"type": str, "nullable": False},
+        'NO_CURSO_EDUC_PROFISSIONAL': {"type": str, "nullable": False}
+    },
+    "prefixes": {
+        'QT_': {"type": "number", "min": 0},
+        'TOTAL_': {"type": "number", "min": 0}
+    },
+    "unique": [['CO_ENTIDADE', 'NO_CURSO_EDUC_PROFISSIONAL']],
+    "rules": [],
+    "max_missing_percentage": 0.1
+}
+
+DATASET_CONTRACTS = {
+    "escolas": ESCOLAS_CONTRACT,
+    "cursos_tecnicos": CURSOS_CONTRACT
+}
+
+# Operadores aceitos nas regras entre colunas
+_OPERATORS = {
+    ">=": operator.ge,
+    "<=": operator.le,
+    ">": operator.gt,
+    "<": operator.lt,
+    "==": operator.eq,
+    "!=": operator.ne
+}
+
+_COMPARISON = r"\s*([A-Za-z_]\w*)\s*(>=|<=|==|!=|>|<)\s*([A-Za-z_]\w*|-?\d+(?:\.\d+)?)\s*"
+_RULE_PATTERN = re.compile(rf"^{_COMPARISON}(?:when{_COMPARISON})?$")
+
+
+def _parse_operand(token: str) -> Union[str, float]:
+    """Converte o lado direito de uma comparação em coluna ou constante"""
+    try:
+        return float(token)
+    except ValueError:
+        return token
+
+
+def parse_rule(rule: str) -> Dict[str, Any]:
+    """
+    Interpreta uma regra entre colunas
+
+    O formato é "<coluna> <op> <coluna|número>", opcionalmente seguido de
+    "when <coluna> <op> <coluna|número>" para aplicá-la só às linhas em que
+    a condição vale.
+
+    Args:
+        rule: Texto da regra (ex.: "QT_MAT_INF >= 0 when QT_TUR_INF > 0")
+
+    Returns:
+        Dicionário com a verificação ("check") e a condição ("when", ou None)
+    """
+    match = _RULE_PATTERN.match(rule)
+    if match is None:
+        raise ValueError(f"Regra inválida: '{rule}'")
+
+    left, op, right, when_left, when_op, when_right = match.groups()
+    parsed = {"rule": rule, "check": (left, op, _parse_operand(right)), "when": None}
+    if when_left is not None:
+        parsed["when"] = (when_left, when_op, _parse_operand(when_right))
+
+    return parsed
+
+
+def _type_matches(dtype: Any, expected: Union[str, type]) -> bool:
+    """Verifica o tipo de uma coluna apenas pelo dtype (sem percorrer os valores)"""
+    if expected == int:
+        return pd.api.types.is_integer_dtype(dtype)
+    if expected == float:
+        return pd.api.types.is_float_dtype(dtype)
+    if expected == "number":
+        return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+    if expected == bool:
+        return pd.api.types.is_bool_dtype(dtype)
+    if expected == "category":
+        return isinstance(dtype, pd.CategoricalDtype)
+    if expected == str:
+        # Texto pode vir como object, dtype str ou categórico de textos
+        if isinstance(dtype, pd.CategoricalDtype):
+            return not pd.api.types.is_numeric_dtype(dtype.categories.dtype)
+        return pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype)
+    return str(dtype) == str(expected)
+
+
+class CompiledContract:
+    """
+    Verificações de um contrato já resolvidas para um conjunto de colunas
+
+    Todas as colunas numéricas usadas em intervalos, ausentes e regras são
+    lidas uma vez em uma matriz float64 (uma linha por coluna); limites
+    viram vetores comparados com o mínimo e o máximo de cada linha, e só as
+    colunas que os ultrapassam são contadas valor a valor.
+    """
+
+    def __init__(self, contract: Dict[str, Any], columns: Tuple[str, ...],
+                 dtypes: Tuple[Any, ...], rules: List[Dict[str, Any]]):
+        """
+        Resolve as verificações do contrato
+
+        Args:
+            contract: Contrato declarativo
+            columns: Colunas do DataFrame
+            dtypes: Tipos das colunas (mesma ordem)
+            rules: Regras já interpretadas por parse_rule
+        """
+        present = set(columns)
+        dtype_of = dict(zip(columns, dtypes))
+        specs = self._column_specs(contract, columns)
+
+        self.missing_required = [
+            column for column, spec in contract.get("columns", {}).items()
+            if spec.get("required", True) and column not in present
+        ]
+        self.max_missing_percentage = contract.get("max_missing_percentage", 0.1)
+
+        # Tipos verificados uma vez por compilação (dependem só do dtype)
+        self.type_mismatches = []
+        for column, spec in specs.items():
+            expected = spec.get("type")
+            if expected is not None and not _type_matches(dtype_of[column], expected):
+                self.type_mismatches.append({
+                    "column": column, "expected": str(expected), "actual": str(dtype_of[column])
+                })
+        mismatched = {mismatch["column"] for mismatch in self.type_mismatches}
+
+        def is_numeric(column):
+            dtype = dtype_of.get(column)
+            return (dtype is not None and column not in mismatched and
+                    pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype))
+
+        # Regras cujas colunas existem e são numéricas
+        self.rules = []
+        self.skipped_rules = []
+        rule_columns = []
+        for rule in rules:
+            operands = [rule["check"]] + ([rule["when"]] if rule["when"] else [])
+            names = [value for left, _, right in operands for value in (left, right) if isinstance(value, str)]
+            if all(is_numeric(name) for name in names):
+                self.rules.append(rule)
+                rule_columns.extend(names)
+            else:
+                self.skipped_rules.append(rule["rule"])
+
+        # Matriz numérica: ausentes, intervalos e regras saem dela
+        self.numeric_columns = [column for column in specs if is_numeric(column)]
+        for column in rule_columns:
+            if column not in self.numeric_columns:
+                self.numeric_columns.append(column)
+        self.position = {column: i for i, column in enumerate(self.numeric_columns)}
+
+        self.mins = np.array([specs.get(c, {}).get("min", -np.inf) for c in self.numeric_columns], dtype=np.float64)
+        self.maxs = np.array([specs.get(c, {}).get("max", np.inf) for c in self.numeric_columns], dtype=np.float64)
+        # Só colunas float podem ter NaN; nas inteiras os ausentes são zero
+        self.nullable_rows = np.array([
+            i for i, column in enumerate(self.numeric_columns) if pd.api.types.is_float_dtype(dtype_of[column])
+        ], dtype=np.intp)
+
+        self.other_columns = [column for column in specs if column not in self.position]
+        self.not_nullable = {column for column, spec in specs.items() if spec.get("nullable", True) is False}
+
+        self.unique_keys = [
+            list(key) for key in contract.get("unique", []) if all(column in present for column in key)
+        ]
+
+    @staticmethod
+    def _column_specs(contract: Dict[str, Any], columns: Tuple[str, ...]) -> Dict[str, Dict[str, Any]]:
+        """Regras de cada coluna presente: declaração explícita ou pelo prefixo"""
+        explicit = contract.get("columns", {})
+        prefixes = contract.get("prefixes", {})
+        specs = {}
+        for column in columns:
+            if column in explicit:
+                specs[column] = explicit[column]
+                continue
+            for prefix, spec in prefixes.items():
+                if column.startswith(prefix):
+                    specs[column] = spec
+                    break
+        return specs
+
+    def _operand(self, matrix: np.ndarray, value: Union[str, float]) -> np.ndarray:
+        """Coluna da matriz ou constante usada em uma regra"""
+        if isinstance(value, str):
+            return matrix[self.position[value]]
+        return np.float64(value)
+
+    def _comparison(self, matrix: np.ndarray, comparison: Tuple[str, str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """Resultado de uma comparação e máscara das linhas em que ela é definida"""
+        left, op, right = comparison
+        lhs = self._operand(matrix, left)
+        rhs = self._operand(matrix, right)
+        defined = ~np.isnan(lhs)
+        if isinstance(right, str):
+            defined &= ~np.isnan(rhs)
+        with np.errstate(invalid='ignore'):
+            return _OPERATORS[op](lhs, rhs), defined
+
+    def run(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Executa as verificações sobre um DataFrame com as colunas compiladas
+
+        Args:
+            df: DataFrame validado
+
+        Returns:
+            Dicionário no formato de comprehensive_data_validation, com a
+            seção adicional "rules"
+        """
+        rows = len(df)
+        results = {}
+
+        columns = {"is_valid": not self.missing_required, "missing_required": self.missing_required, "errors": []}
+        if self.missing_required:
+            columns["errors"].append(f"Colunas obrigatórias ausentes: {self.missing_required}")
+        results["columns"] = columns
+
+        types = {"is_valid": not self.type_mismatches, "type_mismatches": self.type_mismatches, "errors": []}
+        for mismatch in self.type_mismatches:
+            types["errors"].append(
+                f"Coluna '{mismatch['column']}': tipo esperado {mismatch['expected']}, "
+                f"tipo atual {mismatch['actual']}"
+            )
+        results["types"] = types
+
+        # Uma linha contígua por coluna: reduções e regras percorrem memória sequencial
+        matrix = np.empty((len(self.numeric_columns), rows), dtype=np.float64)
+        for i, column in enumerate(self.numeric_columns):
+            series = df[column]
+            if isinstance(series.dtype, np.dtype):
+                # Conversão direta para float64: NaN já é o ausente, sem varrer ausentes antes
+                matrix[i] = series.to_numpy()
+            else:
+                matrix[i] = series.to_numpy(dtype=np.float64, na_value=np.nan)
+
+        # Intervalos: mínimo e máximo de cada coluna (fmin/fmax ignoram NaN)
+        # comparados com os limites; só as colunas violadas são contadas
+        if rows:
+            lowest = np.fmin.reduce(matrix, axis=1)
+            highest = np.fmax.reduce(matrix, axis=1)
+        else:
+            lowest, highest = self.mins, self.maxs
+
+        ranges = {"is_valid": True, "range_violations": [], "errors": []}
+        for i in np.flatnonzero(lowest < self.mins):
+            column, value = self.numeric_columns[i], self.mins[i]
+            count = int(np.count_nonzero(matrix[i] < value))
+            ranges["range_violations"].append({"column": column, "limit": "min", "value": value, "count": count})
+            ranges["errors"].append(f"Coluna '{column}': {count} valores abaixo do mínimo {value:g}")
+        for i in np.flatnonzero(highest > self.maxs):
+            column, value = self.numeric_columns[i], self.maxs[i]
+            count = int(np.count_nonzero(matrix[i] > value))
+            ranges["range_violations"].append({"column": column, "limit": "max", "value": value, "count": count})
+            ranges["errors"].append(f"Coluna '{column}': {count} valores acima do máximo {value:g}")
+        ranges["is_valid"] = not ranges["range_violations"]
+        results["ranges"] = ranges
+
+        # Ausentes: NaN só nas colunas float da matriz, isna nas não numéricas
+        missing_counts = dict.fromkeys(self.numeric_columns, 0)
+        if len(self.nullable_rows):
+            counts = np.isnan(matrix[self.nullable_rows]).sum(axis=1)
+            for i, count in zip(self.nullable_rows, counts.tolist()):
+                missing_counts[self.numeric_columns[i]] = count
+        for column in self.other_columns:
+            missing_counts[column] = int(df[column].isna().sum())
+
+        missing = {"is_valid": True, "columns_with_missing": [], "errors": []}
+        for column, count in missing_counts.items():
+            if not count:
+                continue
+            percentage = count / rows
+            limit = 0.0 if column in self.not_nullable else self.max_missing_percentage
+            if percentage > limit:
+                missing["is_valid"] = False
+                missing["columns_with_missing"].append({
+                    "column": column, "missing_count": count,
+                    "missing_percentage": percentage, "total_count": rows
+                })
+                missing["errors"].append(
+                    f"Coluna '{column}': {percentage:.1%} de valores ausentes ({count}/{rows})"
+                )
+        results["missing"] = missing
+
+        duplicates = {"is_valid": True, "duplicate_count": 0, "unique_violations": [], "errors": []}
+        for key in self.unique_keys:
+            count = _duplicate_count(df, key)
+            if count:
+                duplicates["is_valid"] = False
+                duplicates["duplicate_count"] += count
+                duplicates["unique_violations"].append({"columns": key, "count": count})
+                duplicates["errors"].append(f"Encontradas {count} linhas com {', '.join(key)} repetido")
+        results["duplicates"] = duplicates
+
+        rule_results = {"is_valid": True, "rule_violations": [], "skipped": self.skipped_rules, "errors": []}
+        for rule in self.rules:
+            passed, defined = self._comparison(matrix, rule["check"])
+            violated = defined & ~passed
+            if rule["when"] is not None:
+                condition, _ = self._comparison(matrix, rule["when"])
+                violated &= condition
+            count = int(np.count_nonzero(violated))
+            if count:
+                rule_results["is_valid"] = False
+                rule_results["rule_violations"].append({"rule": rule["rule"], "count": count})
+                rule_results["errors"].append(f"Regra '{rule['rule']}': {count} linhas violam")
+        results["rules"] = rule_results
+
+        sections = list(results.values())
+        results["overall_valid"] = all(section["is_valid"] for section in sections)
+        results["all_errors"] = [error for section in sections for error in section["errors"]]
+        results["error_count"] = len(results["all_errors"])
+
+        return results
+
+
+def _duplicate_count(df: pd.DataFrame, key: List[str]) -> int:
+    """Linhas cuja combinação de valores da chave já apareceu (como duplicated(keep='first'))"""
+    return int(np.count_nonzero(df.duplicated(subset=key).to_numpy()))
+
+
+class SchemaContract:
+    """
+    Contrato de esquema de um dataset
+
+    O contrato declara tipos, intervalos, nulidade e unicidade por coluna
+    (ou por prefixo) e regras entre colunas. As regras são interpretadas
+    uma vez; as verificações são compiladas uma vez por conjunto de colunas
+    e tipos do DataFrame e reaproveitadas nas validações seguintes.
+    """
+
+    def __init__(self, contract: Dict[str, Any]):
+        """
+        Interpreta o contrato
+
+        Args:
+            contract: Dicionário com "columns", "prefixes", "unique", "rules"
+                e "max_missing_percentage"
+        """
+        self.contract = contract
+        self.rules = [parse_rule(rule) for rule in contract.get("rules", [])]
+        self._compiled: Dict[Tuple[Any, ...], CompiledContract] = {}
+        self._lock = threading.Lock()
+
+    def compile(self, df: pd.DataFrame) -> CompiledContract:
+        """
+        Obtém as verificações compiladas para as colunas e tipos de um DataFrame
+
+        Args:
+            df: DataFrame a validar
+
+        Returns:
+            CompiledContract
+        """
+        columns = tuple(df.columns)
+        dtypes = tuple(df.dtypes)
+        key = (columns, tuple(str(dtype) for dtype in dtypes))
+
+        with self._lock:
+            compiled = self._compiled.get(key)
+            if compiled is None:
+                compiled = CompiledContract(self.contract, columns, dtypes, self.rules)
+                self._compiled[key] = compiled
+
+        return compiled
+
+    def validate(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Valida um DataFrame contra o contrato
+
+        Args:
+            df: DataFrame a validar
+
+        Returns:
+            Dicionário no formato de comprehensive_data_validation
+        """
+        return self.compile(df).run(df)
+
+
+_contracts: Dict[str, SchemaContract] = {}
+
+
+def get_contract(dataset_name: str) -> Optional[SchemaContract]:
+    """
+    Obtém o contrato compilável de um dataset
+
+    Args:
+        dataset_name: Nome do dataset (ex.: "escolas")
+
+    Returns:
+        SchemaContract ou None se o dataset não tiver contrato
+    """
+    if dataset_name not in DATASET_CONTRACTS:
+        return None
+
+    contract = _contracts.get(dataset_name)
+    if contract is None:
+        contract = _contracts.setdefault(dataset_name, SchemaContract(DATASET_CONTRACTS[dataset_name]))
+
+    return contract
+
+
+def validate_contract(df: pd.DataFrame,
+                      contract: Union[str, Dict[str, Any], SchemaContract]) -> Dict[str, Any]:
+    """
+    Valida um DataFrame contra um contrato de esquema
+
+    Args:
+        df: DataFrame a validar
+        contract: Nome do dataset, contrato declarativo ou SchemaContract
+
+    Returns:
+        Dicionário no formato de comprehensive_data_validation
+    """
+    if isinstance(contract, str):
+        schema = get_contract(contract)
+        if schema is None:
+            raise ValueError(f"Dataset '{contract}' sem contrato de esquema")
+    elif isinstance(contract, SchemaContract):
+        schema = contract
+    else:
+        schema = SchemaContract(contract)
+
+    return schema.validate(df)
@@ -0,0 +1,64 @@
+"""
+Memoização de seções de páginas entre reruns do Streamlit
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+# Número máximo de seções (tabelas, figuras) mantidas em memória
+SECTION_CACHE_SIZE = 128
+
+_sections: "OrderedDict[Hashable, Any]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def _section_key(section: str, version: Any, inputs: Any) -> Hashable:
+    """Monta a chave da seção; entradas não hasheáveis usam sua forma JSON"""
+    try:
+        hash(inputs)
+        return (section, version, inputs)
+    except TypeError:
+        return (section, version, json.dumps(inputs, sort_keys=True, default=str))
+
+
+def memoize_section(section: str, version: Any, inputs: Any,
+                    builder: Callable[[], Any]) -> Any:
+    """
+    Obtém o conteúdo de uma seção de página, reconstruindo apenas se algo mudou
+
+    O resultado é compartilhado entre reruns e sessões: tabelas e figuras
+    retornadas não devem ser modificadas por quem as exibe.
+
+    Args:
+        section: Nome único da seção (ex.: "dashboard.descritiva")
+        version: Versão dos dados (DataService.data_version())
+        inputs: Valores dos widgets que afetam a seção
+        builder: Função que constrói o conteúdo da seção
+
+    Returns:
+        Conteúdo da seção (figura, DataFrame, tupla...)
+    """
+    key = _section_key(section, version, inputs)
+
+    with _lock:
+        if key in _sections:
+            _sections.move_to_end(key)
+            return _sections[key]
+
+    value = builder()
+
+    with _lock:
+        _sections[key] = value
+        _sections.move_to_end(key)
+        while len(_sections) > SECTION_CACHE_SIZE:
+            _sections.popitem(last=False)
+
+    return value
+
+
+def clear_section_cache() -> None:
+    """Descarta todas as seções memorizadas"""
+    with _lock:
+        _sections.clear()
@@ -0,0 +1,262 @@
+"""
+Validação em blocos de arquivos grandes (microdados do INEP) com memória limitada
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .row_hash import DuplicateDetector
+from .validation import validate_data_range, validate_data_types, validate_dataframe_columns
+
+
+class StreamValidation:
+    """
+    Resultado parcial da validação de um arquivo lido em blocos
+
+    Guarda contagens (linhas, ausentes e violações de intervalo por coluna)
+    e os tipos encontrados, que não crescem com as linhas lidas. Crescem com
+    o arquivo: as chaves distintas (8 bytes cada para chaves inteiras) e,
+    com duplicate_rows, os hashes do DuplicateDetector (24 bytes por linha
+    distinta). Resultados de partes diferentes do arquivo se combinam com
+    merge().
+    """
+
+    def __init__(self, required_columns: List[str],
+                 expected_types: Dict[str, Union[str, type]],
+                 column_ranges: Optional[Dict[str, Dict[str, Union[float, int]]]] = None,
+                 max_missing_percentage: float = 0.1,
+                 key_column: Optional[str] = 'CO_ENTIDADE',
+                 missing_columns: Optional[List[str]] = None,
+                 duplicate_rows: bool = False):
+        """
+        Inicializa a validação vazia
+
+        Args:
+            required_columns: Colunas obrigatórias
+            expected_types: Tipos esperados por coluna (como em validate_data_types)
+            column_ranges: Intervalos permitidos (como em validate_data_range)
+            max_missing_percentage: Fração máxima de ausentes por coluna
+            key_column: Coluna que identifica a linha (duplicatas); None desativa
+            missing_columns: Colunas com limite de ausentes (None verifica todas)
+            duplicate_rows: Detecta também linhas inteiras repetidas (hash de linha)
+        """
+        self.required_columns = required_columns
+        self.expected_types = expected_types
+        self.column_ranges = column_ranges or {}
+        self.max_missing_percentage = max_missing_percentage
+        self.key_column = key_column
+        self.missing_columns = missing_columns
+
+        self.columns: Optional[List[str]] = None
+        self.rows = 0
+        self.chunks = 0
+        self.missing: Dict[str, int] = {}
+        self.range_counts: Dict[tuple, int] = {}
+        self.type_mismatches: Dict[str, set] = {}
+        self.key_rows = 0
+        self._key_parts: List[np.ndarray] = []
+        self.row_duplicates = DuplicateDetector() if duplicate_rows else None
+
+    def update(self, chunk: pd.DataFrame) -> "StreamValidation":
+        """
+        Valida um bloco e acumula o resultado
+
+        Args:
+            chunk: Bloco do arquivo (antes de qualquer filtro)
+
+        Returns:
+            A própria validação
+        """
+        if self.columns is None:
+            self.columns = list(chunk.columns)
+
+        self.rows += len(chunk)
+        self.chunks += 1
+
+        for column, count in chunk.isna().sum().items():
+            self.missing[column] = self.missing.get(column, 0) + int(count)
+
+        types = validate_data_types(chunk, self.expected_types)
+        for mismatch in types["type_mismatches"]:
+            self.type_mismatches.setdefault(mismatch["column"], set()).add(mismatch["actual"])
+
+        ranges = validate_data_range(chunk, self.column_ranges)
+        for violation in ranges["range_violations"]:
+            key = (violation["column"], violation["limit"], violation["value"])
+            self.range_counts[key] = self.range_counts.get(key, 0) + int(violation["count"])
+
+        if self.key_column and self.key_column in chunk.columns:
+            keys = _normalize_keys(chunk[self.key_column].dropna())
+            self.key_rows += len(keys)
+            # Deduplicadas só dentro do bloco; a união é feita uma vez, em keys
+            self._key_parts.append(np.unique(keys))
+
+        if self.row_duplicates is not None:
+            self.row_duplicates.update(chunk)
+
+        return self
+
+    def merge(self, other: "StreamValidation") -> "StreamValidation":
+        """
+        Combina com a validação de outra parte do arquivo
+
+        Args:
+            other: Validação da outra parte (mesmas regras)
+
+        Returns:
+            Nova validação com as duas partes
+        """
+        merged = StreamValidation(self.required_columns, self.expected_types, self.column_ranges,
+                                  self.max_missing_percentage, self.key_column,
+                                  self.missing_columns, self.row_duplicates is not None)
+        merged.columns = self.columns if self.columns is not None else other.columns
+        merged.rows = self.rows + other.rows
+        merged.chunks = self.chunks + other.chunks
+
+        for source in (self, other):
+            for column, count in source.missing.items():
+                merged.missing[column] = merged.missing.get(column, 0) + count
+            for key, count in source.range_counts.items():
+                merged.range_counts[key] = merged.range_counts.get(key, 0) + count
+            for column, actual in source.type_mismatches.items():
+                merged.type_mismatches.setdefault(column, set()).update(actual)
+
+        merged.key_rows = self.key_rows + other.key_rows
+        merged._key_parts = self._key_parts + other._key_parts
+        if self.row_duplicates is not None and other.row_duplicates is not None:
+            merged.row_duplicates = self.row_duplicates.merge(other.row_duplicates)
+        return merged
+
+    def missing_required(self) -> List[str]:
+        """
+        Colunas obrigatórias ausentes do cabeçalho (já conhecido no primeiro bloco)
+
+        Returns:
+            Lista de colunas ausentes
+        """
+        columns = set(self.columns or [])
+        return [column for column in self.required_columns if column not in columns]
+
+    @property
+    def keys(self) -> np.ndarray:
+        """Chaves distintas já vistas, ordenadas"""
+        if len(self._key_parts) != 1:
+            parts = self._key_parts
+            if len({part.dtype.kind == 'O' for part in parts}) > 1:
+                # Chaves de texto em algum bloco: compara todas como texto
+                parts = [part.astype(str).astype(object) for part in parts]
+            self._key_parts = [np.unique(np.concatenate(parts))] if parts else [np.array([], dtype=np.int64)]
+        return self._key_parts[0]
+
+    @property
+    def duplicate_keys(self) -> int:
+        """Linhas cuja chave já apareceu antes (a primeira ocorrência não conta)"""
+        return self.key_rows - len(self.keys)
+
+    def result(self) -> Dict[str, Any]:
+        """
+        Monta o resultado no formato de comprehensive_data_validation
+
+        Returns:
+            Dicionário com columns, types, ranges, missing, duplicates,
+            overall_valid, all_errors e error_count
+        """
+        header = pd.DataFrame(columns=self.columns or [])
+        results = {"columns": validate_dataframe_columns(header, self.required_columns)}
+
+        types = {"is_valid": not self.type_mismatches, "type_mismatches": [], "errors": []}
+        for column, actual in self.type_mismatches.items():
+            expected = self.expected_types[column]
+            types["type_mismatches"].append({
+                "column": column, "expected": str(expected), "actual": ", ".join(sorted(actual))
+            })
+            types["errors"].append(
+                f"Coluna '{column}': tipo esperado {expected}, tipo atual {', '.join(sorted(actual))}"
+            )
+        results["types"] = types
+
+        if self.column_ranges:
+            ranges = {"is_valid": not self.range_counts, "range_violations": [], "errors": []}
+            for (column, limit, value), count in self.range_counts.items():
+                ranges["range_violations"].append({
+                    "column": column, "limit": limit, "value": value, "count": count
+                })
+                direction = "abaixo do mínimo" if limit == "min" else "acima do máximo"
+                ranges["errors"].append(f"Coluna '{column}': {count} valores {direction} {value}")
+            results["ranges"] = ranges
+
+        missing = {"is_valid": True, "columns_with_missing": [], "errors": []}
+        for column, count in self.missing.items():
+            if self.missing_columns is not None and column not in self.missing_columns:
+                continue
+            percentage = count / self.rows if self.rows else 0.0
+            if percentage > self.max_missing_percentage:
+                missing["is_valid"] = False
+                missing["columns_with_missing"].append({
+                    "column": column, "missing_count": count,
+                    "missing_percentage": percentage, "total_count": self.rows
+                })
+                missing["errors"].append(
+                    f"Coluna '{column}': {percentage:.1%} de valores ausentes ({count}/{self.rows})"
+                )
+        results["missing"] = missing
+
+        duplicates = {"is_valid": True, "duplicate_count": 0, "errors": []}
+        if self.duplicate_keys > 0:
+            duplicates["is_valid"] = False
+            duplicates["duplicate_count"] = self.duplicate_keys
+            duplicates["errors"].append(
+                f"Encontradas {self.duplicate_keys} linhas com {self.key_column} repetido"
+            )
+        if self.row_duplicates is not None:
+            rows = self.row_duplicates.result()
+            duplicates["duplicate_rows"] = rows["duplicate_count"]
+            duplicates["sample_rows"] = rows["sample_rows"]
+            if rows["duplicate_count"] > 0:
+                duplicates["is_valid"] = False
+                duplicates["errors"].append(f"Encontradas {rows['duplicate_count']} linhas duplicadas")
+        results["duplicates"] = duplicates
+
+        sections = list(results.values())
+        results["overall_valid"] = all(section.get("is_valid", True) for section in sections)
+        results["all_errors"] = [error for section in sections for error in section["errors"]]
+        results["error_count"] = len(results["all_errors"])
+        results["rows"] = self.rows
+        results["chunks"] = self.chunks
+
+        return results
+
+
+def _normalize_keys(keys: pd.Series) -> np.ndarray:
+    """
+    Chaves de um bloco com tipo estável entre blocos
+
+    Números inteiros (mesmo lidos como float64 em um bloco com ausentes)
+    viram int64, demais números float64 e o resto texto.
+    """
+    if pd.api.types.is_numeric_dtype(keys) or pd.api.types.is_bool_dtype(keys):
+        values = keys.to_numpy(dtype=np.float64)
+        if np.all(np.mod(values, 1) == 0) and np.all(np.abs(values) < 2 ** 63):
+            return values.astype(np.int64)
+        return values
+
+    return keys.astype(str).to_numpy(dtype=object)
+
+
+def validate_chunks(chunks: Iterable[pd.DataFrame], validation: StreamValidation) -> Dict[str, Any]:
+    """
+    Valida uma sequência de blocos (ex.: pd.read_csv(..., chunksize=...))
+
+    Args:
+        chunks: Blocos do arquivo
+        validation: Validação com as regras a aplicar
+
+    Returns:
+        Resultado no formato de comprehensive_data_validation
+    """
+    for chunk in chunks:
+        validation.update(chunk)
+
+    return validation.result()
@@ -0,0 +1,428 @@
+"""
+Estatísticas resumidas com acumuladores combináveis e armazenamento por versão dos dados
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .figure_cache import data_fingerprint
+
+# Estatísticas das tabelas agrupadas (como groupby().agg)
+GROUPED_STATISTICS = ['count', 'mean', 'std', 'min', 'max']
+
+# Quantis das tabelas sem agrupamento (como describe())
+DESCRIBE_QUANTILES = [0.25, 0.5, 0.75]
+
+# Número máximo de acumuladores mantidos pelo armazenamento
+STATISTICS_STORE_SIZE = 64
+
+# Máximo de pares (grupo, valor) guardados por coluna; acima disso a tabela
+# de frequências é descartada e os quantis são calculados direto dos valores
+FREQUENCY_LIMIT = 5_000
+
+# Grupo único usado quando não há agrupamento
+_ALL = "__todos__"
+
+
+class SummaryAccumulator:
+    """
+    Estatísticas por grupo de cada coluna numérica, combináveis entre partes dos dados
+
+    Para cada coluna e grupo guarda contagem, média, soma dos quadrados dos
+    desvios (M2), mínimo e máximo; dois acumuladores se combinam sem rever
+    as linhas (médias e M2 pela fórmula de Chan).
+
+    Os quantis só entram na tabela sem agrupamento: nela cada coluna guarda
+    a frequência de cada valor, de onde os quantis saem exatos e se combinam
+    por soma. Colunas com mais de FREQUENCY_LIMIT valores distintos (ex.:
+    identificadores) guardam só os quantis calculados, que não se combinam
+    com outras partes. Acumuladores agrupados não guardam frequências.
+    """
+
+    def __init__(self, moments: Dict[str, pd.DataFrame], frequencies: Dict[str, Optional[pd.Series]],
+                 group_by: Optional[str] = None, quantiles: Optional[Dict[str, List[float]]] = None,
+                 complete: bool = True):
+        """
+        Inicializa o acumulador
+
+        Args:
+            moments: Coluna -> DataFrame por grupo com count, mean, m2, min e max
+            frequencies: Coluna -> Series de frequências indexada por (grupo, valor),
+                ou None se não guardadas
+            group_by: Coluna de agrupamento (None = grupo único)
+            quantiles: Coluna -> quantis de DESCRIBE_QUANTILES já calculados
+                (colunas sem frequências, sem agrupamento)
+            complete: Se todas as linhas estão em algum grupo (falso quando a
+                coluna de agrupamento tem ausentes, que o groupby descarta)
+        """
+        self.moments = moments
+        self.frequencies = frequencies
+        self.group_by = group_by
+        self.quantiles = quantiles or {}
+        self.complete = complete
+        self._tables: Dict[str, pd.DataFrame] = {}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, group_by: Optional[str] = None) -> "SummaryAccumulator":
+        """
+        Calcula o acumulador de um DataFrame
+
+        Args:
+            df: DataFrame com os dados
+            group_by: Coluna de agrupamento (None = grupo único)
+
+        Returns:
+            SummaryAccumulator das colunas numéricas (inclusive a de
+            agrupamento, como no groupby().agg sobre todas as numéricas)
+        """
+        columns = list(df.select_dtypes(include=[np.number]).columns)
+        if group_by is None:
+            return cls._from_values(df, columns)
+
+        keys = df[group_by]
+        values = df[columns].astype(np.float64)
+
+        # Agrupa por uma cópia sem nome: a coluna de agrupamento continua entre os valores.
+        # Uma redução por estatística cobre todas as colunas de uma vez
+        grouped = values.groupby(keys.rename(None), observed=True)
+        count = grouped.count()
+        mean = grouped.mean()
+        m2 = (grouped.var() * (count - 1)).fillna(0.0)
+        minimum = grouped.min()
+        maximum = grouped.max()
+
+        moments = {
+            col: pd.DataFrame({
+                'count': count[col],
+                'mean': mean[col],
+                'm2': m2[col],
+                'min': minimum[col],
+                'max': maximum[col]
+            })
+            for col in columns
+        }
+
+        return cls(moments, dict.fromkeys(columns), group_by, complete=not keys.isna().any())
+
+    @classmethod
+    def _from_values(cls, df: pd.DataFrame, columns: List[str]) -> "SummaryAccumulator":
+        """Acumulador sem agrupamento: uma ordenação por coluna dá momentos, quantis e frequências"""
+        moments = {}
+        frequencies = {}
+        quantiles = {}
+        for col in columns:
+            values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            values = np.sort(values[~np.isnan(values)])
+            count = len(values)
+
+            mean = values.mean() if count else np.nan
+            moments[col] = pd.DataFrame({
+                'count': [count],
+                'mean': [mean],
+                'm2': [((values - mean) ** 2).sum() if count else 0.0],
+                'min': [values[0] if count else np.nan],
+                'max': [values[-1] if count else np.nan]
+            }, index=[_ALL])
+
+            # Valores ordenados: cada valor distinto começa onde o anterior muda
+            starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]]) if count else np.zeros(0, dtype=np.int64)
+            if len(starts) > FREQUENCY_LIMIT:
+                frequencies[col] = None
+                quantiles[col] = np.quantile(values, DESCRIBE_QUANTILES).tolist()
+                continue
+
+            frequencies[col] = pd.Series(
+                np.diff(np.r_[starts, count]).astype(np.int64),
+                index=pd.MultiIndex.from_arrays([np.full(len(starts), _ALL, dtype=object), values[starts]])
+            )
+
+        return cls(moments, frequencies, quantiles=quantiles)
+
+    def merge(self, other: "SummaryAccumulator") -> "SummaryAccumulator":
+        """
+        Combina com o acumulador de outra parte dos dados (mesmo agrupamento)
+
+        Args:
+            other: Acumulador da outra parte
+
+        Returns:
+            Novo acumulador com as duas partes
+        """
+        moments = {}
+        frequencies = {}
+        quantiles = {}
+        for col in dict.fromkeys(list(self.moments) + list(other.moments)):
+            if col not in other.moments or col not in self.moments:
+                source = self if col in self.moments else other
+                moments[col] = source.moments[col]
+                frequencies[col] = source.frequencies[col]
+                if col in source.quantiles:
+                    quantiles[col] = source.quantiles[col]
+                continue
+
+            moments[col] = _merge_moments(self.moments[col], other.moments[col])
+            frequencies[col] = _merge_frequencies(self.frequencies[col], other.frequencies[col])
+
+        return SummaryAccumulator(moments, frequencies, self.group_by, quantiles,
+                                  complete=self.complete and other.complete)
+
+    def total(self) -> "SummaryAccumulator":
+        """
+        Combina todos os grupos em um único grupo
+
+        Linhas com o grupo ausente (complete falso) ficam de fora, e colunas
+        sem frequências ficam sem quantis.
+
+        Returns:
+            Acumulador sem agrupamento
+        """
+        if self.group_by is None:
+            return self
+
+        moments = {}
+        frequencies = {}
+        for col, frequency in self.frequencies.items():
+            moments[col] = _merge_groups(self.moments[col])
+            if frequency is None:
+                frequencies[col] = None
+                continue
+
+            values = frequency.index.get_level_values(1)
+            merged = frequency.groupby(values).sum()
+            merged.index = pd.MultiIndex.from_arrays(
+                [np.full(len(merged), _ALL, dtype=object), merged.index]
+            )
+            frequencies[col] = merged
+
+        return SummaryAccumulator(moments, frequencies, complete=self.complete)
+
+    def describe(self) -> pd.DataFrame:
+        """
+        Monta a tabela de estatísticas sem agrupamento (mesmo formato de describe())
+
+        Returns:
+            DataFrame com count, mean, std, min, quartis e max por coluna
+            (compartilhado; não deve ser modificado)
+        """
+        if "describe" in self._tables:
+            return self._tables["describe"]
+
+        accumulator = self.total()
+        labels = ['count', 'mean', 'std', 'min'] + [f"{q:.0%}" for q in DESCRIBE_QUANTILES] + ['max']
+        table = {}
+
+        for col, moments in accumulator.moments.items():
+            row = moments.iloc[0] if len(moments) else None
+            count = row['count'] if row is not None else 0
+            if col in accumulator.quantiles:
+                quantiles = accumulator.quantiles[col]
+            else:
+                quantiles = _quantiles(accumulator.frequencies[col], count, DESCRIBE_QUANTILES)
+            if row is None:
+                table[col] = [0.0] + [np.nan] * (len(labels) - 1)
+                continue
+            table[col] = [count, row['mean'], _std(row['m2'], count), row['min'], *quantiles, row['max']]
+
+        self._tables["describe"] = pd.DataFrame(table, index=labels, dtype=np.float64)
+        return self._tables["describe"]
+
+    def grouped(self) -> pd.DataFrame:
+        """
+        Monta a tabela de estatísticas por grupo (mesmo formato de groupby().agg)
+
+        Returns:
+            DataFrame indexado pelo grupo com colunas (coluna, estatística)
+            (compartilhado; não deve ser modificado)
+        """
+        if "grouped" in self._tables:
+            return self._tables["grouped"]
+
+        frames = {}
+        for col, moments in self.moments.items():
+            stats = moments[['count', 'mean', 'm2', 'min', 'max']].copy()
+            stats['m2'] = _std(stats['m2'].to_numpy(), stats['count'].to_numpy())
+            frames[col] = stats.rename(columns={'m2': 'std'})[GROUPED_STATISTICS]
+
+        if not frames:
+            return pd.DataFrame()
+
+        table = pd.concat(frames, axis=1)
+        table.index.name = self.group_by
+        self._tables["grouped"] = table
+        return table
+
+
+def _merge_moments(left: pd.DataFrame, right: pd.DataFrame) -> pd.DataFrame:
+    """Combina momentos de duas partes, grupo a grupo (fórmula de Chan)"""
+    index = left.index.union(right.index)
+    a = left.reindex(index)
+    b = right.reindex(index)
+    a_count = a['count'].fillna(0)
+    b_count = b['count'].fillna(0)
+    count = a_count + b_count
+
+    delta = b['mean'].fillna(0) - a['mean'].fillna(0)
+    mean = (a['mean'].fillna(0) * a_count + b['mean'].fillna(0) * b_count) / count
+    m2 = a['m2'].fillna(0) + b['m2'].fillna(0) + delta ** 2 * a_count * b_count / count
+
+    return pd.DataFrame({
+        'count': count.astype(np.int64),
+        'mean': mean,
+        'm2': m2,
+        'min': np.fmin(a['min'], b['min']),
+        'max': np.fmax(a['max'], b['max'])
+    }, index=index)
+
+
+def _merge_groups(moments: pd.DataFrame) -> pd.DataFrame:
+    """Combina os momentos de todos os grupos em um único grupo"""
+    count = moments['count'].sum()
+    mean = (moments['mean'] * moments['count']).sum() / count if count else np.nan
+    m2 = (moments['m2'] + moments['count'] * (moments['mean'] - mean) ** 2).sum() if count else 0.0
+
+    return pd.DataFrame({
+        'count': [count],
+        'mean': [mean],
+        'm2': [m2],
+        'min': [moments['min'].min()],
+        'max': [moments['max'].max()]
+    }, index=[_ALL])
+
+
+def _merge_frequencies(left: Optional[pd.Series], right: Optional[pd.Series]) -> Optional[pd.Series]:
+    """Soma as frequências de duas partes (None se alguma foi descartada ou o total passa do limite)"""
+    if left is None or right is None:
+        return None
+
+    merged = left.add(right, fill_value=0).astype(np.int64)
+    return merged if len(merged) <= FREQUENCY_LIMIT else None
+
+
+def _std(m2, count) -> np.ndarray:
+    """Desvio padrão amostral (ddof=1), ausente com menos de duas observações"""
+    m2 = np.asarray(m2, dtype=np.float64)
+    count = np.asarray(count, dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        std = np.sqrt(m2 / (count - 1))
+    return np.where(count > 1, std, np.nan)
+
+
+def _quantiles(frequency: pd.Series, count: float, quantiles: List[float]) -> List[float]:
+    """Quantis com interpolação linear (como pandas) a partir das frequências"""
+    if count == 0 or frequency is None:
+        return [np.nan] * len(quantiles)
+
+    values = frequency.index.get_level_values(1).to_numpy(dtype=np.float64)
+    cumulative = np.cumsum(frequency.to_numpy())
+    result = []
+    for q in quantiles:
+        position = q * (count - 1)
+        lower = int(np.floor(position))
+        low_value = values[np.searchsorted(cumulative, lower, side='right')]
+        high_value = values[np.searchsorted(cumulative, min(lower + 1, count - 1), side='right')]
+        result.append(low_value + (high_value - low_value) * (position - lower))
+
+    return result
+
+
+class StatisticsStore:
+    """Acumuladores de estatísticas por (versão dos dados, agrupamento), com despejo LRU"""
+
+    def __init__(self, max_entries: int = STATISTICS_STORE_SIZE):
+        """
+        Inicializa o armazenamento vazio
+
+        Args:
+            max_entries: Número máximo de acumuladores
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, SummaryAccumulator]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _lookup(self, key: Hashable) -> Optional[SummaryAccumulator]:
+        """Obtém um acumulador, marcando-o como usado recentemente"""
+        with self._lock:
+            accumulator = self._entries.get(key)
+            if accumulator is not None:
+                self._entries.move_to_end(key)
+            return accumulator
+
+    def _store(self, key: Hashable, accumulator: SummaryAccumulator) -> None:
+        """Armazena um acumulador, despejando os menos usados"""
+        with self._lock:
+            self._entries[key] = accumulator
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, version: Hashable, df: pd.DataFrame,
+            group_by: Optional[str] = None) -> SummaryAccumulator:
+        """
+        Obtém o acumulador de uma versão dos dados, calculando-o uma única vez
+
+
+        Args:
+            version: Identificador da versão dos dados (ex.: nome e data_version())
+            df: DataFrame dessa versão
+            group_by: Coluna de agrupamento
+
+        Returns:
+            SummaryAccumulator
+        """
+        accumulator = self._lookup((version, group_by))
+        if accumulator is not None:
+            return accumulator
+
+        accumulator = SummaryAccumulator.from_frame(df, group_by)
+
+        self._store((version, group_by), accumulator)
+        return accumulator
+
+    def clear(self) -> None:
+        """Descarta todos os acumuladores"""
+        with self._lock:
+            self._entries.clear()
+
+
+_statistics_store = StatisticsStore()
+
+
+def get_statistics_store() -> StatisticsStore:
+    """
+    Obtém o armazenamento de estatísticas do processo
+
+    Returns:
+        Instância única de StatisticsStore
+    """
+    return _statistics_store
+
+
+def summary_statistics(df: pd.DataFrame, group_by: Optional[str] = None,
+                       version: Optional[Hashable] = None) -> pd.DataFrame:
+    """
+    Obtém a tabela de estatísticas resumidas de um DataFrame pelo armazenamento
+
+    Args:
+        df: DataFrame com os dados
+        group_by: Coluna de agrupamento (tabela por grupo) ou None (como describe())
+        version: Identificador da versão dos dados; padrão é o hash do conteúdo
+
+    Returns:
+        DataFrame de estatísticas
+    """
+    if df.select_dtypes(include=[np.number]).columns.empty:
+        # Sem colunas numéricas: mantém o comportamento do pandas
+        return df.groupby(group_by, observed=True).size().to_frame('count') if group_by else df.describe()
+
+    if version is None:
+        version = data_fingerprint(df)
+
+    accumulator = _statistics_store.get(version, df, group_by)
+    if group_by is None:
+        return accumulator.describe()
+
+    return accumulator.grouped()
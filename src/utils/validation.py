@@ -6,6 +6,9 @@ from typing import Any, Dict, List, Optional, Union
 import pandas as pd
 import numpy as np
 
+from .profiler import DataProfile, profile_frame
+from .row_hash import duplicates_from_first, first_occurrences, frame_row_hash, sample_duplicates
+
 def validate_numeric_input(value: Any, min_value: Optional[float] = None, 
                           max_value: Optional[float] = None) -> bool:
     """
@@ -142,7 +145,9 @@ def validate_data_types(df: pd.DataFrame,
         elif expected_type == float:
             is_compatible = pd.api.types.is_float_dtype(df[column])
         elif expected_type == str:
-            is_compatible = pd.api.types.is_object_dtype(df[column])
+            # Texto pode vir como object ou, no pandas 3, como dtype str
+            is_compatible = (pd.api.types.is_object_dtype(df[column]) or 
+                             pd.api.types.is_string_dtype(df[column]))
         elif expected_type == bool:
             is_compatible = pd.api.types.is_bool_dtype(df[column])
         elif expected_type == 'datetime':
@@ -218,13 +223,15 @@ def validate_data_range(df: pd.DataFrame,
     return result
 
 def validate_missing_values(df: pd.DataFrame, 
-                           max_missing_percentage: float = 0.1) -> Dict[str, Any]:
+                           max_missing_percentage: float = 0.1,
+                           profile: Optional[DataProfile] = None) -> Dict[str, Any]:
     """
     Valida se há valores ausentes nas colunas
     
     Args:
         df: DataFrame a ser validado
         max_missing_percentage: Percentual máximo de valores ausentes permitido
+        profile: Perfil já calculado do DataFrame (evita recontar os ausentes)
         
     Returns:
         Dicionário com resultado da validação
@@ -235,8 +242,10 @@ def validate_missing_values(df: pd.DataFrame,
         "errors": []
     }
     
+    missing_counts = profile.missing_values if profile is not None else df.isna().sum().to_dict()
+    
     for column in df.columns:
-        missing_count = df[column].isna().sum()
+        missing_count = missing_counts[column]
         missing_percentage = missing_count / len(df)
         
         if missing_percentage > max_missing_percentage:
@@ -256,7 +265,8 @@ def validate_missing_values(df: pd.DataFrame,
 
 def validate_duplicates(df: pd.DataFrame, 
                        subset: Optional[List[str]] = None,
-                       keep: str = 'first') -> Dict[str, Any]:
+                       keep: str = 'first',
+                       profile: Optional[DataProfile] = None) -> Dict[str, Any]:
     """
     Valida se há linhas duplicadas no DataFrame
     
@@ -264,6 +274,7 @@ def validate_duplicates(df: pd.DataFrame,
         df: DataFrame a ser validado
         subset: Colunas para verificar duplicatas
         keep: Como tratar duplicatas ('first', 'last', False)
+        profile: Perfil já calculado do DataFrame (usado com subset=None)
         
     Returns:
         Dicionário com resultado da validação
@@ -272,16 +283,23 @@ def validate_duplicates(df: pd.DataFrame,
         "is_valid": True,
         "duplicate_count": 0,
         "duplicate_rows": None,
+        "sample_rows": [],
         "errors": []
     }
     
-    duplicates = df.duplicated(subset=subset, keep=keep)
-    duplicate_count = duplicates.sum()
+    # Hash das linhas agrupa as candidatas; os valores confirmam cada repetição
+    if profile is not None and subset is None:
+        first = profile.first_occurrence
+    else:
+        first = first_occurrences(df, frame_row_hash(df, subset), subset)
+    duplicates = duplicates_from_first(first, keep)
+    duplicate_count = int(duplicates.sum())
     
     if duplicate_count > 0:
         result["is_valid"] = False
         result["duplicate_count"] = duplicate_count
         result["duplicate_rows"] = df[duplicates]
+        result["sample_rows"] = sample_duplicates(df, first)
         result["errors"].append(
             f"Encontradas {duplicate_count} linhas duplicadas"
         )
@@ -308,6 +326,9 @@ def comprehensive_data_validation(df: pd.DataFrame,
     """
     results = {}
     
+    # Perfil em uma única passagem: ausentes e duplicatas saem dele
+    profile = profile_frame(df)
+    
     # Validação de colunas
     results["columns"] = validate_dataframe_columns(df, required_columns)
     
@@ -319,10 +340,10 @@ def comprehensive_data_validation(df: pd.DataFrame,
         results["ranges"] = validate_data_range(df, column_ranges)
     
     # Validação de valores ausentes
-    results["missing"] = validate_missing_values(df, max_missing_percentage)
+    results["missing"] = validate_missing_values(df, max_missing_percentage, profile=profile)
     
     # Validação de duplicatas
-    results["duplicates"] = validate_duplicates(df)
+    results["duplicates"] = validate_duplicates(df, profile=profile)
     
     # Resultado geral
     results["overall_valid"] = all(
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Script para aquecer os caches do Sistema de Análise Educacional - ES
+
+Carrega os datasets, constrói cubo e índices e pré-renderiza a página
+inicial, informando o tempo de cada etapa. Os caches ficam só na memória
+deste processo: o script serve para medir o aquecimento que o app roda
+em segundo plano (services/warmup.py). Os snapshots e agregados em disco
+são gerados por load_es_data.py --snapshots e build_aggregates.py.
+"""
+
+import os
+import sys
+
+# Adiciona o diretório src ao path para importações
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from services.warmup import WARMUP_PAGES, warm_caches
+
+def warm_cache(pages=WARMUP_PAGES):
+    """Aquece os caches e imprime a duração de cada etapa"""
+    
+    print("🔥 Aquecendo caches...")
+    report = warm_caches(pages)
+    
+    for step, ms in report.items():
+        print(f"   {step:<28} {ms:8.0f} ms")
+    
+    return report
+
+if __name__ == "__main__":
+    print("🚀 Aquecendo caches do Sistema de Análise Educacional")
+    print("=" * 60)
+    
+    warm_cache(sys.argv[1:] or WARMUP_PAGES)
+    
+    print("\n" + "=" * 60)
+    print("✅ Aquecimento concluído!")